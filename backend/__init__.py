@@ -3,6 +3,15 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_jwt_extended import JWTManager
 
+from backend.cache import ResponseCache
+from backend.instrumentation import Instrumentation
+from backend.hashing import PasswordHasher
+from backend.ingest import IngestQueue
+
 # Create extension instances here, to be initialized in server.py
 db = SQLAlchemy()
 jwt = JWTManager()
+cache = ResponseCache()
+metrics = Instrumentation()
+hasher = PasswordHasher()
+ingest = IngestQueue()
@@ -0,0 +1,142 @@
+# backend/bulk.py
+#
+# Set-based moderation for the admin bulk endpoints.
+#
+# Every change is a handful of UPDATE/DELETE ... WHERE id IN (...)
+# statements per chunk of ids, run on the session's connection so the
+# caller commits once. Nothing is loaded into the ORM, so the session
+# hooks (cause_summary, user_summary, map clusters) never see these writes.
+# This module therefore keeps the summaries in step itself, and returns
+# the affected cause ids so the caller can bump versions and invalidate
+# clusters.
+#
+# Deleting a cause or user row lets the database remove dependent rows
+# through ON DELETE CASCADE (SET NULL for Event.ngo_id).
+from sqlalchemy import delete, select, update
+
+from backend import db, rollups, summary
+from backend.models import AuthData, User, Cause, Donation, Feedback, Volunteer, CauseSummary
+
+# Keeps IN lists well below SQLite's bound-parameter limit.
+CHUNK_SIZE = 500
+
+
+def _chunks(ids):
+    ids = sorted(ids)
+    for i in range(0, len(ids), CHUNK_SIZE):
+        yield ids[i:i + CHUNK_SIZE]
+
+
+def _select_ids(column, where_column, ids, *criteria):
+    found = set()
+    for chunk in _chunks(ids):
+        found.update(v for (v,) in db.session.execute(
+            select(column).where(where_column.in_(chunk), *criteria)
+        ) if v is not None)
+    return found
+
+
+def _execute(statement_for_chunk, ids):
+    affected = 0
+    for chunk in _chunks(ids):
+        affected += db.session.execute(
+            statement_for_chunk(chunk), execution_options={"synchronize_session": False}
+        ).rowcount
+    return affected
+
+
+# ------------------------------------------------------------
+# VERIFY / UNVERIFY
+# ------------------------------------------------------------
+def set_verified(auth_ids, verified):
+    """Verify or unverify accounts, their users and their causes.
+
+    Returns (counts, changed_cause_ids).
+    """
+    auth_ids = _select_ids(AuthData.id, AuthData.id, auth_ids, AuthData.role != "admin")
+    user_ids = _select_ids(AuthData.fk_id, AuthData.id, auth_ids, AuthData.role == "user")
+    cause_ids = _select_ids(AuthData.fk_id, AuthData.id, auth_ids, AuthData.role.in_(("ngo", "event")))
+    # A user's causes follow the user.
+    cause_ids |= _select_ids(Cause.cause_id, Cause.user_id, user_ids)
+    cause_ids = _select_ids(Cause.cause_id, Cause.cause_id, cause_ids)
+
+    counts = {
+        "accounts": _execute(lambda c: update(AuthData).where(AuthData.id.in_(c))
+                             .values(verified=verified), auth_ids),
+        "users": _execute(lambda c: update(User).where(User.user_id.in_(c))
+                          .values(verified=verified), user_ids),
+        "causes": _execute(lambda c: update(Cause).where(Cause.cause_id.in_(c))
+                           .values(verified=verified), cause_ids),
+    }
+    _execute(lambda c: update(CauseSummary).where(CauseSummary.cause_id.in_(c))
+             .values(verified=verified), cause_ids)
+    return counts, cause_ids
+
+
+FILTER_ROLES = ("user", "ngo", "event")
+
+
+def resolve_filter(role=None, verified=None):
+    """Auth ids matching an account filter (admins never match).
+
+    At least one field is required, so a single request cannot select
+    every account; raises ValueError otherwise or for bad values.
+    """
+    if role is None and verified is None:
+        raise ValueError("filter needs role and/or verified")
+    if role is not None and role not in FILTER_ROLES:
+        raise ValueError(f"filter role must be one of {', '.join(FILTER_ROLES)}")
+    if verified is not None and not isinstance(verified, bool):
+        raise ValueError("filter verified must be true or false")
+    query = select(AuthData.id).where(AuthData.role != "admin")
+    if role is not None:
+        query = query.where(AuthData.role == role)
+    if verified is not None:
+        query = query.where(AuthData.verified.is_(verified))
+    return {aid for (aid,) in db.session.execute(query)}
+
+
+# ------------------------------------------------------------
+# DELETE
+# ------------------------------------------------------------
+def delete_accounts(user_ids=(), cause_ids=()):
+    """Delete users (with their causes and activity) and causes.
+
+    Returns (counts, deleted_cause_ids, recounted_cause_ids), the latter
+    being surviving causes whose donations/feedback/volunteers lost rows.
+    Surviving users who lost activity have their user_summary recounted.
+    """
+    user_ids = _select_ids(User.user_id, User.user_id, user_ids)
+    cause_ids = _select_ids(Cause.cause_id, Cause.cause_id, cause_ids)
+    cause_ids |= _select_ids(Cause.cause_id, Cause.user_id, user_ids)
+
+    recount, user_recount = set(), set()
+    for model in (Donation, Feedback, Volunteer):
+        recount |= _select_ids(model.cause_id, model.user_id, user_ids)
+        user_recount |= _select_ids(model.user_id, model.cause_id, cause_ids)
+    recount -= cause_ids
+    user_recount -= user_ids
+
+    # Donation rollups of surviving causes lose the deleted users' donations.
+    for chunk in _chunks(user_ids):
+        rollups.remove(db.session.connection(), [
+            r for r in db.session.execute(
+                select(Donation.cause_id, Donation.created_at, Donation.amount).where(Donation.user_id.in_(chunk))
+            ) if r[0] not in cause_ids
+        ])
+
+    user_auth_ids = _select_ids(User.auth_id, User.user_id, user_ids)
+    cause_auth_ids = _select_ids(AuthData.id, AuthData.fk_id, cause_ids,
+                                 AuthData.role.in_(("ngo", "event")))
+
+    causes = _execute(lambda c: delete(Cause).where(Cause.cause_id.in_(c)), cause_ids)
+    users = _execute(lambda c: delete(User).where(User.user_id.in_(c)), user_ids)
+    accounts = _execute(lambda c: delete(AuthData).where(AuthData.id.in_(c)),
+                        user_auth_ids | cause_auth_ids)
+
+    for chunk in _chunks(recount):
+        summary.recompute_aggregates(db.session.connection(), chunk)
+    for chunk in _chunks(user_recount):
+        summary.recompute_user_aggregates(db.session.connection(), chunk)
+    counts = {"users": users, "causes": causes, "accounts": accounts}
+    return counts, cause_ids, recount
@@ -0,0 +1,234 @@
+# backend/cache.py
+#
+# Response cache for the public read endpoints.
+#
+# Entries are tagged ("causes", "cause:<id>") and invalidated by bumping a
+# per-tag generation number that is folded into every cache key, so one
+# increment retires all query-string variants of an endpoint without
+# enumerating keys. That works the same for the in-process LRU and for a
+# shared backend such as Redis.
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from urllib.parse import urlencode
+
+from flask import current_app, request
+
+
+# ------------------------------------------------------------
+# BACKENDS
+# ------------------------------------------------------------
+class CacheBackend:
+    """Interface every cache store implements."""
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def set(self, key, value, ttl):
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def get_generations(self, tags):
+        """Current generation for each tag (0 if never bumped)."""
+        raise NotImplementedError
+
+    def bump_generation(self, tag):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class MemoryCache(CacheBackend):
+    """Thread-safe in-process LRU with per-entry TTL and a size bound."""
+
+    def __init__(self, max_entries=1024, default_ttl=60):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries = OrderedDict()     # key -> (expires_at, value)
+        self._generations = {}            # never evicted, see module note
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + (ttl or self.default_ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def get_generations(self, tags):
+        with self._lock:
+            return [self._generations.get(t, 0) for t in tags]
+
+    def bump_generation(self, tag):
+        with self._lock:
+            self._generations[tag] = self._generations.get(tag, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RedisCache(CacheBackend):
+    """Shared cache for multi-process deployments (needs the redis package)."""
+
+    def __init__(self, url, default_ttl=60, prefix="servia:"):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package")
+        self._client = redis.Redis.from_url(url)
+        self.default_ttl = default_ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        return self._client.get(self.prefix + key)
+
+    def set(self, key, value, ttl=None):
+        self._client.set(self.prefix + key, value, ex=ttl or self.default_ttl)
+
+    def delete(self, key):
+        self._client.delete(self.prefix + key)
+
+    def get_generations(self, tags):
+        if not tags:
+            return []
+        values = self._client.mget([self.prefix + "gen:" + t for t in tags])
+        return [int(v) if v is not None else 0 for v in values]
+
+    def bump_generation(self, tag):
+        self._client.incr(self.prefix + "gen:" + tag)
+
+    def clear(self):
+        for key in self._client.scan_iter(self.prefix + "*"):
+            self._client.delete(key)
+
+
+# ------------------------------------------------------------
+# RESPONSE CACHE
+# ------------------------------------------------------------
+class ResponseCache:
+    def __init__(self, backend=None):
+        self.backend = backend or MemoryCache()
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    def init_app(self, app):
+        kind = app.config.get("CACHE_BACKEND", "memory")
+        ttl = app.config.get("CACHE_DEFAULT_TTL", 60)
+        self.enabled = kind != "none"
+        if kind == "redis":
+            self.backend = RedisCache(app.config["CACHE_REDIS_URL"], default_ttl=ttl)
+        else:
+            self.backend = MemoryCache(
+                max_entries=app.config.get("CACHE_MAX_ENTRIES", 1024),
+                default_ttl=ttl
+            )
+        app.extensions["response_cache"] = self
+
+    # -------------------- READ PATH --------------------
+    def cached(self, *tag_templates, ttl=None):
+        """Cache a view's 200 responses under the given tags.
+
+        Tag templates are formatted with the view's URL arguments, e.g.
+        @cache.cached("cause:{cause_id}").
+        """
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return view(*args, **kwargs)
+
+                tags = [t.format(**kwargs) for t in tag_templates]
+                key = self._key(tags)
+                stored = self.backend.get(key)
+                if stored is not None:
+                    self._count(hit=True)
+                    response = current_app.response_class(stored, mimetype="application/json")
+                    response.headers["X-Cache"] = "HIT"
+                    return response
+
+                self._count(hit=False)
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code == 200:
+                    if response.is_streamed:
+                        response.response = self._store_when_sent(key, response.response, ttl)
+                    else:
+                        self.backend.set(key, response.get_data(), ttl)
+                response.headers["X-Cache"] = "MISS"
+                return response
+            return wrapper
+        return decorator
+
+    def _store_when_sent(self, key, chunks, ttl):
+        """Pass a streamed body through and cache it once it is complete."""
+        body = []
+        try:
+            for chunk in chunks:
+                body.append(chunk.encode() if isinstance(chunk, str) else chunk)
+                yield chunk
+            # Only reached when the whole body was sent (not on disconnect/error).
+            self.backend.set(key, b"".join(body), ttl)
+        finally:
+            # Close the wrapped stream (and its cursor) on disconnect too.
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                close()
+
+    def _key(self, tags):
+        generations = self.backend.get_generations(tags)
+        args = urlencode(sorted(request.args.items(multi=True)))
+        stamp = ",".join(f"{t}={g}" for t, g in zip(tags, generations))
+        return f"resp:{request.path}?{args}|{stamp}"
+
+    def _count(self, hit):
+        with self._stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    # -------------------- WRITE PATH --------------------
+    def invalidate(self, *tags):
+        for tag in tags:
+            self.backend.bump_generation(tag)
+
+    def stats(self):
+        with self._stats_lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        result = {
+            "enabled": self.enabled,
+            "backend": type(self.backend).__name__,
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / total, 4) if total else None
+        }
+        if isinstance(self.backend, MemoryCache):
+            result.update({"entries": len(self.backend), "max_entries": self.backend.max_entries})
+        return result
@@ -0,0 +1,143 @@
+# backend/clusters.py
+#
+# Server-side marker clustering for the homepage map.
+#
+# Points (the first location of every verified cause) are bucketed into a
+# square degree grid whose cell size halves with each zoom level, and each
+# bucket is reduced to a count and centroid in SQL. World grids for low
+# zoom levels are cached per zoom; the cache is dropped whenever a
+# Location or Cause change is committed. At high zoom a viewport holds few
+# points, so those grids are computed per request for the viewport only.
+import threading
+import time
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session, aliased
+
+from backend import db, geo
+from backend.models import Cause, Location
+
+MIN_ZOOM = 0
+MAX_ZOOM = 20
+MAX_CACHED_ZOOM = 10
+CELLS_PER_TILE = 4          # one cell is ~64px on a 256px tile
+CACHE_TTL_SECONDS = 300     # safety net for writes from other processes
+
+_lock = threading.Lock()
+_grids = {}                 # zoom -> (built_at, generation, clusters)
+_generation = 0
+
+
+def cell_size(zoom):
+    return 360.0 / (2 ** zoom * CELLS_PER_TILE)
+
+
+# ------------------------------------------------------------
+# INVALIDATION
+# ------------------------------------------------------------
+def invalidate():
+    """Drop every cached grid (call after Core/bulk writes to locations)."""
+    global _generation
+    with _lock:
+        _generation += 1
+        _grids.clear()
+
+
+@event.listens_for(Session, "after_flush")
+def _note_map_changes(session, flush_context):
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, (Location, Cause)):
+            session.info["clusters_stale"] = True
+            return
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session):
+    # Only after commit: rebuilding before then could cache the old data.
+    if session.info.pop("clusters_stale", False):
+        invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session):
+    session.info.pop("clusters_stale", None)
+
+
+# ------------------------------------------------------------
+# AGGREGATION
+# ------------------------------------------------------------
+def _aggregate(zoom, bbox=None):
+    size = cell_size(zoom)
+
+    # Each cause's first located point, decided over all its locations:
+    # the viewport filter below must not pick another one that happens to
+    # fall inside the box.
+    other = aliased(Location)
+    first_loc = (
+        select(func.min(other.loc_id))
+        .where(
+            other.cause_id == Location.cause_id,
+            other.latitude.isnot(None),
+            other.longitude.isnot(None),
+        )
+        .scalar_subquery()
+    )
+
+    # Shift into positive ranges, then floor() into cell indexes.
+    gy = db.cast(func.floor((Location.latitude + 90.0) / size), db.Integer).label("gy")
+    gx = db.cast(func.floor((Location.longitude + 180.0) / size), db.Integer).label("gx")
+    query = (
+        db.session.query(
+            gy, gx,
+            func.count().label("count"),
+            func.avg(Location.latitude).label("latitude"),
+            func.avg(Location.longitude).label("longitude"),
+            func.min(Location.cause_id).label("cause_id"),
+        )
+        .join(Cause, Cause.cause_id == Location.cause_id)
+        .filter(Cause.verified.is_(True), Location.loc_id == first_loc)
+    )
+    if bbox is not None:
+        query = query.filter(geo.bbox_clause(*bbox))
+    rows = query.group_by(gy, gx).all()
+    return [{
+        "latitude": r.latitude,
+        "longitude": r.longitude,
+        "count": r.count,
+        # Single points keep their cause so the client can link directly.
+        "cause_id": r.cause_id if r.count == 1 else None,
+    } for r in rows]
+
+
+def _world_grid(zoom):
+    now = time.monotonic()
+    with _lock:
+        cached = _grids.get(zoom)
+        generation = _generation
+    if cached and cached[1] == generation and now - cached[0] < CACHE_TTL_SECONDS:
+        return cached[2]
+
+    clusters = _aggregate(zoom)
+    with _lock:
+        # Skip storing if locations changed while we were aggregating.
+        if generation == _generation:
+            _grids[zoom] = (now, generation, clusters)
+    return clusters
+
+
+def _inside(cluster, west, south, east, north):
+    lat, lng = cluster["latitude"], cluster["longitude"]
+    if not south <= lat <= north:
+        return False
+    if west <= east:
+        return west <= lng <= east
+    return lng >= west or lng <= east
+
+
+def clusters_for(zoom, bbox=None):
+    if zoom <= MAX_CACHED_ZOOM:
+        clusters = _world_grid(zoom)
+        if bbox is None:
+            return clusters
+        return [c for c in clusters if _inside(c, *bbox)]
+    return _aggregate(zoom, bbox)
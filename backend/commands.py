@@ -0,0 +1,72 @@
+# backend/commands.py
+#
+# Maintenance commands, run with the Flask CLI:
+#   flask --app server rebuild-cause-summary
+#   flask --app server reconcile-summaries
+#   flask --app server backfill-donation-rollups
+#   flask --app server purge-idempotency-keys
+import click
+
+from backend import db
+
+
+def register_commands(app):
+    app.cli.add_command(rebuild_cause_summary)
+    app.cli.add_command(reconcile_summaries)
+    app.cli.add_command(backfill_donation_rollups)
+    app.cli.add_command(purge_idempotency_keys)
+
+
+@click.command("rebuild-cause-summary")
+@click.option("--batch-size", default=1000, show_default=True, help="Causes per transaction.")
+def rebuild_cause_summary(batch_size):
+    """Recompute cause_summary from the source tables (backfill / repair)."""
+    from backend import summary
+    processed = summary.rebuild(db.session, batch_size=batch_size)
+    click.echo(f"Rebuilt cause_summary for {processed} causes.")
+
+
+@click.command("reconcile-summaries")
+@click.option("--batch-size", default=1000, show_default=True, help="Causes/users per transaction.")
+@click.option("--dry-run", is_flag=True, help="Report drift without repairing it.")
+def reconcile_summaries(batch_size, dry_run):
+    """Recount cause/user aggregates from the source tables and report drift."""
+    from backend import summary
+    report = summary.reconcile(db.session, batch_size=batch_size, fix=not dry_run)
+    for name in ("causes", "users"):
+        counts = report[name]
+        click.echo(f"{name}: {counts['checked']} checked, {counts['drifted']} drifted, "
+                   f"{counts['missing']} missing")
+    for sample in report["samples"]:
+        click.echo(f"  {sample}")
+    drift = any(report[n]["drifted"] or report[n]["missing"] for n in ("causes", "users"))
+    if drift:
+        click.echo("Drift found; left as is (--dry-run)." if dry_run else "Drift repaired.")
+        # For monitoring: a non-zero exit code means the aggregates had drifted.
+        raise SystemExit(1)
+
+
+@click.command("backfill-donation-rollups")
+@click.option("--batch-size", default=5000, show_default=True, help="Donations per transaction.")
+def backfill_donation_rollups(batch_size):
+    """Rebuild donation_rollup from the donation table in streaming batches."""
+    from backend import rollups
+    seen, skipped = rollups.backfill(
+        db.session, batch_size=batch_size,
+        progress=lambda n: click.echo(f"  {n:,} donations", err=True)
+    )
+    click.echo(f"Rolled up {seen - skipped} donations ({skipped} without created_at skipped).")
+
+
+@click.command("purge-idempotency-keys")
+def purge_idempotency_keys():
+    """Delete Idempotency-Key records older than IDEMPOTENCY_TTL."""
+    from backend import idempotency
+    total = 0
+    while True:
+        deleted = idempotency.purge_expired()
+        db.session.commit()
+        total += deleted
+        if deleted < idempotency.PURGE_CHUNK_SIZE:
+            break
+    click.echo(f"Purged {total} expired idempotency keys.")
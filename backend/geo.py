@@ -0,0 +1,206 @@
+# backend/geo.py
+#
+# Spatial lookups over Location.latitude / Location.longitude.
+#
+# SQLite:  an R*Tree virtual table (location_rtree) mirrors every located
+#          row and is kept in sync by triggers on `location`.
+# Other:   the composite B-tree index ix_location_lat_lng on the model
+#          turns the latitude range into an index range scan.
+#
+# R*Tree coordinates are stored as 32-bit floats and rounded outwards, so
+# it is only used to pick candidates; the exact range test still runs on
+# the real columns.
+import math
+
+from sqlalchemy import DDL, bindparam, event, func, text
+
+from backend import db
+from backend.models import Cause, Location
+
+RTREE_TABLE = "location_rtree"
+EARTH_RADIUS_KM = 6371.0
+# Same sphere as haversine_km(), so the search window and the distances agree.
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+# ------------------------------------------------------------
+# DDL
+# ------------------------------------------------------------
+SQLITE_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {RTREE_TABLE} USING rtree(
+        id, min_lat, max_lat, min_lng, max_lng
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {RTREE_TABLE}_ai AFTER INSERT ON location
+    WHEN new.latitude IS NOT NULL AND new.longitude IS NOT NULL BEGIN
+        INSERT INTO {RTREE_TABLE} VALUES
+            (new.loc_id, new.latitude, new.latitude, new.longitude, new.longitude);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {RTREE_TABLE}_ad AFTER DELETE ON location BEGIN
+        DELETE FROM {RTREE_TABLE} WHERE id = old.loc_id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {RTREE_TABLE}_au AFTER UPDATE OF latitude, longitude ON location BEGIN
+        DELETE FROM {RTREE_TABLE} WHERE id = old.loc_id;
+        INSERT INTO {RTREE_TABLE}
+            SELECT new.loc_id, new.latitude, new.latitude, new.longitude, new.longitude
+            WHERE new.latitude IS NOT NULL AND new.longitude IS NOT NULL;
+    END""",
+]
+SQLITE_DROP = [f"DROP TABLE IF EXISTS {RTREE_TABLE}"]
+SQLITE_REBUILD = [
+    f"DELETE FROM {RTREE_TABLE}",
+    f"""INSERT INTO {RTREE_TABLE}
+        SELECT loc_id, latitude, latitude, longitude, longitude FROM location
+        WHERE latitude IS NOT NULL AND longitude IS NOT NULL""",
+]
+
+for _stmt in SQLITE_DDL:
+    event.listen(Location.__table__, "after_create", DDL(_stmt).execute_if(dialect="sqlite"))
+for _stmt in SQLITE_DROP:
+    event.listen(Location.__table__, "before_drop", DDL(_stmt).execute_if(dialect="sqlite"))
+
+
+def rebuild_index():
+    """Repopulate the R*Tree from `location` (after bulk loads)."""
+    if _dialect() == "sqlite":
+        for stmt in SQLITE_REBUILD:
+            db.session.execute(text(stmt))
+        db.session.commit()
+
+
+def _dialect():
+    return db.session.get_bind().dialect.name
+
+
+# ------------------------------------------------------------
+# BOUNDING BOXES
+# ------------------------------------------------------------
+class BBoxError(ValueError):
+    pass
+
+
+def _wrap_lng(lng):
+    return lng if -180 <= lng <= 180 else (lng + 180) % 360 - 180
+
+
+def parse_bbox(raw):
+    """Parse Leaflet's toBBoxString() order: west,south,east,north.
+
+    At low zoom or on a wrapped map Leaflet reports longitudes past
+    +/-180 and latitudes past the poles. Latitudes are clamped, a box at
+    least 360 degrees wide becomes the whole world, and other longitudes
+    are wrapped (west > east afterwards means the box crosses the
+    antimeridian, which bbox_clause() handles).
+    """
+    try:
+        west, south, east, north = (float(v) for v in (raw or "").split(","))
+    except ValueError:
+        raise BBoxError("bbox must be 'west,south,east,north'")
+    if not all(math.isfinite(v) for v in (west, south, east, north)) or south > north:
+        raise BBoxError("bbox out of range")
+    south, north = max(south, -90.0), min(north, 90.0)
+    if east - west >= 360:
+        return -180.0, south, 180.0, north
+    return _wrap_lng(west), south, _wrap_lng(east), north
+
+
+def _range_clause(south, north, west, east):
+    clause = db.and_(
+        Location.latitude >= south, Location.latitude <= north,
+        Location.longitude >= west, Location.longitude <= east,
+    )
+    if _dialect() == "sqlite":
+        candidates = text(
+            f"SELECT id FROM {RTREE_TABLE} "
+            "WHERE max_lat >= :s AND min_lat <= :n AND max_lng >= :w AND min_lng <= :e"
+        ).bindparams(
+            # unique: the antimeridian split puts two copies in one statement
+            bindparam("s", south, unique=True), bindparam("n", north, unique=True),
+            bindparam("w", west, unique=True), bindparam("e", east, unique=True),
+        )
+        clause = db.and_(Location.loc_id.in_(candidates), clause)
+    return clause
+
+
+def bbox_clause(west, south, east, north):
+    """WHERE clause for locations inside the box (handles the antimeridian)."""
+    if west <= east:
+        return _range_clause(south, north, west, east)
+    return db.or_(
+        _range_clause(south, north, west, 180.0),
+        _range_clause(south, north, -180.0, east),
+    )
+
+
+# ------------------------------------------------------------
+# QUERIES
+# ------------------------------------------------------------
+def locations_within(west, south, east, north, limit):
+    """First located point per verified cause inside the box.
+
+    Returns [(cause_id, latitude, longitude)] ordered by cause_id.
+    """
+    first_loc = (
+        db.session.query(func.min(Location.loc_id).label("loc_id"))
+        .join(Cause, Cause.cause_id == Location.cause_id)
+        .filter(Cause.verified.is_(True), bbox_clause(west, south, east, north))
+        .group_by(Location.cause_id)
+        .subquery()
+    )
+    return (
+        db.session.query(Location.cause_id, Location.latitude, Location.longitude)
+        .join(first_loc, first_loc.c.loc_id == Location.loc_id)
+        .order_by(Location.cause_id)
+        .limit(limit)
+        .all()
+    )
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lng2 - lng1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def nearest_locations(lat, lng, k, start_km=5.0):
+    """The k verified causes closest to (lat, lng), nearest location each.
+
+    Searches a window around the point and doubles it until the circle
+    inscribed in the window holds k causes, so only nearby index pages
+    are read. Returns [(cause_id, latitude, longitude, distance_km)].
+    """
+    radius_km = start_km
+    while True:
+        d_lat = radius_km / KM_PER_DEGREE
+        # Widen longitude by the latitude furthest from the equator so the
+        # window still contains the circle near the poles.
+        edge_lat = min(abs(lat) + d_lat, 90.0)
+        d_lng = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(edge_lat)), 0.01))
+        covers_world = d_lat >= 180
+
+        south, north = max(lat - d_lat, -90.0), min(lat + d_lat, 90.0)
+        if d_lng >= 180:
+            west, east = -180.0, 180.0
+        else:
+            west = (lng - d_lng + 540) % 360 - 180
+            east = (lng + d_lng + 540) % 360 - 180
+
+        rows = (
+            db.session.query(Location.cause_id, Location.latitude, Location.longitude)
+            .join(Cause, Cause.cause_id == Location.cause_id)
+            .filter(Cause.verified.is_(True), bbox_clause(west, south, east, north))
+            .all()
+        )
+
+        best = {}
+        for cause_id, r_lat, r_lng in rows:
+            dist = haversine_km(lat, lng, r_lat, r_lng)
+            if cause_id not in best or dist < best[cause_id][2]:
+                best[cause_id] = (r_lat, r_lng, dist)
+
+        # Only points inside the inscribed circle are guaranteed to beat
+        # anything outside the window.
+        settled = [c for c, v in best.items() if v[2] <= radius_km]
+        if len(settled) >= k or covers_world:
+            ranked = sorted(best.items(), key=lambda item: (item[1][2], item[0]))[:k]
+            return [(cid, r_lat, r_lng, dist) for cid, (r_lat, r_lng, dist) in ranked]
+        radius_km *= 2
@@ -0,0 +1,127 @@
+# backend/hashing.py
+#
+# Password hashing off the request threads.
+#
+# PBKDF2/scrypt are deliberately CPU-heavy. Run inline, a burst of logins
+# pins every request thread (and the GIL) and unrelated reads queue up
+# behind them. Hashes are therefore computed in a small process pool. A
+# request thread only waits on a future, which leaves the GIL free.
+#
+# The pool is bounded. At most PASSWORD_HASH_QUEUE_LIMIT hashes may be
+# running or waiting at once, and any request beyond that fails at once
+# with HashingBusy, which the routes turn into a 503. That way a login
+# spike cannot build an unbounded backlog.
+#
+# The method and salt length come from config. needs_rehash() reports
+# stored hashes made with other parameters, so login can upgrade them.
+import atexit
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+class HashingBusy(Exception):
+    """The hashing pool is saturated (or timed out); retry later."""
+
+
+# Run in the worker processes; must be importable top-level functions.
+def _hash(password, method, salt_length):
+    return generate_password_hash(password, method=method, salt_length=salt_length)
+
+
+def _verify(pwhash, password):
+    return check_password_hash(pwhash, password)
+
+
+def _stored_method(method, salt_length):
+    # Werkzeug fills in defaults (e.g. pbkdf2:sha256 ->
+    # pbkdf2:sha256:600000); hash once to learn the stored form.
+    return _hash("", method, salt_length).split("$", 1)[0]
+
+
+class PasswordHasher:
+    def __init__(self):
+        self.method = "pbkdf2:sha256"
+        self.salt_length = 16
+        self.workers = 2
+        self.queue_limit = 8
+        self.timeout = 10.0
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.queue_limit)
+        self._stored_method = None      # method as written into hashes, see needs_rehash
+
+    def init_app(self, app):
+        self.method = app.config.get("PASSWORD_HASH_METHOD", "pbkdf2:sha256")
+        self.salt_length = int(app.config.get("PASSWORD_SALT_LENGTH", 16))
+        self.workers = int(app.config.get("PASSWORD_HASH_WORKERS", 2))
+        self.queue_limit = int(app.config.get("PASSWORD_HASH_QUEUE_LIMIT", max(self.workers, 1) * 4))
+        self.timeout = float(app.config.get("PASSWORD_HASH_TIMEOUT", 10))
+        self._slots = threading.BoundedSemaphore(self.queue_limit)
+        self._stored_method = None
+        app.extensions["password_hasher"] = self
+
+    # -------------------- POOL --------------------
+    def _pool(self):
+        with self._executor_lock:
+            if self._executor is None:
+                # The pool starts lazily inside a threaded server; forking
+                # then could copy locks held by other threads (logging, the
+                # DB pool) into the workers, so start them from a clean
+                # forkserver (spawn where that is unavailable).
+                method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context(method)
+                )
+                atexit.register(self._executor.shutdown, wait=False)
+            return self._executor
+
+    def _reset_pool(self):
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _run(self, fn, *args):
+        if self.workers <= 0:
+            # Inline mode (tests, CLI scripts): no pool, no limit.
+            return fn(*args)
+        if not self._slots.acquire(blocking=False):
+            raise HashingBusy("password hashing queue is full")
+        try:
+            future = self._pool().submit(fn, *args)
+        except BrokenProcessPool:
+            self._slots.release()
+            self._reset_pool()
+            raise HashingBusy("password hashing pool restarted")
+        # The slot is held until the work is really done, even if this
+        # request stops waiting for it.
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            raise HashingBusy("password hashing timed out")
+        except BrokenProcessPool:
+            self._reset_pool()
+            raise HashingBusy("password hashing pool restarted")
+
+    # -------------------- API --------------------
+    def hash(self, password):
+        return self._run(_hash, password, self.method, self.salt_length)
+
+    def verify(self, pwhash, password):
+        return self._run(_verify, pwhash, password)
+
+    def needs_rehash(self, pwhash):
+        """True if pwhash was made with other parameters than configured.
+
+        The first call hashes once, in the pool, so it can raise HashingBusy.
+        """
+        if self._stored_method is None:
+            self._stored_method = self._run(_stored_method, self.method, self.salt_length)
+        method, _, rest = pwhash.partition("$")
+        salt = rest.split("$", 1)[0]
+        return method != self._stored_method or len(salt) != self.salt_length
@@ -0,0 +1,204 @@
+# backend/idempotency.py
+#
+# Idempotency-Key support for the donate/feedback/volunteer POSTs.
+#
+# Clients retry on timeouts. Without a key, each retry inserts another
+# Donation. With one, the first request claims the key by committing a
+# "pending" idempotency_key row, runs the view, then stores the response
+# on that row. A retry with the same key gets the stored response back
+# and never reaches the write path.
+#
+# Keys are scoped to the path and the body's auth_id, so two clients that
+# happen to pick the same key do not collide. The same key with a
+# different body is a client bug and gets 422.
+#
+# Concurrent duplicates: within a process they wait on a per-key lock and
+# then replay the stored response. Across processes the primary key on
+# idempotency_key is the lock, and a request that finds the key still
+# pending gets 409 with Retry-After. Either way only one insert happens.
+#
+# A pending row whose request crashed or was killed would otherwise block
+# its key until the TTL. created_at is the claim time, so once a pending
+# row is older than IDEMPOTENCY_LEASE seconds (a few times the worker's
+# request timeout), a retry takes the key over and runs the view itself.
+#
+# A view that fails (exception or 5xx) releases its key so the client can
+# retry. Rows expire after IDEMPOTENCY_TTL seconds. Expired rows are
+# purged now and then by the requests themselves, or in bulk with
+# "flask purge-idempotency-keys".
+import hashlib
+import threading
+import time
+from datetime import datetime, timedelta
+from functools import wraps
+
+from flask import current_app, jsonify, request
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+
+from backend import db
+from backend.models import IdempotencyKey
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+PURGE_CHUNK_SIZE = 1000
+
+_locks = {}                 # key -> [lock, users]
+_locks_guard = threading.Lock()
+_last_purge = 0.0
+
+
+# ------------------------------------------------------------
+# PER-KEY LOCKS (this process)
+# ------------------------------------------------------------
+class _KeyLock:
+    def __init__(self, key):
+        self.key = key
+
+    def __enter__(self):
+        with _locks_guard:
+            entry = _locks.setdefault(self.key, [threading.Lock(), 0])
+            entry[1] += 1
+        entry[0].acquire()
+
+    def __exit__(self, *exc):
+        with _locks_guard:
+            entry = _locks[self.key]
+            entry[0].release()
+            entry[1] -= 1
+            if not entry[1]:
+                del _locks[self.key]
+
+
+# ------------------------------------------------------------
+# STORE
+# ------------------------------------------------------------
+def _ttl():
+    return timedelta(seconds=current_app.config.get("IDEMPOTENCY_TTL", 86400))
+
+
+def _lease():
+    return timedelta(seconds=current_app.config.get("IDEMPOTENCY_LEASE", 120))
+
+
+def _take_over(key, request_hash):
+    """Claim a pending key whose lease ran out. False if someone beat us to it."""
+    now = datetime.utcnow()
+    taken = db.session.execute(
+        update(IdempotencyKey)
+        .where(IdempotencyKey.key == key,
+               IdempotencyKey.status == "pending",
+               IdempotencyKey.created_at < now - _lease())
+        .values(request_hash=request_hash, created_at=now)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.session.commit()
+    return taken == 1
+
+
+def purge_expired(limit=PURGE_CHUNK_SIZE):
+    """Delete up to limit expired keys (caller commits). Returns rows deleted."""
+    cutoff = datetime.utcnow() - _ttl()
+    keys = [k for (k,) in db.session.execute(
+        select(IdempotencyKey.key).where(IdempotencyKey.created_at < cutoff).limit(limit)
+    )]
+    if keys:
+        db.session.execute(delete(IdempotencyKey).where(IdempotencyKey.key.in_(keys)))
+    return len(keys)
+
+
+def _maybe_purge():
+    global _last_purge
+    interval = current_app.config.get("IDEMPOTENCY_PURGE_INTERVAL", 300)
+    now = time.monotonic()
+    if now - _last_purge < interval:
+        return
+    _last_purge = now
+    purge_expired()
+
+
+def _claim(key, request_hash):
+    """Claim key for this request. Returns None, or the row that holds it."""
+    _maybe_purge()
+    row = db.session.get(IdempotencyKey, key)
+    if row is not None and row.created_at < datetime.utcnow() - _ttl():
+        db.session.delete(row)
+        row = None
+    if row is None:
+        db.session.add(IdempotencyKey(key=key, request_hash=request_hash, status="pending"))
+        try:
+            db.session.commit()
+            return None
+        except IntegrityError:
+            # Another process claimed it first.
+            db.session.rollback()
+            row = db.session.get(IdempotencyKey, key)
+    if row is not None and row.status == "pending" and row.created_at < datetime.utcnow() - _lease():
+        if _take_over(key, request_hash):
+            return None
+        return _claim(key, request_hash)   # taken over or released meanwhile
+    db.session.commit()
+    return row
+
+
+def _store(key, response):
+    row = db.session.get(IdempotencyKey, key)
+    row.status = "done"
+    row.response_status = response.status_code
+    row.response_body = response.get_data(as_text=True)
+    row.content_type = response.content_type
+    db.session.commit()
+
+
+def _release(key):
+    db.session.rollback()
+    db.session.execute(delete(IdempotencyKey).where(IdempotencyKey.key == key))
+    db.session.commit()
+
+
+def _replay(row):
+    response = current_app.response_class(
+        row.response_body, status=row.response_status, content_type=row.content_type
+    )
+    response.headers["Idempotent-Replayed"] = "true"
+    return response
+
+
+# ------------------------------------------------------------
+# DECORATOR
+# ------------------------------------------------------------
+def idempotent(view):
+    """Honour an Idempotency-Key header on a write view."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        header = request.headers.get(HEADER)
+        if header is None:
+            return view(*args, **kwargs)
+        if not header or len(header) > MAX_KEY_LENGTH:
+            return jsonify({"error": f"{HEADER} must be 1-{MAX_KEY_LENGTH} characters"}), 400
+
+        data = request.get_json(silent=True) or {}
+        scope = f"{request.path}\n{data.get('auth_id')}\n{header}"
+        key = hashlib.sha256(scope.encode()).hexdigest()
+        request_hash = hashlib.sha256(request.get_data()).hexdigest()
+
+        with _KeyLock(key):
+            row = _claim(key, request_hash)
+            if row is not None:
+                if row.request_hash != request_hash:
+                    return jsonify({"error": f"{HEADER} was already used with a different request"}), 422
+                if row.status != "done":
+                    return jsonify({"error": "A request with this key is in progress"}), 409, {"Retry-After": "1"}
+                return _replay(row)
+
+            try:
+                response = current_app.make_response(view(*args, **kwargs))
+            except Exception:
+                _release(key)
+                raise
+            if response.status_code >= 500:
+                _release(key)
+            else:
+                _store(key, response)
+            return response
+    return wrapper
@@ -0,0 +1,264 @@
+# backend/ingest.py
+#
+# Write-behind ingestion for donations, feedback and volunteer signups.
+#
+# With INGEST_ENABLED the write routes validate against cached auth/cause
+# state (backend.lookups), append the row to a local SQLite queue (WAL
+# mode, one short append per request) and answer 202. A background
+# flusher moves queued rows into Donation/Feedback/Volunteer in batches of
+# INGEST_BATCH_SIZE, one transaction per batch, through the ORM so the
+# cause_summary hooks and version bumps apply as usual.
+#
+# Exactly-once delivery: every batch commits, together with its rows, the
+# id of the last queue row it contains (ingest_checkpoint in the main
+# database). On start-up, and before each batch, queue rows at or below
+# the checkpoint are discarded. A crash between the main commit and the
+# queue cleanup therefore never replays a row.
+#
+# Backpressure: once INGEST_MAX_PENDING rows are waiting, enqueue raises
+# IngestBusy and the routes answer 503. Rows are type-checked on enqueue
+# (InputError, a 400), so a bad value is refused while the client is still
+# there; rows the database still rejects are set aside in the queue's
+# dead_letter table instead of blocking the queue.
+#
+# Only one process flushes a given queue file (an flock on "<path>.lock");
+# any number of processes may append to it.
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from sqlalchemy.exc import DBAPIError, StatementError
+
+from backend.inputs import InputError, parse_amount, parse_rating
+
+try:
+    import fcntl
+except ImportError:          # Windows: assume a single process
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+QUEUE_DDL = [
+    """CREATE TABLE IF NOT EXISTS queue (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        kind TEXT NOT NULL,
+        payload TEXT NOT NULL,
+        enqueued_at REAL NOT NULL
+    )""",
+    """CREATE TABLE IF NOT EXISTS dead_letter (
+        id INTEGER PRIMARY KEY,
+        kind TEXT NOT NULL,
+        payload TEXT NOT NULL,
+        error TEXT,
+        failed_at REAL NOT NULL
+    )""",
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+]
+
+
+class IngestBusy(Exception):
+    """The ingestion queue is full; retry later."""
+
+
+def _text(raw):
+    if not isinstance(raw, str):
+        raise InputError("comment must be a string")
+    return raw
+
+
+def _id(raw):
+    if isinstance(raw, bool) or not isinstance(raw, int):
+        raise InputError("user_id and cause_id must be integers")
+    return raw
+
+
+# Fields each kind of row may carry, with their converters.
+FIELDS = {
+    "donation": {"user_id": _id, "cause_id": _id, "amount": parse_amount},
+    "feedback": {"user_id": _id, "cause_id": _id, "rating": parse_rating, "comment": _text},
+    "volunteer": {"user_id": _id, "cause_id": _id},
+}
+
+
+def check_row(kind, row):
+    """The row with its values converted; raises InputError."""
+    fields = FIELDS.get(kind)
+    if fields is None:
+        raise InputError(f"unknown kind {kind!r}")
+    if set(row) != set(fields):
+        raise InputError(f"{kind} rows need exactly {', '.join(sorted(fields))}")
+    return {name: convert(row[name]) for name, convert in fields.items()}
+
+
+class IngestQueue:
+    def __init__(self):
+        self.enabled = False
+        self.path = None
+        self.queue_id = None
+        self.flush_interval = 1.0
+        self.batch_size = 1000
+        self.max_pending = 100000
+        self._app = None
+        self._conn = None
+        self._lock = threading.Lock()
+        self._stop = None
+
+    def init_app(self, app):
+        self.enabled = bool(app.config.get("INGEST_ENABLED", False))
+        app.extensions["ingest"] = self
+        if not self.enabled:
+            return
+
+        self.path = app.config.get("INGEST_QUEUE_PATH") or os.path.join(app.instance_path, "ingest_queue.sqlite3")
+        self.flush_interval = float(app.config.get("INGEST_FLUSH_INTERVAL", 1.0))
+        self.batch_size = int(app.config.get("INGEST_BATCH_SIZE", 1000))
+        self.max_pending = int(app.config.get("INGEST_MAX_PENDING", 100000))
+        self._app = app
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = self._connect()
+        for stmt in QUEUE_DDL:
+            self._conn.execute(stmt)
+        self._conn.execute("INSERT OR IGNORE INTO meta VALUES ('queue_id', ?)", (str(uuid.uuid4()),))
+        self.queue_id = self._conn.execute("SELECT value FROM meta WHERE key = 'queue_id'").fetchone()[0]
+
+        if self._stop is not None:
+            self._stop.set()
+        self._stop = threading.Event()
+        threading.Thread(target=self._flush_loop, args=(self._stop,), daemon=True,
+                         name="ingest-flusher").start()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=5)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    # -------------------- APPEND --------------------
+    def pending(self):
+        with self._lock:
+            first, last = self._conn.execute("SELECT min(id), max(id) FROM queue").fetchone()
+        return 0 if first is None else last - first + 1
+
+    def enqueue(self, kind, row):
+        """Append a row; raises InputError for bad values, IngestBusy when full."""
+        row = check_row(kind, row)
+        with self._lock:
+            first, last = self._conn.execute("SELECT min(id), max(id) FROM queue").fetchone()
+            if first is not None and last - first + 1 >= self.max_pending:
+                raise IngestBusy("ingestion queue is full")
+            self._conn.execute(
+                "INSERT INTO queue (kind, payload, enqueued_at) VALUES (?, ?, ?)",
+                (kind, json.dumps(row), time.time())
+            )
+
+    # -------------------- FLUSH --------------------
+    def _flush_loop(self, stop):
+        lock_file = open(self.path + ".lock", "w")
+        conn = self._connect()
+        try:
+            while not stop.wait(self.flush_interval):
+                if fcntl is not None:
+                    try:
+                        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    except BlockingIOError:
+                        continue        # another process is the flusher
+                try:
+                    while not stop.is_set() and self.flush_once(conn) >= self.batch_size:
+                        pass
+                except Exception:
+                    logger.exception("ingest flush failed; will retry")
+        finally:
+            conn.close()
+            lock_file.close()
+
+    def flush_once(self, conn=None):
+        """Move one batch into the database. Returns queue rows consumed."""
+        from backend import db, versions
+        from backend.models import Cause, Donation, Feedback, IngestCheckpoint, User, Volunteer
+
+        if conn is None:
+            conn = self._connect()
+            try:
+                return self.flush_once(conn)
+            finally:
+                conn.close()
+
+        models = {"donation": Donation, "feedback": Feedback, "volunteer": Volunteer}
+        with self._app.app_context():
+            try:
+                checkpoint = db.session.get(IngestCheckpoint, self.queue_id)
+                applied = checkpoint.last_id if checkpoint else 0
+                conn.execute("DELETE FROM queue WHERE id <= ?", (applied,))
+
+                batch = conn.execute(
+                    "SELECT id, kind, payload, enqueued_at FROM queue WHERE id > ? ORDER BY id LIMIT ?",
+                    (applied, self.batch_size)
+                ).fetchall()
+                if not batch:
+                    return 0
+                rows = [(qid, kind, json.loads(payload), enqueued_at)
+                        for qid, kind, payload, enqueued_at in batch]
+
+                # Causes/users deleted since the request was accepted
+                cause_ids = {r["cause_id"] for _, _, r, _ in rows}
+                user_ids = {r["user_id"] for _, _, r, _ in rows}
+                live_causes = {c for (c,) in db.session.query(Cause.cause_id).filter(Cause.cause_id.in_(cause_ids))}
+                live_users = {u for (u,) in db.session.query(User.user_id).filter(User.user_id.in_(user_ids))}
+                rows = [r for r in rows if r[2]["cause_id"] in live_causes and r[2]["user_id"] in live_users]
+
+                try:
+                    self._apply(db, versions, models, rows)
+                except (DBAPIError, StatementError, TypeError):
+                    db.session.rollback()
+                    rows = self._apply_one_by_one(db, versions, models, rows, conn)
+
+                last_id = batch[-1][0]
+                if checkpoint is None:
+                    db.session.add(IngestCheckpoint(queue_id=self.queue_id, last_id=last_id))
+                else:
+                    checkpoint.last_id = last_id
+                db.session.commit()
+            finally:
+                db.session.remove()
+
+        conn.execute("DELETE FROM queue WHERE id <= ?", (last_id,))
+        return len(batch)
+
+    @staticmethod
+    def _build(models, kind, row, enqueued_at):
+        obj = models[kind](**row)
+        if kind == "donation":
+            # When the donation was accepted, not when it was flushed
+            obj.created_at = datetime.utcfromtimestamp(enqueued_at)
+        return obj
+
+    def _apply(self, db, versions, models, rows):
+        db.session.add_all([self._build(models, kind, row, at) for _, kind, row, at in rows])
+        db.session.flush()
+        if rows:
+            versions.bump(*{f"cause:{row['cause_id']}" for _, _, row, _ in rows})
+
+    def _apply_one_by_one(self, db, versions, models, rows, conn):
+        good = []
+        for qid, kind, row, at in rows:
+            savepoint = db.session.begin_nested()
+            try:
+                db.session.add(self._build(models, kind, row, at))
+                db.session.flush()
+                savepoint.commit()
+                good.append((qid, kind, row, at))
+            except (DBAPIError, StatementError, TypeError) as e:
+                savepoint.rollback()
+                conn.execute(
+                    "INSERT OR REPLACE INTO dead_letter VALUES (?, ?, ?, ?, ?)",
+                    (qid, kind, json.dumps(row), str(e)[:1000], time.time())
+                )
+        if good:
+            versions.bump(*{f"cause:{row['cause_id']}" for _, _, row, _ in good})
+        return good
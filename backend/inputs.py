@@ -0,0 +1,43 @@
+# backend/inputs.py
+#
+# Parsing of the numeric fields clients send to the write endpoints.
+#
+# JSON bodies carry amounts and ratings as numbers or as numeric strings
+# ("25", "4"). They are converted here, once, so the models, the summary
+# and rollup hooks and the ingestion queue only ever see real numbers.
+import math
+
+MIN_RATING = 1
+MAX_RATING = 5
+
+
+class InputError(ValueError):
+    pass
+
+
+def _number(raw, name):
+    if isinstance(raw, bool) or not isinstance(raw, (int, float, str)):
+        raise InputError(f"{name} must be a number")
+    try:
+        value = float(raw)
+    except ValueError:
+        raise InputError(f"{name} must be a number")
+    if not math.isfinite(value):
+        raise InputError(f"{name} must be a number")
+    return value
+
+
+def parse_amount(raw):
+    """A donation amount: a positive number, returned as float."""
+    amount = _number(raw, "amount")
+    if amount <= 0:
+        raise InputError("amount must be positive")
+    return amount
+
+
+def parse_rating(raw):
+    """A feedback rating: a whole number from MIN_RATING to MAX_RATING."""
+    rating = _number(raw, "rating")
+    if not rating.is_integer() or not MIN_RATING <= rating <= MAX_RATING:
+        raise InputError(f"rating must be a whole number from {MIN_RATING} to {MAX_RATING}")
+    return int(rating)
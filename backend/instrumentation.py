@@ -0,0 +1,304 @@
+# backend/instrumentation.py
+#
+# Per-request SQL and timing instrumentation.
+#
+# Engine events time every statement and attribute it to the request
+# running on the current thread (via flask.g); request hooks wrap each
+# request and publish what was collected:
+#   - a Server-Timing header (db, serialize, app) on every response;
+#     streamed responses only carry the time until streaming started,
+#     since their queries and encoding run while the body is sent,
+#   - one structured JSON log line per request on the "backend.metrics"
+#     logger, plus a warning per statement slower than the threshold,
+#   - per-route latency histograms served by /api/admin/metrics.
+# Streamed responses are logged and added to the histograms when their
+# body has been sent in full (or the client went away).
+#
+# Statements are recorded as SQL text only. Parameter values are never
+# stored or logged; only their count is kept.
+#
+# When METRICS_ENABLED is off, init_app installs nothing, so requests and
+# statements run without any extra work.
+import json
+import logging
+import re
+import threading
+import time
+
+from flask import g, has_app_context, request
+from flask.json.provider import JSONProvider
+from sqlalchemy import event
+
+logger = logging.getLogger("backend.metrics")
+
+# Upper bounds in milliseconds; the last bucket is open-ended.
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+MAX_STATEMENT_CHARS = 500
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def _statement_text(statement):
+    return _WHITESPACE_RE.sub(" ", statement).strip()[:MAX_STATEMENT_CHARS]
+
+
+def _param_count(parameters, executemany):
+    if executemany:
+        return sum(len(p) for p in parameters)
+    return len(parameters) if parameters else 0
+
+
+# ------------------------------------------------------------
+# PER-REQUEST STATE
+# ------------------------------------------------------------
+class _RequestMetrics:
+    def __init__(self, keep_slowest):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serialize_seconds = 0.0
+        self.keep_slowest = keep_slowest
+        self.slowest = []           # [(seconds, statement, param_count)], slowest first
+
+    def statement(self, seconds, statement, param_count):
+        self.queries += 1
+        self.db_seconds += seconds
+        if len(self.slowest) < self.keep_slowest or seconds > self.slowest[-1][0]:
+            self.slowest.append((seconds, statement, param_count))
+            self.slowest.sort(key=lambda s: s[0], reverse=True)
+            del self.slowest[self.keep_slowest:]
+
+
+def _current():
+    return g.get("_request_metrics") if has_app_context() else None
+
+
+# ------------------------------------------------------------
+# PER-ROUTE HISTOGRAMS
+# ------------------------------------------------------------
+class _RouteStats:
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.queries = 0
+        self.max_queries = 0
+        self.db_ms = 0.0
+        self.serialize_ms = 0.0
+
+    def add(self, total_ms, status, metrics):
+        self.count += 1
+        self.errors += status >= 500
+        self.total_ms += total_ms
+        self.max_ms = max(self.max_ms, total_ms)
+        index = next((i for i, bound in enumerate(BUCKETS_MS) if total_ms <= bound), len(BUCKETS_MS))
+        self.buckets[index] += 1
+        self.queries += metrics.queries
+        self.max_queries = max(self.max_queries, metrics.queries)
+        self.db_ms += metrics.db_seconds * 1000
+        self.serialize_ms += metrics.serialize_seconds * 1000
+
+    def _quantile(self, q):
+        """Upper bound of the bucket holding the q-th request."""
+        rank, seen = q * self.count, 0
+        for bound, n in zip(BUCKETS_MS + (None,), self.buckets):
+            seen += n
+            if seen >= rank:
+                return bound if bound is not None else round(self.max_ms, 3)
+        return None
+
+    def as_dict(self):
+        n = self.count or 1
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "mean_ms": round(self.total_ms / n, 3),
+            "max_ms": round(self.max_ms, 3),
+            "p50_ms": self._quantile(0.50),
+            "p95_ms": self._quantile(0.95),
+            "p99_ms": self._quantile(0.99),
+            # le_ms is the bucket's upper bound; null for the open-ended last one
+            "histogram": [
+                {"le_ms": bound, "count": c}
+                for bound, c in zip(BUCKETS_MS + (None,), self.buckets)
+            ],
+            "queries_per_request": round(self.queries / n, 2),
+            "max_queries": self.max_queries,
+            "db_ms_per_request": round(self.db_ms / n, 3),
+            "serialize_ms_per_request": round(self.serialize_ms / n, 3),
+        }
+
+
+# ------------------------------------------------------------
+# JSON SERIALIZATION TIMING
+# ------------------------------------------------------------
+class TimedJSONProvider(JSONProvider):
+    """Wraps the app's JSON provider and adds its time to the request."""
+
+    def __init__(self, app, inner):
+        super().__init__(app)
+        self.inner = inner
+
+    def _timed(self, fn, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            metrics = _current()
+            if metrics is not None:
+                metrics.serialize_seconds += time.perf_counter() - started
+
+    def dumps(self, obj, **kwargs):
+        return self._timed(self.inner.dumps, obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        return self.inner.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        return self._timed(self.inner.response, *args, **kwargs)
+
+
+# ------------------------------------------------------------
+# EXTENSION
+# ------------------------------------------------------------
+class Instrumentation:
+    def __init__(self):
+        self.enabled = False
+        self.slow_query_ms = 100.0
+        self.keep_slowest = 3
+        self.log_requests = True
+        self._routes = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app, db):
+        self.enabled = bool(app.config.get("METRICS_ENABLED", False))
+        app.extensions["metrics"] = self
+        if not self.enabled:
+            return
+
+        self.slow_query_ms = float(app.config.get("METRICS_SLOW_QUERY_MS", 100))
+        self.keep_slowest = int(app.config.get("METRICS_SLOWEST_KEPT", 3))
+        self.log_requests = bool(app.config.get("METRICS_LOG_REQUESTS", True))
+
+        with app.app_context():
+            engine = db.engine
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(engine, "handle_error", self._handle_error)
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.json = TimedJSONProvider(app, app.json)
+
+    # -------------------- ENGINE EVENTS --------------------
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("metrics_started", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["metrics_started"].pop()
+        seconds = time.perf_counter() - started
+        metrics = _current()
+        if metrics is None:
+            return
+
+        params = _param_count(parameters, executemany)
+        metrics.statement(seconds, statement, params)
+        if seconds * 1000 >= self.slow_query_ms:
+            logger.warning(json.dumps({
+                "event": "slow_query",
+                "route": _route_name(),
+                "ms": round(seconds * 1000, 3),
+                "statement": _statement_text(statement),
+                "params": params,
+            }))
+
+    def _handle_error(self, context):
+        # A failed statement never reaches after_cursor_execute.
+        if context.connection is not None and context.connection.info.get("metrics_started"):
+            context.connection.info["metrics_started"].pop()
+
+    # -------------------- REQUEST HOOKS --------------------
+    def _before_request(self):
+        g._request_metrics = _RequestMetrics(self.keep_slowest)
+
+    def _after_request(self, response):
+        if response.is_streamed:
+            # The view has only set the stream up; its queries and encoding
+            # run while the body is sent. Leave the metrics on g for them and
+            # account for the request once the stream ends.
+            metrics = g.get("_request_metrics")
+            if metrics is not None:
+                response.headers.add("Server-Timing", 'app;dur=%.3f;desc="until streaming"'
+                                     % ((time.perf_counter() - metrics.started) * 1000))
+                response.response = self._finish_when_sent(
+                    response.response, metrics, _route_name(), request.path, response.status_code)
+            return response
+
+        metrics = g.pop("_request_metrics", None)
+        if metrics is None:
+            return response
+        total_ms, db_ms, serialize_ms = self._record(metrics, _route_name(), request.path, response.status_code)
+        response.headers.add(
+            "Server-Timing",
+            f'db;dur={db_ms:.3f};desc="{metrics.queries} queries", '
+            f"serialize;dur={serialize_ms:.3f}, app;dur={total_ms:.3f}"
+        )
+        return response
+
+    def _finish_when_sent(self, chunks, metrics, route, path, status):
+        try:
+            yield from chunks
+        finally:
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                close()
+            if _current() is metrics:
+                g.pop("_request_metrics")
+            self._record(metrics, route, path, status)
+
+    def _record(self, metrics, route, path, status):
+        """Add a finished request to its route's stats and log it."""
+        total_ms = (time.perf_counter() - metrics.started) * 1000
+        db_ms = metrics.db_seconds * 1000
+        serialize_ms = metrics.serialize_seconds * 1000
+        with self._lock:
+            self._routes.setdefault(route, _RouteStats()).add(total_ms, status, metrics)
+
+        if self.log_requests:
+            logger.info(json.dumps({
+                "event": "request",
+                "route": route,
+                "path": path,
+                "status": status,
+                "ms": round(total_ms, 3),
+                "queries": metrics.queries,
+                "db_ms": round(db_ms, 3),
+                "serialize_ms": round(serialize_ms, 3),
+                "slowest": [
+                    {"ms": round(s * 1000, 3), "statement": _statement_text(sql), "params": params}
+                    for s, sql, params in metrics.slowest
+                ],
+            }))
+        return total_ms, db_ms, serialize_ms
+
+    # -------------------- READING --------------------
+    def snapshot(self):
+        with self._lock:
+            routes = {name: stats.as_dict() for name, stats in sorted(self._routes.items())}
+        return {
+            "enabled": self.enabled,
+            "slow_query_ms": self.slow_query_ms,
+            "buckets_ms": list(BUCKETS_MS),
+            "routes": routes,
+        }
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+
+def _route_name():
+    # The URL rule, not the path, so /api/causes/<id> is one route.
+    rule = request.url_rule.rule if request.url_rule is not None else "<unmatched>"
+    return f"{request.method} {rule}"
@@ -0,0 +1,214 @@
+# backend/jobs.py
+#
+# Chunked background deletes for very large users and causes.
+#
+# One DELETE of a cause with hundreds of thousands of donations lets the
+# database cascade everything in a single long transaction, which holds
+# the write lock for the whole time. Above DELETE_JOB_THRESHOLD dependent
+# rows the admin routes therefore start a DeleteJob and return its id at
+# once. A single worker thread then works through it:
+#
+#   1. drop the causes' cause_summary rows, so they leave every listing
+#      immediately;
+#   2. delete dependent rows a chunk at a time, committing after each
+#      chunk and applying -amount/-rating/-volunteer deltas to the
+#      summaries of surviving causes and users;
+#   3. delete the (now small) user/cause rows through bulk.delete_accounts
+#      and let ON DELETE CASCADE take whatever is left.
+#
+# Every step is idempotent, so a job cut short by a restart can simply be
+# started again for the same target. The worker stamps heartbeat_at after
+# every chunk; a queued/running job whose heartbeat is older than
+# DELETE_JOB_STALE_SECONDS is taken to be orphaned (its process died), and
+# the next delete request for the target takes it over and resubmits it.
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import delete, func, inspect, null, or_, select, update
+
+from backend import bulk, clusters, db, lookups, rollups, summary, versions
+from backend.models import (
+    Cause, AccountDetails, Location, Donation, Feedback, Volunteer,
+    UserContact, UserSocials, CauseContact, CauseSocials, DeleteJob
+)
+
+logger = logging.getLogger(__name__)
+
+CAUSE_CHILDREN = (Donation, Feedback, Volunteer, Location, CauseContact, CauseSocials, AccountDetails)
+USER_CHILDREN = (Donation, Feedback, Volunteer, UserContact, UserSocials, AccountDetails)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _pool():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="delete-job")
+        return _executor
+
+
+# ------------------------------------------------------------
+# SIZING
+# ------------------------------------------------------------
+def _owned_causes(kind, target_id):
+    if kind == "cause":
+        return [target_id]
+    return [cid for (cid,) in db.session.execute(select(Cause.cause_id).where(Cause.user_id == target_id))]
+
+
+def estimate_rows(kind, target_id):
+    """Dependent rows a delete of this user/cause would remove (one COUNT per table)."""
+    if kind == "cause":
+        owned = [target_id]
+    else:
+        owned = select(Cause.cause_id).where(Cause.user_id == target_id).scalar_subquery()
+
+    total = 0
+    for model in dict.fromkeys(CAUSE_CHILDREN + USER_CHILDREN):
+        conditions = []
+        if model in CAUSE_CHILDREN:
+            conditions.append(model.cause_id.in_(owned))
+        if kind == "user" and model in USER_CHILDREN:
+            conditions.append(model.user_id == target_id)
+        if conditions:
+            total += db.session.execute(
+                select(func.count()).select_from(model).where(or_(*conditions))
+            ).scalar()
+    return total
+
+
+# ------------------------------------------------------------
+# STARTING / READING
+# ------------------------------------------------------------
+def start(kind, target_id):
+    """Queue a delete job, return the one already pending, or take over an orphaned one."""
+    job = DeleteJob.query.filter(
+        DeleteJob.kind == kind, DeleteJob.target_id == target_id,
+        DeleteJob.status.in_(("queued", "running"))
+    ).first()
+    if job:
+        stale = datetime.utcnow() - timedelta(seconds=current_app.config.get("DELETE_JOB_STALE_SECONDS", 600))
+        if (job.heartbeat_at or job.created_at) >= stale or not _take_over(job, stale):
+            return job
+    else:
+        job = DeleteJob(kind=kind, target_id=target_id, status="queued", rows_deleted=0,
+                        heartbeat_at=datetime.utcnow())
+        db.session.add(job)
+        db.session.commit()
+    _submit(job.job_id)
+    return job
+
+
+def _take_over(job, stale):
+    """Claim an orphaned job; only one process wins if several try at once."""
+    claimed = db.session.execute(
+        update(DeleteJob)
+        .where(DeleteJob.job_id == job.job_id, DeleteJob.status.in_(("queued", "running")),
+               func.coalesce(DeleteJob.heartbeat_at, DeleteJob.created_at) < stale)
+        .values(status="queued", heartbeat_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.session.commit()
+    if claimed:
+        logger.warning("taking over orphaned delete job %s", job.job_id)
+    return bool(claimed)
+
+
+def _submit(job_id):
+    _pool().submit(_run, current_app._get_current_object(), job_id,
+                   current_app.config.get("DELETE_JOB_CHUNK_SIZE", 2000))
+
+
+# ------------------------------------------------------------
+# WORKER
+# ------------------------------------------------------------
+def _bump(cause_ids):
+    if cause_ids:
+        versions.bump("causes", *[f"cause:{cid}" for cid in cause_ids])
+
+
+def _delete_chunks(job, model, column, value, chunk_size, gone, gone_users):
+    """Delete model rows where column == value, chunk by chunk."""
+    pk = inspect(model).primary_key[0]
+    tracked = {m: v for m, v, _ in summary.TRACKED}
+    columns = [pk]
+    if model in tracked:
+        amount = tracked[model] if tracked[model] is not None else null()
+        columns += [model.cause_id, model.user_id, amount]
+    if model is Donation:
+        columns.append(Donation.created_at)
+
+    while True:
+        rows = db.session.execute(
+            select(*columns).where(column == value).order_by(pk).limit(chunk_size)
+        ).all()
+        if not rows:
+            return
+        db.session.execute(delete(model).where(pk.in_([r[0] for r in rows])))
+
+        if model in tracked:
+            # Keep the surviving causes' and users' aggregates right after
+            # every chunk.
+            changed = summary.remove_rows(db.session.connection(), model, [r[1:4] for r in rows],
+                                          deleted_causes=gone, deleted_users=gone_users)
+            _bump(changed)
+        if model is Donation:
+            rollups.remove(db.session.connection(), [(r[1], r[4], r[3]) for r in rows if r[1] not in gone])
+
+        job.rows_deleted += len(rows)
+        job.heartbeat_at = datetime.utcnow()
+        db.session.commit()
+
+
+def _run(app, job_id, chunk_size):
+    with app.app_context():
+        job = db.session.get(DeleteJob, job_id)
+        if job.status not in ("queued", "running"):
+            # Submitted twice (taken over while still waiting its turn).
+            db.session.remove()
+            return
+        job.status = "running"
+        job.heartbeat_at = datetime.utcnow()
+        db.session.commit()
+        try:
+            cause_ids = set(_owned_causes(job.kind, job.target_id))
+            user_ids = {job.target_id} if job.kind == "user" else set()
+
+            summary.delete(db.session.connection(), cause_ids)
+            _bump(cause_ids)
+            db.session.commit()
+            clusters.invalidate()
+
+            for cause_id in sorted(cause_ids):
+                for model in CAUSE_CHILDREN:
+                    _delete_chunks(job, model, model.cause_id, cause_id, chunk_size, cause_ids, user_ids)
+            if job.kind == "user":
+                for model in USER_CHILDREN:
+                    _delete_chunks(job, model, model.user_id, job.target_id, chunk_size, cause_ids, user_ids)
+
+            if job.kind == "user":
+                counts, deleted, recounted = bulk.delete_accounts(user_ids=[job.target_id])
+            else:
+                counts, deleted, recounted = bulk.delete_accounts(cause_ids=[job.target_id])
+            _bump(deleted | recounted)
+            lookups.invalidate_all()
+            job.rows_deleted += sum(counts.values())
+            job.status = "done"
+            job.finished_at = datetime.utcnow()
+            db.session.commit()
+            clusters.invalidate()
+        except Exception as e:
+            logger.exception("delete job %s failed", job_id)
+            db.session.rollback()
+            job = db.session.get(DeleteJob, job_id)
+            job.status = "failed"
+            job.error = str(e)[:1000]
+            job.finished_at = datetime.utcnow()
+            db.session.commit()
+        finally:
+            db.session.remove()
@@ -0,0 +1,88 @@
+# backend/json_provider.py
+#
+# JSON provider for the app: orjson when it is installed, the stdlib json
+# module otherwise.
+#
+# Encoding the cause listings is a visible share of request CPU, and
+# orjson encodes those payloads several times faster (see
+# benchmarks/json_encode.py). Both paths produce the same documents:
+# sorted keys, compact separators outside debug mode, ISO 8601 for
+# date/time/datetime, and Decimal as a string, as Flask does. orjson
+# writes non-ASCII characters as UTF-8 instead of \u escapes.
+#
+# JSON_PROVIDER selects the encoder: "auto" (orjson if importable),
+# "orjson" (fail at start-up without it) or "stdlib".
+import dataclasses
+import decimal
+from datetime import date, time
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+# dumps() arguments orjson's output already satisfies; any other argument
+# (indent, cls, ...) goes through the stdlib encoder.
+_ORJSON_COMPATIBLE = {"separators", "sort_keys", "ensure_ascii"}
+
+
+def _default(o):
+    if isinstance(o, (date, time)):
+        # datetime is a date subclass; Flask's default would give an HTTP date.
+        return o.isoformat()
+    if isinstance(o, decimal.Decimal):
+        return str(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if hasattr(o, "__html__"):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """DefaultJSONProvider that encodes with orjson when it can."""
+
+    default = staticmethod(_default)
+
+    def __init__(self, app, use_orjson=True):
+        super().__init__(app)
+        self.orjson = orjson if use_orjson else None
+
+    def _options(self):
+        options = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        return options
+
+    def _orjson_ok(self, kwargs):
+        return self.orjson is not None and kwargs.keys() <= _ORJSON_COMPATIBLE
+
+    def dumps(self, obj, **kwargs):
+        if not self._orjson_ok(kwargs):
+            return super().dumps(obj, **kwargs)
+        return self.orjson.dumps(obj, default=self.default, option=self._options()).decode()
+
+    def loads(self, s, **kwargs):
+        if self.orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return self.orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        pretty = (self.compact is None and self._app.debug) or self.compact is False
+        if self.orjson is None or pretty:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        body = self.orjson.dumps(obj, default=self.default, option=self._options() | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def init_app(app):
+    """Install the provider; call before metrics.init_app() so it is timed too."""
+    kind = app.config.get("JSON_PROVIDER", "auto")
+    if kind not in ("auto", "orjson", "stdlib"):
+        raise RuntimeError("JSON_PROVIDER must be auto, orjson or stdlib")
+    if kind == "orjson" and orjson is None:
+        raise RuntimeError("JSON_PROVIDER=orjson requires the 'orjson' package")
+    app.json = FastJSONProvider(app, use_orjson=kind != "stdlib")
@@ -0,0 +1,103 @@
+# backend/lookups.py
+#
+# Cached account/cause checks for the donate, volunteer and feedback
+# routes.
+#
+# Every write used to load the AuthData row (role, verified, fk_id) and the
+# Cause row before inserting anything. Both are kept in a small in-process
+# LRU with a TTL, so the common write path runs no lookup query at all.
+#
+# Entries are dropped explicitly by the routes that change them (verify,
+# unverify, deletes, delete jobs). The drop happens once the transaction
+# commits, so a concurrent request cannot re-cache the old row in the
+# meantime. Misses are not cached, which keeps newly registered accounts
+# and causes usable at once. The TTL is only a safety net for changes made
+# by other processes.
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from backend import db
+from backend.cache import MemoryCache
+from backend.models import AuthData, Cause
+
+MAX_ENTRIES = 50000
+CACHE_TTL_SECONDS = 30
+
+_cache = MemoryCache(max_entries=MAX_ENTRIES, default_ttl=CACHE_TTL_SECONDS)
+
+
+# ------------------------------------------------------------
+# LOOKUPS
+# ------------------------------------------------------------
+def account(auth_id):
+    """(role, verified, fk_id) for an auth id, or None."""
+    key = f"auth:{auth_id}"
+    found = _cache.get(key)
+    if found is None:
+        row = db.session.query(AuthData.role, AuthData.verified, AuthData.fk_id).filter_by(id=auth_id).first()
+        if row is None:
+            return None
+        found = tuple(row)
+        _cache.set(key, found)
+    return found
+
+
+def cause(cause_id):
+    """(exists, verified) for a cause id."""
+    key = f"cause:{cause_id}"
+    found = _cache.get(key)
+    if found is None:
+        row = db.session.query(Cause.verified).filter_by(cause_id=cause_id).first()
+        if row is None:
+            return (False, False)
+        found = (True, bool(row[0]))
+        _cache.set(key, found)
+    return found
+
+
+def check_writer(auth_id, cause_id):
+    """(user_id, None) or (None, (error, status)) for a user writing to a cause."""
+    auth = account(auth_id)
+    if not auth or auth[0] != "user":
+        return None, ("Invalid user", 403)
+    if not auth[1]:
+        return None, ("You are not verified", 403)
+    if not auth[2]:
+        return None, ("User record not found", 404)
+    if not cause(cause_id)[0]:
+        return None, ("Cause not found", 404)
+    return auth[2], None
+
+
+# ------------------------------------------------------------
+# INVALIDATION
+# ------------------------------------------------------------
+def invalidate(auth_ids=(), cause_ids=()):
+    """Forget these entries once the current transaction commits."""
+    keys = [f"auth:{a}" for a in auth_ids] + [f"cause:{c}" for c in cause_ids]
+    db.session.info.setdefault("stale_lookups", set()).update(keys)
+
+
+def invalidate_all():
+    """Forget every entry once the current transaction commits (deletes)."""
+    db.session.info["stale_lookups_all"] = True
+
+
+def clear():
+    _cache.clear()
+
+
+@event.listens_for(Session, "after_commit")
+def _drop_on_commit(session):
+    if session.info.pop("stale_lookups_all", False):
+        session.info.pop("stale_lookups", None)
+        _cache.clear()
+        return
+    for key in session.info.pop("stale_lookups", ()):
+        _cache.delete(key)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session):
+    session.info.pop("stale_lookups", None)
+    session.info.pop("stale_lookups_all", None)
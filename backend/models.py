@@ -1,7 +1,63 @@
+import sqlite3
+
 from backend import db
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import Pool
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
 
+
+# SQLite ignores ON DELETE CASCADE / SET NULL unless foreign keys are
+# switched on, per connection. Deletes rely on the database cascading.
+#
+# pysqlite also only sends BEGIN right before a DML statement, so a
+# SAVEPOINT issued first opens the transaction itself and its RELEASE
+# commits it: begin_nested() items would each be committed on their own.
+# The driver's transaction handling is therefore switched off and the
+# transaction is opened here instead, with BEGIN IMMEDIATE, right before
+# the first write or SAVEPOINT. Reads before that run outside a
+# transaction, as they did with the driver's handling. A deferred BEGIN
+# at the start would turn every read-then-write request into a lock
+# upgrade, which under concurrent writers fails at once with "database
+# is locked" instead of waiting for the busy timeout.
+#
+# File databases are put in WAL mode. With the default rollback journal, a
+# reader holds a shared lock for as long as its statement is open, and the
+# streamed admin listings keep a yield_per cursor open for the whole
+# response. Every COMMIT in the meantime would fail with "database is
+# locked". In WAL mode readers and the one writer no longer block each other.
+@event.listens_for(Engine, "connect")
+def _configure_sqlite_connection(dbapi_connection, connection_record):
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        if cursor.execute("PRAGMA database_list").fetchone()[2]:   # not :memory:
+            cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.close()
+
+
+_SQLITE_WRITES = ("INSERT", "UPDATE", "DELETE", "REPLACE", "SAVEPOINT")
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _begin_sqlite_transaction(conn, cursor, statement, parameters, context, executemany):
+    dbapi_connection = cursor.connection
+    if (isinstance(dbapi_connection, sqlite3.Connection) and not dbapi_connection.in_transaction
+            and statement.lstrip()[:9].upper().startswith(_SQLITE_WRITES)):
+        dbapi_connection.execute("BEGIN IMMEDIATE")
+
+
+# A COMMIT that fails (SQLITE_BUSY) leaves SQLite inside the transaction,
+# but SQLAlchemy counts it as ended and skips the reset-on-return
+# rollback. Without this the connection would go back to the pool with
+# the transaction (and its locks) still open.
+@event.listens_for(Pool, "checkin")
+def _end_dangling_sqlite_transaction(dbapi_connection, connection_record):
+    if isinstance(dbapi_connection, sqlite3.Connection) and dbapi_connection.in_transaction:
+        dbapi_connection.rollback()
+
 # ============================
 #          AUTHENTICATION
 # ============================
@@ -15,7 +71,7 @@ class AuthData(db.Model):
     password_hash = db.Column(db.String(255), nullable=False)
     verified = db.Column(db.Boolean, default=False)
 
-    fk_id = db.Column(db.Integer, nullable=True)  # optional link to user or cause
+    fk_id = db.Column(db.Integer, nullable=True, index=True)  # optional link to user or cause
 
     def set_password(self, password):
         self.password_hash = generate_password_hash(password)
@@ -53,6 +109,9 @@ class User(db.Model):
 # ============================
 class Cause(db.Model):
     __tablename__ = 'cause'
+    __table_args__ = (
+        db.Index('ix_cause_verified_cause_id', 'verified', 'cause_id'),
+    )
 
     cause_id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(255), nullable=False)
@@ -62,7 +121,7 @@ class Cause(db.Model):
     if_online = db.Column(db.Boolean, default=False)
     verified = db.Column(db.Boolean, default=False)
 
-    user_id = db.Column(db.Integer, db.ForeignKey('app_user.user_id', ondelete="CASCADE"), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('app_user.user_id', ondelete="CASCADE"), nullable=False, index=True)
 
     ngo = db.relationship('NGO', uselist=False, backref='cause', cascade="all, delete-orphan", passive_deletes=True)
     event = db.relationship('Event', uselist=False, backref='cause', cascade="all, delete-orphan", passive_deletes=True)
@@ -101,8 +160,8 @@ class Event(db.Model):
     date = db.Column(db.Date)
     time = db.Column(db.Time)
 
-    cause_id = db.Column(db.Integer, db.ForeignKey('cause.cause_id', ondelete="CASCADE"), nullable=False)
-    ngo_id = db.Column(db.Integer, db.ForeignKey('ngo.ngo_id', ondelete="SET NULL"))
+    cause_id = db.Column(db.Integer, db.ForeignKey('cause.cause_id', ondelete="CASCADE"), nullable=False, index=True)
+    ngo_id = db.Column(db.Integer, db.ForeignKey('ngo.ngo_id', ondelete="SET NULL"), index=True)
 
 
 # ============================
@@ -110,6 +169,9 @@ class Event(db.Model):
 # ============================
 class Location(db.Model):
     __tablename__ = 'location'
+    __table_args__ = (
+        db.Index('ix_location_lat_lng', 'latitude', 'longitude'),
+    )
 
     loc_id = db.Column(db.Integer, primary_key=True)
     country = db.Column(db.String(100))
@@ -119,7 +181,7 @@ class Location(db.Model):
     longitude = db.Column(db.Float)
     contact_no = db.Column(db.String(50))
 
-    cause_id = db.Column(db.Integer, db.ForeignKey('cause.cause_id', ondelete="CASCADE"))
+    cause_id = db.Column(db.Integer, db.ForeignKey('cause.cause_id', ondelete="CASCADE"), index=True)
 
 
 # ============================
@@ -133,8 +195,8 @@ class AccountDetails(db.Model):
     acc_name = db.Column(db.String(100))
 
     # FIXED HERE ↓↓↓
-    user_id = db.Column(db.Integer, db.ForeignKey('app_user.user_id', ondelete="CASCADE"), nullable=True)
-    cause_id = db.Column(db.Integer, db.ForeignKey('cause.cause_id', ondelete="CASCADE"), nullable=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('app_user.user_id', ondelete="CASCADE"), nullable=True, index=True)
+    cause_id = db.Column(db.Integer, db.ForeignKey('cause.cause_id', ondelete="CASCADE"), nullable=True, index=True)
 
 
 # ============================
@@ -142,6 +204,10 @@ class AccountDetails(db.Model):
 # ============================
 class Feedback(db.Model):
     __tablename__ = 'feedback'
+    __table_args__ = (
+        db.Index('ix_feedback_cause_id_feedback_id', 'cause_id', 'feedback_id'),  # newest-first pages
+        db.Index('ix_feedback_cause_id_rating', 'cause_id', 'rating'),            # covers the histogram
+    )
 
     feedback_id = db.Column(db.Integer, primary_key=True)
     comment = db.Column(db.Text)
@@ -150,7 +216,7 @@ class Feedback(db.Model):
     cause_id = db.Column(db.Integer, db.ForeignKey('cause.cause_id', ondelete="CASCADE"), nullable=False)
 
     # FIXED HERE ↓↓↓
-    user_id = db.Column(db.Integer, db.ForeignKey('app_user.user_id', ondelete="CASCADE"), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('app_user.user_id', ondelete="CASCADE"), nullable=False, index=True)
 
 
 # ============================
@@ -158,9 +224,15 @@ class Feedback(db.Model):
 # ============================
 class Donation(db.Model):
     __tablename__ = 'donation'
+    __table_args__ = (
+        # Include amount so per-cause / per-user totals never touch the table.
+        db.Index('ix_donation_cause_id_amount', 'cause_id', 'amount'),
+        db.Index('ix_donation_user_id_amount', 'user_id', 'amount'),
+    )
 
     donation_id = db.Column(db.Integer, primary_key=True)
     amount = db.Column(db.Float)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)   # NULL for rows older than the column
 
     # FIXED HERE ↓↓↓
     user_id = db.Column(db.Integer, db.ForeignKey('app_user.user_id', ondelete="CASCADE"), nullable=False)
@@ -176,8 +248,8 @@ class Volunteer(db.Model):
     volunteer_id = db.Column(db.Integer, primary_key=True)
 
     # FIXED HERE ↓↓↓
-    user_id = db.Column(db.Integer, db.ForeignKey('app_user.user_id', ondelete="CASCADE"), nullable=False)
-    cause_id = db.Column(db.Integer, db.ForeignKey('cause.cause_id', ondelete="CASCADE"), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('app_user.user_id', ondelete="CASCADE"), nullable=False, index=True)
+    cause_id = db.Column(db.Integer, db.ForeignKey('cause.cause_id', ondelete="CASCADE"), nullable=False, index=True)
 
 
 # ============================
@@ -190,7 +262,7 @@ class UserContact(db.Model):
     contact = db.Column(db.String(100))
 
     # FIXED HERE ↓↓↓
-    user_id = db.Column(db.Integer, db.ForeignKey('app_user.user_id', ondelete="CASCADE"), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('app_user.user_id', ondelete="CASCADE"), nullable=False, index=True)
 
 
 # ============================
@@ -203,7 +275,7 @@ class UserSocials(db.Model):
     social = db.Column(db.String(100))
 
     # FIXED HERE ↓↓↓
-    user_id = db.Column(db.Integer, db.ForeignKey('app_user.user_id', ondelete="CASCADE"), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('app_user.user_id', ondelete="CASCADE"), nullable=False, index=True)
 
 
 # ============================
@@ -215,7 +287,7 @@ class CauseContact(db.Model):
     contact_id = db.Column(db.Integer, primary_key=True)
     contact = db.Column(db.String(100))
 
-    cause_id = db.Column(db.Integer, db.ForeignKey('cause.cause_id', ondelete="CASCADE"), nullable=False)
+    cause_id = db.Column(db.Integer, db.ForeignKey('cause.cause_id', ondelete="CASCADE"), nullable=False, index=True)
 
 
 # ============================
@@ -227,4 +299,167 @@ class CauseSocials(db.Model):
     social_id = db.Column(db.Integer, primary_key=True)
     social = db.Column(db.String(100))
 
-    cause_id = db.Column(db.Integer, db.ForeignKey('cause.cause_id', ondelete="CASCADE"), nullable=False)
+    cause_id = db.Column(db.Integer, db.ForeignKey('cause.cause_id', ondelete="CASCADE"), nullable=False, index=True)
+
+
+# ============================
+#      CHANGE VERSION
+# ============================
+class ChangeVersion(db.Model):
+    """Monotonic version per scope ("causes", "cause:<id>") for ETags."""
+    __tablename__ = 'change_version'
+
+    scope = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+
+# ============================
+#      CAUSE SUMMARY
+# ============================
+class CauseSummary(db.Model):
+    """Read model behind the cause cards: one row per cause.
+
+    Maintained by backend/summary.py in the same transaction as the
+    writes it mirrors; rebuild with `flask rebuild-cause-summary`.
+    """
+    __tablename__ = 'cause_summary'
+    __table_args__ = (
+        db.Index('ix_cause_summary_verified_type', 'verified', 'type', 'cause_id'),
+    )
+
+    cause_id = db.Column(db.Integer, db.ForeignKey('cause.cause_id', ondelete="CASCADE"), primary_key=True)
+    verified = db.Column(db.Boolean, nullable=False, default=False)
+    name = db.Column(db.String(255), nullable=False)
+    description = db.Column(db.Text)
+    logo = db.Column(db.String(255))
+    type = db.Column(db.String(10), nullable=False, default="Unknown")  # NGO, Event, Unknown
+
+    # NGO / Event details
+    year_est = db.Column(db.Integer)
+    age = db.Column(db.Integer)
+    date = db.Column(db.Date)
+    time = db.Column(db.Time)
+    capacity = db.Column(db.Integer)
+
+    # First location, contacts and socials (JSON arrays)
+    latitude = db.Column(db.Float)
+    longitude = db.Column(db.Float)
+    contacts = db.Column(db.Text, nullable=False, default="[]")
+    socials = db.Column(db.Text, nullable=False, default="[]")
+
+    # Running aggregates
+    donation_total = db.Column(db.Float, nullable=False, default=0)
+    donation_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_sum = db.Column(db.Integer, nullable=False, default=0)
+    rating_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_avg = db.Column(db.Float)   # rating_sum / rating_count, kept for the ordered index
+    volunteer_count = db.Column(db.Integer, nullable=False, default=0)
+
+
+# Leaderboards (/api/causes/top): each is a single ordered index scan,
+# ties broken by the older cause.
+db.Index('ix_cause_summary_top_donations', CauseSummary.verified,
+         CauseSummary.donation_total.desc(), CauseSummary.cause_id)
+db.Index('ix_cause_summary_top_rating', CauseSummary.verified,
+         CauseSummary.rating_avg.desc(), CauseSummary.rating_count.desc(), CauseSummary.cause_id)
+db.Index('ix_cause_summary_top_volunteers', CauseSummary.verified,
+         CauseSummary.volunteer_count.desc(), CauseSummary.cause_id)
+
+
+# ============================
+#       USER SUMMARY
+# ============================
+class UserSummary(db.Model):
+    """Running donation/rating/volunteer aggregates, one row per user.
+
+    Maintained by backend/summary.py alongside cause_summary; check and
+    repair with `flask reconcile-summaries`.
+    """
+    __tablename__ = 'user_summary'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('app_user.user_id', ondelete="CASCADE"), primary_key=True)
+    donation_total = db.Column(db.Float, nullable=False, default=0)
+    donation_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_sum = db.Column(db.Integer, nullable=False, default=0)
+    rating_count = db.Column(db.Integer, nullable=False, default=0)
+    volunteer_count = db.Column(db.Integer, nullable=False, default=0)
+
+
+# ============================
+#      DONATION ROLLUP
+# ============================
+class DonationRollup(db.Model):
+    """Donations per cause per day/week/month, for the analytics endpoint.
+
+    Maintained by backend/rollups.py as donations are written; rebuild
+    with `flask backfill-donation-rollups`.
+    """
+    __tablename__ = 'donation_rollup'
+    __table_args__ = (
+        db.Index('ix_donation_rollup_granularity_bucket', 'granularity', 'bucket'),  # all-causes ranges
+    )
+
+    cause_id = db.Column(db.Integer, db.ForeignKey('cause.cause_id', ondelete="CASCADE"), primary_key=True)
+    granularity = db.Column(db.String(5), primary_key=True)   # day, week, month
+    bucket = db.Column(db.Date, primary_key=True)             # first day of the bucket (weeks start Monday)
+    amount_total = db.Column(db.Float, nullable=False, default=0)
+    donation_count = db.Column(db.Integer, nullable=False, default=0)
+
+
+# ============================
+#        DELETE JOB
+# ============================
+class DeleteJob(db.Model):
+    """A chunked background delete of a large user or cause."""
+    __tablename__ = 'delete_job'
+
+    job_id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(10), nullable=False)      # user, cause
+    target_id = db.Column(db.Integer, nullable=False)
+    status = db.Column(db.String(10), nullable=False, default="queued")  # queued, running, done, failed
+    rows_deleted = db.Column(db.Integer, nullable=False, default=0)
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    heartbeat_at = db.Column(db.DateTime)   # last sign of life from the worker
+    finished_at = db.Column(db.DateTime)
+
+    def to_dict(self):
+        return {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "target_id": self.target_id,
+            "status": self.status,
+            "rows_deleted": self.rows_deleted,
+            "error": self.error,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "heartbeat_at": self.heartbeat_at.isoformat() if self.heartbeat_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+# ============================
+#    INGEST CHECKPOINT
+# ============================
+class IngestCheckpoint(db.Model):
+    """Last write-behind queue row applied, committed with the batch."""
+    __tablename__ = 'ingest_checkpoint'
+
+    queue_id = db.Column(db.String(36), primary_key=True)
+    last_id = db.Column(db.Integer, nullable=False, default=0)
+
+
+# ============================
+#    IDEMPOTENCY KEYS
+# ============================
+class IdempotencyKey(db.Model):
+    """Outcome of a write request sent with an Idempotency-Key header."""
+    __tablename__ = 'idempotency_key'
+
+    key = db.Column(db.String(64), primary_key=True)         # sha256(path, auth_id, header)
+    request_hash = db.Column(db.String(64), nullable=False)  # sha256 of the body
+    status = db.Column(db.String(10), nullable=False, default="pending")  # pending, done
+    response_status = db.Column(db.Integer)
+    response_body = db.Column(db.Text)
+    content_type = db.Column(db.String(100))
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
@@ -0,0 +1,91 @@
+# backend/pagination.py
+import base64
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+class PaginationError(ValueError):
+    pass
+
+
+# ------------------------------------------------------------
+# LIMIT PARSING
+# ------------------------------------------------------------
+def parse_limit(raw, default=DEFAULT_LIMIT, maximum=MAX_LIMIT):
+    if raw is None or raw == "":
+        return default
+    try:
+        limit = int(raw)
+    except (TypeError, ValueError):
+        raise PaginationError("limit must be an integer")
+    if limit < 1:
+        raise PaginationError("limit must be positive")
+    return min(limit, maximum)
+
+
+# ------------------------------------------------------------
+# CURSOR TOKENS
+# ------------------------------------------------------------
+# Cursors are opaque to clients: the last primary key of the page,
+# base64-encoded so callers do not start building them by hand.
+def encode_cursor(last_id):
+    if last_id is None:
+        return None
+    return base64.urlsafe_b64encode(str(last_id).encode()).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        return int(base64.urlsafe_b64decode(padded.encode()).decode())
+    except (ValueError, UnicodeDecodeError):
+        raise PaginationError("Invalid cursor")
+
+
+def keyset_page(query, key_column, cursor, limit, descending=False):
+    """Fetch one page ordered by key_column; returns (rows, next_cursor)."""
+    after = decode_cursor(cursor)
+    if after is not None:
+        query = query.filter(key_column < after if descending else key_column > after)
+    order = key_column.desc() if descending else key_column.asc()
+    rows = query.order_by(order).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(_key_of(rows[-1], key_column))
+    return rows, next_cursor
+
+
+def keyset_stream(query, key_column, cursor, limit, descending=False, yield_per=100):
+    """keyset_page() for streamed responses: (row iterator, next_cursor).
+
+    The cursor is checked up front; next_cursor() is known once the
+    iterator is exhausted.
+    """
+    after = decode_cursor(cursor)
+    if after is not None:
+        query = query.filter(key_column < after if descending else key_column > after)
+    order = key_column.desc() if descending else key_column.asc()
+    query = query.order_by(order).limit(limit + 1).yield_per(min(yield_per, limit + 1))
+
+    found = {"next": None}
+
+    def rows():
+        last = None
+        for i, row in enumerate(query):
+            if i == limit:
+                found["next"] = encode_cursor(_key_of(last, key_column))
+                break
+            last = row
+            yield row
+
+    return rows(), lambda: found["next"]
+
+
+def _key_of(row, key_column):
+    # ORM entities expose the key as an attribute; Row tuples by label.
+    return getattr(row, key_column.key)
@@ -0,0 +1,256 @@
+# backend/rollups.py
+#
+# Donation totals per cause per day, week and month (donation_rollup).
+#
+# Dashboards ask for trends over date ranges. Summing raw donations for
+# that means scanning every row in the range. Instead each donation adds
+# its amount to three rollup rows (its day, its ISO week, its month) in
+# the same transaction, and range queries read at most one row per cause
+# per bucket.
+#
+# A session hook keeps the rollups in step with ORM writes: inserts add,
+# updates move the amount between buckets, deletes (including a user's
+# donations cascading away) subtract. Set-based deletes that bypass the
+# ORM call remove() themselves. Rows of a deleted cause go with it (ON
+# DELETE CASCADE).
+#
+# Donations written before created_at existed have no timestamp and are
+# left out. backfill() rebuilds the whole table from the donation table
+# in streaming batches and backs `flask backfill-donation-rollups`.
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import delete, event, func, inspect, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from backend.models import Donation, DonationRollup, User
+
+rollup = DonationRollup.__table__
+GRANULARITIES = ("day", "week", "month")
+DEFAULT_BUCKETS = {"day": 30, "week": 12, "month": 12}
+MAX_BUCKETS = 1000
+UPSERT_CHUNK_SIZE = 500
+
+
+# ------------------------------------------------------------
+# BUCKETS
+# ------------------------------------------------------------
+def bucket_start(day, granularity):
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def next_bucket(bucket, granularity):
+    if granularity == "week":
+        return bucket + timedelta(days=7)
+    if granularity == "month":
+        return (bucket.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return bucket + timedelta(days=1)
+
+
+def _deltas(rows, sign, into=None):
+    """Fold (cause_id, created_at, amount) rows into {(cause_id, granularity, bucket): [amount, count]}."""
+    into = defaultdict(lambda: [0.0, 0]) if into is None else into
+    for cause_id, created_at, amount in rows:
+        if created_at is None:
+            continue
+        day = created_at.date()
+        for granularity in GRANULARITIES:
+            totals = into[(cause_id, granularity, bucket_start(day, granularity))]
+            totals[0] += sign * float(amount or 0)
+            totals[1] += sign
+    return into
+
+
+# ------------------------------------------------------------
+# WRITING
+# ------------------------------------------------------------
+def apply(conn, deltas):
+    """Add the deltas to donation_rollup.
+
+    Buckets that gain donations are upserted. Buckets that only lose
+    donations or change amounts are updated in place, never created.
+    """
+    adds = [{"cause_id": c, "granularity": g, "bucket": b, "amount_total": a, "donation_count": n}
+            for (c, g, b), (a, n) in sorted(deltas.items()) if n > 0]
+    changes = [{"cid": c, "g": g, "b": b, "amount": a, "n": n}
+               for (c, g, b), (a, n) in sorted(deltas.items()) if n <= 0 and (n or a)]
+
+    if adds:
+        dialect = conn.dialect.name
+        if dialect in ("sqlite", "postgresql"):
+            insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+            for i in range(0, len(adds), UPSERT_CHUNK_SIZE):
+                stmt = insert(rollup).values(adds[i:i + UPSERT_CHUNK_SIZE])
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[rollup.c.cause_id, rollup.c.granularity, rollup.c.bucket],
+                    set_={"amount_total": rollup.c.amount_total + stmt.excluded.amount_total,
+                          "donation_count": rollup.c.donation_count + stmt.excluded.donation_count}
+                )
+                conn.execute(stmt)
+        else:
+            for row in adds:
+                changes.append({"cid": row["cause_id"], "g": row["granularity"], "b": row["bucket"],
+                                "amount": row["amount_total"], "n": row["donation_count"], "insert": row})
+
+    for change in changes:
+        updated = conn.execute(
+            rollup.update()
+            .where(rollup.c.cause_id == change["cid"], rollup.c.granularity == change["g"],
+                   rollup.c.bucket == change["b"])
+            .values(amount_total=rollup.c.amount_total + change["amount"],
+                    donation_count=rollup.c.donation_count + change["n"])
+        ).rowcount
+        if not updated and "insert" in change:
+            conn.execute(rollup.insert().values(**change["insert"]))
+
+
+def remove(conn, rows):
+    """Subtract deleted (cause_id, created_at, amount) donation rows."""
+    apply(conn, _deltas(rows, -1))
+
+
+def backfill(session, batch_size=5000, progress=None):
+    """Rebuild donation_rollup from the donation table, batch by batch.
+
+    Donations are streamed in primary-key order up to the highest id seen
+    at the start; later ones are added by the session hook as they are
+    written. The table is emptied first, so run it when the dashboards can
+    show partial numbers for a while. Returns (donations, skipped), the
+    latter having no created_at.
+    """
+    conn = session.connection()
+    conn.execute(delete(rollup))
+    high = conn.execute(select(func.max(Donation.donation_id))).scalar() or 0
+    session.commit()
+
+    last_id, seen, skipped = 0, 0, 0
+    while last_id < high:
+        conn = session.connection()
+        rows = conn.execute(
+            select(Donation.donation_id, Donation.cause_id, Donation.created_at, Donation.amount)
+            .where(Donation.donation_id > last_id, Donation.donation_id <= high)
+            .order_by(Donation.donation_id).limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+        seen += len(rows)
+        skipped += sum(1 for r in rows if r[2] is None)
+        apply(conn, _deltas([r[1:] for r in rows], +1))
+        session.commit()
+        if progress:
+            progress(seen)
+    return seen, skipped
+
+
+# ------------------------------------------------------------
+# READING
+# ------------------------------------------------------------
+def parse_query(args):
+    """granularity/from/to/cause_id from request args; raises ValueError."""
+    granularity = args.get("granularity", "day")
+    if granularity not in GRANULARITIES:
+        raise ValueError("granularity must be day, week or month")
+    try:
+        end = date.fromisoformat(args["to"]) if args.get("to") else datetime.utcnow().date()
+        if args.get("from"):
+            start = date.fromisoformat(args["from"])
+        else:
+            start = bucket_start(end, granularity)
+            for _ in range(DEFAULT_BUCKETS[granularity] - 1):
+                start = bucket_start(start - timedelta(days=1), granularity)
+    except ValueError:
+        raise ValueError("from and to must be YYYY-MM-DD dates")
+    if start > end:
+        raise ValueError("from must not be after to")
+
+    cause_id = args.get("cause_id")
+    if cause_id is not None:
+        if not cause_id.isdigit():
+            raise ValueError("cause_id must be an integer")
+        cause_id = int(cause_id)
+
+    buckets = 0
+    bucket = bucket_start(start, granularity)
+    while bucket <= end:
+        buckets += 1
+        if buckets > MAX_BUCKETS:
+            raise ValueError(f"At most {MAX_BUCKETS} buckets per request")
+        bucket = next_bucket(bucket, granularity)
+    return {"granularity": granularity, "start": start, "end": end, "cause_id": cause_id}
+
+
+def series(session, granularity, start, end, cause_id=None):
+    """[{bucket, amount, count}] for every bucket overlapping [start, end], zeros included."""
+    first = bucket_start(start, granularity)
+    query = (
+        select(rollup.c.bucket, func.sum(rollup.c.amount_total), func.sum(rollup.c.donation_count))
+        .where(rollup.c.granularity == granularity, rollup.c.bucket.between(first, end))
+        .group_by(rollup.c.bucket)
+    )
+    if cause_id is not None:
+        query = query.where(rollup.c.cause_id == cause_id)
+    found = {bucket: (amount, count) for bucket, amount, count in session.execute(query)}
+
+    result = []
+    bucket = first
+    while bucket <= end:
+        amount, count = found.get(bucket, (0, 0))
+        result.append({"bucket": bucket.isoformat(), "amount": round(float(amount or 0), 2),
+                       "count": int(count or 0)})
+        bucket = next_bucket(bucket, granularity)
+    return result
+
+
+# ------------------------------------------------------------
+# SESSION HOOKS
+# ------------------------------------------------------------
+def _pending(session):
+    return session.info.setdefault("donation_rollup_pending", defaultdict(lambda: [0.0, 0]))
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_changes(session, flush_context, instances):
+    # Old values of updated/deleted rows, read while the database still
+    # has them (see the same hook in summary.py).
+    changed = [o for o in session.dirty if isinstance(o, Donation)
+               and session.is_modified(o, include_collections=False)]
+    gone = [o for o in session.deleted if isinstance(o, Donation)]
+    user_ids = [o.user_id for o in session.deleted if isinstance(o, User)]
+    if not (changed or gone or user_ids):
+        return
+
+    pending = _pending(session)
+    conn = session.connection()
+    ids = [inspect(o).identity[0] for o in changed + gone]
+    criteria = []
+    if ids:
+        criteria.append(Donation.donation_id.in_(ids) & Donation.user_id.notin_(user_ids))
+    if user_ids:
+        # Donations cascading away with their user.
+        criteria.append(Donation.user_id.in_(user_ids))
+    for criterion in criteria:
+        _deltas(conn.execute(
+            select(Donation.cause_id, Donation.created_at, Donation.amount).where(criterion)
+        ), -1, pending)
+    _deltas([(o.cause_id, o.created_at, o.amount) for o in changed], +1, pending)
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_rollups(session, flush_context):
+    new = [(o.cause_id, o.created_at, o.amount) for o in session.new if isinstance(o, Donation)]
+    pending = session.info.pop("donation_rollup_pending", None)
+    if new:
+        pending = _deltas(new, +1, pending)
+    if pending:
+        apply(session.connection(), pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session):
+    session.info.pop("donation_rollup_pending", None)
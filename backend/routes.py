@@ -1,19 +1,40 @@
 # backend/routes.py
-from flask import Blueprint, request, jsonify, session
-from backend import db
+from flask import Blueprint, current_app, request, jsonify, session
+from backend import db, cache, metrics, hasher, ingest
 from werkzeug.security import check_password_hash
 from datetime import datetime
 from functools import wraps
-
+from sqlalchemy import case, exists, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload, selectinload
+
+from backend.hashing import HashingBusy
+from backend.idempotency import idempotent
+from backend.ingest import IngestBusy
+from backend.inputs import InputError, parse_amount, parse_rating
+from backend.pagination import PaginationError, parse_limit, keyset_page, keyset_stream
+from backend import bulk, clusters, geo, jobs, lookups, rollups, search, streaming, summary, versions
 from backend.models import (
     AuthData, User, Cause, NGO, Event,
     AccountDetails, Donation, Feedback, Volunteer,
     UserContact, UserSocials, CauseContact, CauseSocials,
-    Location
+    Location, CauseSummary, UserSummary, DeleteJob
 )
 
 main = Blueprint("main", __name__)
 
+
+@main.errorhandler(HashingBusy)
+def hashing_busy(e):
+    # Login/register spike: fail fast instead of queueing behind the pool.
+    return jsonify({"error": "Server busy, please retry"}), 503, {"Retry-After": "1"}
+
+
+@main.errorhandler(IngestBusy)
+def ingest_busy(e):
+    # Write-behind queue is full: shed load until the flusher catches up.
+    return jsonify({"error": "Server busy, please retry"}), 503, {"Retry-After": "1"}
+
 # ------------------------------------------------------------
 # HELPER: CREATE DEFAULT ADMIN (ID=0)
 # ------------------------------------------------------------
@@ -32,52 +53,62 @@ def create_admin_if_missing():
         db.session.commit()
 
 # -------------------- REGISTER --------------------
-@main.route("/api/auth/register", methods=["POST"])
-def register():
-    data = request.get_json()
+class RegistrationError(ValueError):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def register_account(data):
+    """Add one user or cause to the session (flushes for ids, no commit).
+
+    Returns the response body; raises RegistrationError for bad input.
+    """
     name = data.get("name")
     password = data.get("password")
     email = data.get("email")
     role = data.get("role")
 
     if not name or not role or not email or (role == "user" and not password):
-        return jsonify({"error": "Missing required fields"}), 400
+        raise RegistrationError("Missing required fields")
 
     if role not in ["user", "ngo", "event"]:
-        return jsonify({"error": "Invalid role"}), 400
+        raise RegistrationError("Invalid role")
 
     # Check duplicates for users only
     if role == "user" and (AuthData.query.filter_by(name=name).first() or User.query.filter_by(email=email).first()):
-        return jsonify({"error": "User/email already exists"}), 400
+        raise RegistrationError("User/email already exists")
 
     if role == "user":
         auth = AuthData(name=name, role=role, verified=False)
-        auth.set_password(password)
-        db.session.add(auth)
-        db.session.commit()
-
+        auth.password_hash = hasher.hash(password)
         user = User(
             name=name,
             email=email,
             verified=False,
-            auth_id=auth.id,
+            auth=auth,
             age=data.get("age")
         )
         db.session.add(user)
-        db.session.commit()
+        db.session.flush()
         auth.fk_id = user.user_id
-        db.session.commit()
 
-        return jsonify({"message": "User created, awaiting admin verification.", "auth_id": auth.id, "user_id": user.user_id}), 201
+        return {"message": "User created, awaiting admin verification.", "auth_id": auth.id, "user_id": user.user_id}
 
     # NGO/Event registration
     owner_user_id = data.get("owner_user_id")
     if not owner_user_id:
-        return jsonify({"error": "NGO/Event requires owner_user_id"}), 400
+        raise RegistrationError("NGO/Event requires owner_user_id")
 
     owner = User.query.get(owner_user_id)
     if not owner or not owner.verified:
-        return jsonify({"error": "Owner must be admin-verified"}), 403
+        raise RegistrationError("Owner must be admin-verified", 403)
+
+    try:
+        event_date = datetime.strptime(data["date"], "%Y-%m-%d").date() if data.get("date") else None
+        event_time = datetime.strptime(data["time"], "%H:%M").time() if data.get("time") else None
+    except (TypeError, ValueError):
+        raise RegistrationError("date must be YYYY-MM-DD and time HH:MM")
 
     cause = Cause(
         name=name,
@@ -89,26 +120,33 @@ def register():
         verified=True
     )
     db.session.add(cause)
-    db.session.commit()
+    db.session.flush()
 
     if role == "ngo":
-        ngo = NGO(cause_id=cause.cause_id, year_est=data.get("year_est"))
-        db.session.add(ngo)
-        db.session.commit()
+        db.session.add(NGO(cause_id=cause.cause_id, year_est=data.get("year_est")))
     elif role == "event":
-        event_date = datetime.strptime(data["date"], "%Y-%m-%d").date() if data.get("date") else None
-        event_time = datetime.strptime(data["time"], "%H:%M").time() if data.get("time") else None
-        event = Event(
+        db.session.add(Event(
             cause_id=cause.cause_id,
             capacity=data.get("capacity"),
             date=event_date,
             time=event_time,
             ngo_id=data.get("ngo_id")
-        )
-        db.session.add(event)
-        db.session.commit()
+        ))
+    mark_causes_changed(cause.cause_id)
+
+    return {"message": f"{role.capitalize()} created", "cause_id": cause.cause_id}
+
+
+@main.route("/api/auth/register", methods=["POST"])
+def register():
+    try:
+        body = register_account(request.get_json())
+    except RegistrationError as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), e.status
+    db.session.commit()
+    return jsonify(body), 201
 
-    return jsonify({"message": f"{role.capitalize()} created", "cause_id": cause.cause_id}), 201
 
 # -------------------- LOGIN --------------------
 @main.route("/api/auth/login", methods=["POST"])
@@ -121,9 +159,18 @@ def login():
         return jsonify({"error": "Name and password required"}), 400
 
     auth = AuthData.query.filter_by(name=name).first()
-    if not auth or not auth.check_password(password):
+    if not auth or not hasher.verify(auth.password_hash, password):
         return jsonify({"error": "Invalid credentials"}), 401
 
+    # Hash parameters changed since this hash was stored: upgrade it now
+    # that we know the password. Skipped (not failed) if the pool is busy.
+    try:
+        if hasher.needs_rehash(auth.password_hash):
+            auth.password_hash = hasher.hash(password)
+            db.session.commit()
+    except HashingBusy:
+        pass
+
     # Set session
     session["user"] = {"id": auth.id, "role": auth.role, "name": auth.name}
     return jsonify({"auth_id": auth.id, "role": auth.role, "name": auth.name}), 200
@@ -155,34 +202,126 @@ def require_admin(f):
         return f(*args, **kwargs)
     return wrapper
 
+# ------------------------------------------------------------
+# CHANGE TRACKING (ETag versions + response cache)
+# ------------------------------------------------------------
+# Call before commit: versions are bumped in the same transaction and the
+# matching cache entries are dropped once it commits.
+def mark_causes_changed(*cause_ids):
+    """The listing plus the detail pages of the given causes changed."""
+    versions.bump("causes", *[f"cause:{cid}" for cid in cause_ids])
+
+def mark_cause_detail_changed(cause_id):
+    versions.bump(f"cause:{cause_id}")
+
+@main.route("/api/admin/cache/stats", methods=["GET"])
+@require_admin
+def admin_cache_stats():
+    return jsonify(cache.stats())
+
+@main.route("/api/admin/metrics", methods=["GET", "DELETE"])
+@require_admin
+def admin_metrics():
+    if request.method == "DELETE":
+        metrics.reset()
+        return jsonify({"message": "Metrics reset"})
+    return jsonify(metrics.snapshot())
+
 # ------------------------------------------------------------
 # ADMIN ROUTES
 # ------------------------------------------------------------
+MAX_BULK_REGISTRATIONS = 1000
+
+@main.route("/api/admin/register/bulk", methods=["POST"])
+@require_admin
+def register_bulk():
+    """Onboard many users/causes in one transaction (partner imports).
+
+    Each item runs in a savepoint: a bad item is rolled back and reported,
+    the rest are committed together.
+    """
+    items = (request.get_json() or {}).get("items")
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "items must be a non-empty list"}), 400
+    if len(items) > MAX_BULK_REGISTRATIONS:
+        return jsonify({"error": f"At most {MAX_BULK_REGISTRATIONS} items per request"}), 400
+
+    results, created = [], 0
+    for index, item in enumerate(items):
+        savepoint = db.session.begin_nested()
+        try:
+            if not isinstance(item, dict):
+                raise RegistrationError("Item must be an object")
+            body = register_account(item)
+            savepoint.commit()
+            results.append({"index": index, "status": 201, **body})
+            created += 1
+        except RegistrationError as e:
+            savepoint.rollback()
+            results.append({"index": index, "status": e.status, "error": str(e)})
+        except IntegrityError:
+            savepoint.rollback()
+            results.append({"index": index, "status": 409, "error": "Conflicts with an existing record"})
+
+    db.session.commit()
+    return jsonify({"created": created, "failed": len(items) - created, "results": results}), 200
+
+# The two admin tables list every row, so they are streamed (see
+# backend/streaming.py): plain column rows from a yield_per cursor, never
+# the whole table as ORM objects and dicts at once.
+STATS_COLUMNS = (
+    "donation_total", "donation_count", "rating_sum", "rating_count", "volunteer_count"
+)
+
+
+def _stats_columns(model):
+    return [getattr(model, name) for name in STATS_COLUMNS]
+
+
 @main.route("/api/admin/users", methods=["GET"])
 @require_admin
 def admin_get_users():
-    users = User.query.all()
-    return jsonify([{
-        "user_id": u.user_id,
-        "auth_id": u.auth_id,
-        "name": u.name,
-        "verified": u.verified
-    } for u in users])
+    stmt = (
+        select(User.user_id, User.auth_id, User.name, User.verified,
+               UserSummary.user_id.label("summary_id"), *_stats_columns(UserSummary))
+        .outerjoin(UserSummary, UserSummary.user_id == User.user_id)
+        .order_by(User.user_id)
+        .execution_options(yield_per=streaming.YIELD_PER)
+    )
+    rows = db.session.execute(stmt)
+    return streaming.response(streaming.json_array({
+        "user_id": r.user_id,
+        "auth_id": r.auth_id,
+        "name": r.name,
+        "verified": r.verified,
+        "stats": summary.stats(r if r.summary_id is not None else None)
+    } for r in rows))
 
 @main.route("/api/admin/causes", methods=["GET"])
 @require_admin
 def admin_get_causes():
-    causes = Cause.query.all()
-    result = []
-    for c in causes:
-        subtype = "NGO" if c.ngo else "Event" if c.event else "Unknown"
-        result.append({
-            "cause_id": c.cause_id,
-            "name": c.name,
-            "verified": c.verified,
-            "type": subtype
-        })
-    return jsonify(result)
+    # Subtype from EXISTS probes on the cause_id indexes rather than
+    # loading the ngo/event relationships row by row.
+    subtype = case(
+        (exists().where(NGO.cause_id == Cause.cause_id), "NGO"),
+        (exists().where(Event.cause_id == Cause.cause_id), "Event"),
+        else_="Unknown"
+    )
+    stmt = (
+        select(Cause.cause_id, Cause.name, Cause.verified, subtype.label("type"),
+               CauseSummary.cause_id.label("summary_id"), *_stats_columns(CauseSummary))
+        .outerjoin(CauseSummary, CauseSummary.cause_id == Cause.cause_id)
+        .order_by(Cause.cause_id)
+        .execution_options(yield_per=streaming.YIELD_PER)
+    )
+    rows = db.session.execute(stmt)
+    return streaming.response(streaming.json_array({
+        "cause_id": r.cause_id,
+        "name": r.name,
+        "verified": r.verified,
+        "type": r.type,
+        "stats": summary.stats(r if r.summary_id is not None else None)
+    } for r in rows))
 
 # -------------------- VERIFY / UNVERIFY --------------------
 @main.route("/api/admin/verify/<int:auth_id>", methods=["PATCH"])
@@ -191,6 +330,7 @@ def admin_verify(auth_id):
     if not auth:
         return jsonify({"error": "Not found"}), 404
 
+    changed_causes = []
     auth.verified = True
     if auth.role == "user":
         user = User.query.get(auth.fk_id)
@@ -200,11 +340,16 @@ def admin_verify(auth_id):
             causes = Cause.query.filter_by(user_id=user.user_id).all()
             for c in causes:
                 c.verified = True
+                changed_causes.append(c.cause_id)
     else:
         cause = Cause.query.get(auth.fk_id)
         if cause:
             cause.verified = True
+            changed_causes.append(cause.cause_id)
 
+    if changed_causes:
+        mark_causes_changed(*changed_causes)
+    lookups.invalidate(auth_ids=[auth_id], cause_ids=changed_causes)
     db.session.commit()
     return jsonify({"message": "Verified"})
 
@@ -215,6 +360,7 @@ def admin_unverify(auth_id):
     if not auth:
         return jsonify({"error": "Not found"}), 404
 
+    changed_causes = []
     auth.verified = False
     if auth.role == "user":
         user = User.query.get(auth.fk_id)
@@ -224,120 +370,443 @@ def admin_unverify(auth_id):
             causes = Cause.query.filter_by(user_id=user.user_id).all()
             for c in causes:
                 c.verified = False
+                changed_causes.append(c.cause_id)
     else:
         cause = Cause.query.get(auth.fk_id)
         if cause:
             cause.verified = False
+            changed_causes.append(cause.cause_id)
 
+    if changed_causes:
+        mark_causes_changed(*changed_causes)
+    lookups.invalidate(auth_ids=[auth_id], cause_ids=changed_causes)
     db.session.commit()
     return jsonify({"message": "Unverified"})
 
+# -------------------- BULK MODERATION --------------------
+MAX_BULK_IDS = 10000
+
+def _bulk_ids(data, key):
+    ids = data.get(key) or []
+    if not isinstance(ids, list) or not all(isinstance(i, int) and not isinstance(i, bool) for i in ids):
+        raise ValueError(f"{key} must be a list of integer ids")
+    if len(ids) > MAX_BULK_IDS:
+        raise ValueError(f"At most {MAX_BULK_IDS} ids per request")
+    return set(ids)
+
+def _bulk_set_verified(verified):
+    """Body: {"auth_ids": [...]} and/or {"filter": {"role": ..., "verified": ...}}."""
+    data = request.get_json() or {}
+    try:
+        auth_ids = _bulk_ids(data, "auth_ids")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    account_filter = data.get("filter")
+    if account_filter is not None:
+        if not isinstance(account_filter, dict) or set(account_filter) - {"role", "verified"}:
+            return jsonify({"error": "filter accepts role and verified"}), 400
+        try:
+            auth_ids |= bulk.resolve_filter(**account_filter)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+    elif not auth_ids:
+        return jsonify({"error": "auth_ids or filter required"}), 400
+
+    counts, cause_ids = bulk.set_verified(auth_ids, verified)
+    if cause_ids:
+        mark_causes_changed(*cause_ids)
+    lookups.invalidate(auth_ids=auth_ids, cause_ids=cause_ids)
+    db.session.commit()
+    if cause_ids:
+        clusters.invalidate()
+    return jsonify(counts)
+
+@main.route("/api/admin/bulk/verify", methods=["POST"])
+@require_admin
+def admin_bulk_verify():
+    return _bulk_set_verified(True)
+
+@main.route("/api/admin/bulk/unverify", methods=["POST"])
+@require_admin
+def admin_bulk_unverify():
+    return _bulk_set_verified(False)
+
+@main.route("/api/admin/bulk/delete", methods=["POST"])
+@require_admin
+def admin_bulk_delete():
+    """Body: {"user_ids": [...], "cause_ids": [...]}; a user's causes go too."""
+    data = request.get_json() or {}
+    try:
+        user_ids = _bulk_ids(data, "user_ids")
+        cause_ids = _bulk_ids(data, "cause_ids")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if not (user_ids or cause_ids):
+        return jsonify({"error": "user_ids or cause_ids required"}), 400
+
+    counts, deleted, recounted = bulk.delete_accounts(user_ids, cause_ids)
+    if deleted or recounted:
+        mark_causes_changed(*(deleted | recounted))
+    lookups.invalidate_all()
+    db.session.commit()
+    if deleted:
+        clusters.invalidate()
+    return jsonify(counts)
+
 # -------------------- CASCADE DELETE --------------------
-def delete_cause_cascade(cause_id):
-    cause = Cause.query.get(cause_id)
-    if not cause:
-        return False
-    db.session.delete(cause)
+# Set-based: the user/cause rows are deleted and the database cascades to
+# everything that references them; nothing is loaded into the session.
+def _delete_now(user_ids=(), cause_ids=()):
+    counts, deleted, recounted = bulk.delete_accounts(user_ids, cause_ids)
+    if deleted or recounted:
+        mark_causes_changed(*(deleted | recounted))
+    lookups.invalidate_all()
     db.session.commit()
-    return True
+    if deleted:
+        clusters.invalidate()
+    return counts
+
+def delete_cause_cascade(cause_id):
+    return _delete_now(cause_ids=[cause_id])["causes"] > 0
 
 def delete_user_cascade(user_id):
-    user = User.query.get(user_id)
-    if not user:
-        return False
-    db.session.delete(user)
-    db.session.commit()
-    return True
+    return _delete_now(user_ids=[user_id])["users"] > 0
+
+def _delete_or_start_job(kind, target_id):
+    """Delete inline, or hand very large deletes to a background job."""
+    threshold = current_app.config.get("DELETE_JOB_THRESHOLD", 10000)
+    if jobs.estimate_rows(kind, target_id) > threshold:
+        job = jobs.start(kind, target_id)
+        return jsonify({"message": "Deletion started", "job_id": job.job_id}), 202
+    if kind == "user":
+        delete_user_cascade(target_id)
+        return jsonify({"message": "User deleted"})
+    delete_cause_cascade(target_id)
+    return jsonify({"message": "Cause deleted"})
 
 @main.route("/api/admin/delete/user/<int:user_id>", methods=["DELETE"])
 @require_admin
 def admin_delete_user(user_id):
-    user = User.query.get(user_id)
-    if not user:
+    if not db.session.get(User, user_id):
         return jsonify({"error": "Not found"}), 404
-
-    auth = AuthData.query.get(user.auth_id)
-    delete_user_cascade(user_id)
-
-    if auth:
-        db.session.delete(auth)
-        db.session.commit()
-
-    return jsonify({"message": "User deleted"})
+    return _delete_or_start_job("user", user_id)
 
 @main.route("/api/admin/delete/cause/<int:cause_id>", methods=["DELETE"])
 @require_admin
 def admin_delete_cause(cause_id):
-    cause = Cause.query.get(cause_id)
-    if not cause:
+    if not db.session.get(Cause, cause_id):
         return jsonify({"error": "Not found"}), 404
+    return _delete_or_start_job("cause", cause_id)
 
-    auth = AuthData.query.filter_by(fk_id=cause_id).first()
-    delete_cause_cascade(cause_id)
+@main.route("/api/admin/jobs/<int:job_id>", methods=["GET"])
+@require_admin
+def admin_get_job(job_id):
+    job = db.session.get(DeleteJob, job_id)
+    if not job:
+        return jsonify({"error": "Not found"}), 404
+    return jsonify(job.to_dict())
 
-    if auth:
-        db.session.delete(auth)
-        db.session.commit()
+# -------------------- ANALYTICS --------------------
+@main.route("/api/admin/analytics/donations", methods=["GET"])
+@require_admin
+def admin_donation_analytics():
+    """Donation totals per bucket, from the rollups (never raw donations).
 
-    return jsonify({"message": "Cause deleted"})
+    Query: granularity=day|week|month (default day), from/to=YYYY-MM-DD
+    (default: the last 30 days / 12 weeks / 12 months), cause_id (default:
+    all causes).
+    """
+    try:
+        query = rollups.parse_query(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    buckets = rollups.series(db.session, query["granularity"], query["start"], query["end"],
+                             cause_id=query["cause_id"])
+    return jsonify({
+        "granularity": query["granularity"],
+        "from": query["start"].isoformat(),
+        "to": query["end"].isoformat(),
+        "cause_id": query["cause_id"],
+        "total": {
+            "amount": round(sum(b["amount"] for b in buckets), 2),
+            "count": sum(b["count"] for b in buckets)
+        },
+        "buckets": buckets
+    })
 
 # ------------------------------------------------------------
 # GET ALL CAUSES (for homepage)
 # ------------------------------------------------------------
+# Cards carry the cause's running totals ("stats"). Donations, feedback
+# and volunteers don't bump the "causes" scope, so the card listings are
+# cached and revalidated on a short TTL, like the leaderboards below.
+CARD_STATS_TTL = 15
+
+def stats_card(row):
+    """summary.card() plus the running totals of the same summary row."""
+    return {**summary.card(row), "stats": summary.stats(row)}
+
 @main.route("/api/causes", methods=["GET"])
+@versions.conditional("causes", ttl=CARD_STATS_TTL)
+@cache.cached("causes", ttl=CARD_STATS_TTL)
 def get_all_causes():
-    causes = Cause.query.filter_by(verified=True).all()
+    cause_type = request.args.get("type")
+    q = (request.args.get("q") or "").strip()
+
+    try:
+        limit = parse_limit(request.args.get("limit"))
+    except PaginationError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if cause_type and cause_type not in ("ngo", "event"):
+        return jsonify({"error": "type must be 'ngo' or 'event'"}), 400
+
+    # Served entirely from the cause_summary read model: one table, one query.
+    query = CauseSummary.query.filter_by(verified=True)
+    if cause_type == "ngo":
+        query = query.filter(CauseSummary.type == "NGO")
+    elif cause_type == "event":
+        query = query.filter(CauseSummary.type == "Event")
+    if q:
+        match = search.match_clause(q, CauseSummary.cause_id)
+        if match is None:
+            return jsonify({"causes": [], "next_cursor": None})
+        query = query.filter(match)
+
+    try:
+        rows, next_cursor = keyset_stream(query, CauseSummary.cause_id, request.args.get("cursor"), limit)
+    except PaginationError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # Streamed; @cache.cached stores the body once it has been sent in full.
+    return streaming.response(streaming.json_array(
+        (stats_card(r) for r in rows),
+        head='{"causes":[',
+        tail=lambda: '],"next_cursor":' + current_app.json.dumps(next_cursor()) + "}"
+    ))
+
+
+# ------------------------------------------------------------
+# LEADERBOARDS (most supported / highest rated)
+# ------------------------------------------------------------
+# Each ordering matches an index on cause_summary (see models.py), so a
+# page is one index range scan of `limit` rows, however many donations
+# exist. Ties go to the older cause; causes without any activity of the
+# kind are left out. Donations don't bump the "causes" scope, hence the
+# short TTL instead of ETags.
+LEADERBOARDS = {
+    "donations": ((CauseSummary.donation_total.desc(), CauseSummary.cause_id),
+                  CauseSummary.donation_count > 0),
+    "rating": ((CauseSummary.rating_avg.desc(), CauseSummary.rating_count.desc(), CauseSummary.cause_id),
+               CauseSummary.rating_count > 0),
+    "volunteers": ((CauseSummary.volunteer_count.desc(), CauseSummary.cause_id),
+                   CauseSummary.volunteer_count > 0),
+}
+LEADERBOARD_TTL = 15
+
+@main.route("/api/causes/top", methods=["GET"])
+@cache.cached("causes", ttl=LEADERBOARD_TTL)
+def get_top_causes():
+    by = request.args.get("by", "donations")
+    if by not in LEADERBOARDS:
+        return jsonify({"error": "by must be donations, rating or volunteers"}), 400
+    try:
+        limit = parse_limit(request.args.get("limit"), default=10, maximum=100)
+        min_ratings = int(request.args.get("min_ratings", 1))
+    except PaginationError as e:
+        return jsonify({"error": str(e)}), 400
+    except ValueError:
+        return jsonify({"error": "min_ratings must be an integer"}), 400
+
+    order, has_activity = LEADERBOARDS[by]
+    query = CauseSummary.query.filter_by(verified=True).filter(has_activity)
+    if by == "rating" and min_ratings > 1:
+        query = query.filter(CauseSummary.rating_count >= min_ratings)
+    rows = query.order_by(*order).limit(limit).all()
+
+    return jsonify({"by": by, "causes": [
+        {**stats_card(r), "rank": rank}
+        for rank, r in enumerate(rows, start=1)
+    ]})
+
+
+# ------------------------------------------------------------
+# FULL-TEXT SEARCH (ranked, prefix matching)
+# ------------------------------------------------------------
+@main.route("/api/causes/search", methods=["GET"])
+@versions.conditional("causes", ttl=CARD_STATS_TTL)
+@cache.cached("causes", ttl=CARD_STATS_TTL)
+def search_causes():
+    q = (request.args.get("q") or "").strip()
+    if not q:
+        return jsonify({"error": "q is required"}), 400
+
+    try:
+        limit = parse_limit(request.args.get("limit"), default=20)
+    except PaginationError as e:
+        return jsonify({"error": str(e)}), 400
+
+    ids = search.search_cause_ids(q, limit)
+    by_id = load_cause_cards(ids)
+
+    return jsonify({"causes": [by_id[i] for i in ids if i in by_id]})
+
+
+# ------------------------------------------------------------
+# GEO QUERIES (for the map)
+# ------------------------------------------------------------
+@main.route("/api/causes/within", methods=["GET"])
+@versions.conditional("causes", ttl=CARD_STATS_TTL)
+@cache.cached("causes", ttl=CARD_STATS_TTL)
+def get_causes_within():
+    try:
+        west, south, east, north = geo.parse_bbox(request.args.get("bbox"))
+        limit = parse_limit(request.args.get("limit"), default=200, maximum=1000)
+    except (geo.BBoxError, PaginationError) as e:
+        return jsonify({"error": str(e)}), 400
+
+    points = geo.locations_within(west, south, east, north, limit)
+    by_id = load_cause_cards([p.cause_id for p in points])
+
     result = []
+    for cause_id, lat, lng in points:
+        if cause_id in by_id:
+            card = dict(by_id[cause_id])
+            card.update({"latitude": lat, "longitude": lng})
+            result.append(card)
+    return jsonify({"causes": result})
 
-    for c in causes:
-        subtype = "NGO" if c.ngo else "Event" if c.event else "Unknown"
-        cause_data = {
-            "cause_id": c.cause_id,
-            "name": c.name,
-            "description": c.description,
-            "logo": c.logo,
-            "type": subtype,
-            "contacts": [con.contact for con in c.contacts],
-            "socials": [soc.social for soc in c.socials],
-            "latitude": c.locations[0].latitude if c.locations else None,
-            "longitude": c.locations[0].longitude if c.locations else None
-        }
-        if subtype == "NGO" and c.ngo:
-            cause_data.update({"year_est": c.ngo.year_est, "age": c.ngo.age})
-        elif subtype == "Event" and c.event:
-            cause_data.update({
-                "date": c.event.date.strftime("%Y-%m-%d") if c.event.date else None,
-                "time": c.event.time.strftime("%H:%M") if c.event.time else None,
-                "capacity": c.event.capacity
-            })
-
-        result.append(cause_data)
 
+@main.route("/api/causes/nearest", methods=["GET"])
+@versions.conditional("causes", ttl=CARD_STATS_TTL)
+@cache.cached("causes", ttl=CARD_STATS_TTL)
+def get_nearest_causes():
+    try:
+        lat = float(request.args["lat"])
+        lng = float(request.args["lng"])
+    except (KeyError, ValueError):
+        return jsonify({"error": "lat and lng are required numbers"}), 400
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        return jsonify({"error": "lat/lng out of range"}), 400
+
+    try:
+        k = parse_limit(request.args.get("k"), default=10, maximum=100)
+    except PaginationError as e:
+        return jsonify({"error": str(e)}), 400
+
+    nearest = geo.nearest_locations(lat, lng, k)
+    by_id = load_cause_cards([n[0] for n in nearest])
+
+    result = []
+    for cause_id, c_lat, c_lng, dist in nearest:
+        if cause_id in by_id:
+            card = dict(by_id[cause_id])
+            card.update({"latitude": c_lat, "longitude": c_lng, "distance_km": round(dist, 3)})
+            result.append(card)
     return jsonify({"causes": result})
 
+
+@main.route("/api/causes/clusters", methods=["GET"])
+def get_cause_clusters():
+    try:
+        zoom = int(request.args["zoom"])
+    except (KeyError, ValueError):
+        return jsonify({"error": "zoom is required"}), 400
+    if not clusters.MIN_ZOOM <= zoom <= clusters.MAX_ZOOM:
+        return jsonify({"error": "zoom out of range"}), 400
+
+    bbox = None
+    if request.args.get("bbox"):
+        try:
+            bbox = geo.parse_bbox(request.args["bbox"])
+        except geo.BBoxError as e:
+            return jsonify({"error": str(e)}), 400
+    elif zoom > clusters.MAX_CACHED_ZOOM:
+        return jsonify({"error": "bbox is required at this zoom"}), 400
+
+    return jsonify({
+        "zoom": zoom,
+        "cell_size": clusters.cell_size(zoom),
+        "clusters": clusters.clusters_for(zoom, bbox)
+    })
+
+
+def cause_card_query():
+    # Load every relationship the card needs up front so the query count
+    # stays fixed (1 joined query + 3 selectin batches) however many rows.
+    return Cause.query.options(
+        joinedload(Cause.ngo),
+        joinedload(Cause.event),
+        selectinload(Cause.contacts),
+        selectinload(Cause.socials),
+        selectinload(Cause.locations),
+    )
+
+
+def load_cause_cards(cause_ids):
+    """{cause_id: card with stats} for the given causes, from the summary table."""
+    if not cause_ids:
+        return {}
+    rows = CauseSummary.query.filter(CauseSummary.cause_id.in_(cause_ids)).all()
+    return {r.cause_id: stats_card(r) for r in rows}
+
+
 # ------------------------------------------------------------
 # GET SINGLE CAUSE (for CausePage)
 # ------------------------------------------------------------
 @main.route("/api/causes/<int:cause_id>", methods=["GET"])
+@versions.conditional("cause:{cause_id}")
+@cache.cached("cause:{cause_id}")
 def get_cause(cause_id):
-    cause = Cause.query.get(cause_id)
+    try:
+        feedback_limit = parse_limit(request.args.get("feedback_limit"), default=20, maximum=100)
+    except PaginationError as e:
+        return jsonify({"error": str(e)}), 400
+
+    cause = cause_card_query().filter(Cause.cause_id == cause_id).first()
     if not cause or not cause.verified:
         return jsonify({"error": "Cause not found"}), 404
 
     subtype = "NGO" if cause.ngo else "Event" if cause.event else "Unknown"
 
-    # ---------- FEEDBACK WITH USERNAME ----------
-    feedback_list = Feedback.query.filter_by(cause_id=cause_id).all()
-
-    feedback_json = []
-    for fb in feedback_list:
-        user = User.query.get(fb.user_id)  # get the user
-        feedback_json.append({
-            "feedback_id": fb.feedback_id,
-            "rating": fb.rating,
-            "comment": fb.comment,
-            "username": user.username if user else "Unknown"
-        })
+    # ---------- FEEDBACK WITH USERNAME (one joined query, newest first) ----------
+    feedback_query = (
+        db.session.query(
+            Feedback.feedback_id,
+            Feedback.rating,
+            Feedback.comment,
+            User.name.label("username")
+        )
+        .join(User, User.user_id == Feedback.user_id)
+        .filter(Feedback.cause_id == cause_id)
+    )
+    try:
+        feedback_rows, feedback_next_cursor = keyset_page(
+            feedback_query, Feedback.feedback_id, request.args.get("feedback_cursor"),
+            feedback_limit, descending=True
+        )
+    except PaginationError as e:
+        return jsonify({"error": str(e)}), 400
+
+    feedback_json = [{
+        "feedback_id": fb.feedback_id,
+        "rating": fb.rating,
+        "comment": fb.comment,
+        "username": fb.username
+    } for fb in feedback_rows]
+
+    # ---------- RATING SUMMARY ----------
+    histogram = {str(r): 0 for r in range(1, 6)}
+    rating_count = rating_sum = 0
+    for rating, count in (
+        db.session.query(Feedback.rating, func.count())
+        .filter(Feedback.cause_id == cause_id, Feedback.rating.isnot(None))
+        .group_by(Feedback.rating)
+    ):
+        histogram[str(rating)] = count
+        rating_count += count
+        rating_sum += rating * count
 
     # ---------- BASE CAUSE DATA ----------
     cause_data = {
@@ -366,7 +835,14 @@ def get_cause(cause_id):
         "socials": [s.social for s in cause.socials],
 
         # ADD FEEDBACK HERE
-        "feedback": feedback_json
+        "feedback": feedback_json,
+        "feedback_next_cursor": feedback_next_cursor,
+        "rating_histogram": histogram,
+        "rating_count": rating_count,
+        "rating_average": round(rating_sum / rating_count, 2) if rating_count else None,
+
+        # Running totals (one primary-key read, see backend/summary.py)
+        "stats": summary.stats(db.session.get(CauseSummary, cause_id))
     }
 
     # ---------- NGO DETAILS ----------
@@ -380,7 +856,7 @@ def get_cause(cause_id):
     elif subtype == "Event" and cause.event:
         cause_data.update({
             "capacity": cause.event.capacity,
-            "date": cause.event.date.strftime("%Y-%m-%d") if cause.event.date else None,
+            "date": cause.event.date,
             "time": cause.event.time.strftime("%H:%M") if cause.event.time else None,
             "ngo_id": cause.event.ngo_id
         })
@@ -406,7 +882,8 @@ def admin_get_user(user_id):
             "age": user.age,
             "verified": user.verified,
             "auth_id": user.auth_id
-        }
+        },
+        "stats": summary.stats(db.session.get(UserSummary, user_id))
     })
 
 #----Get causes for the user[for AdminDashboard.js]----
@@ -441,35 +918,45 @@ def get_verified_user(auth_id):
         return None, "You are not verified"
     return auth, None
 
+# -------------------------
+# Write-behind path (INGEST_ENABLED)
+# -------------------------
+def queue_write(kind, user_id, cause_id, fields, message):
+    """Queue the row for the background flusher and answer 202."""
+    try:
+        ingest.enqueue(kind, {"user_id": user_id, "cause_id": cause_id, **fields})
+    except InputError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"message": message, "queued": True}), 202
+
 # -------------------------
 # Donate
 # -------------------------
 @main.route("/api/cause/<int:cause_id>/donate", methods=["POST"])
+@idempotent
 def donate(cause_id):
     data = request.json
     auth_id = data.get("auth_id")
     amount = data.get("amount")
-    
-    # Step 1: Validate auth_id exists
-    auth = AuthData.query.filter_by(id=auth_id).first()
-    if not auth or auth.role != "user":
-        return jsonify({"error": "Invalid user"}), 403
-    
-    # Step 2: Check verified
-    if not auth.verified:
-        return jsonify({"error": "You are not verified"}), 403
-    
-    user = auth.fk_id
-    if not user:
-        return jsonify({"error": "User record not found"}), 404
-    
-    cause = Cause.query.get(cause_id)
-    if not cause:
-        return jsonify({"error": "Cause not found"}),
-    # Step 3: Create Donation
+
+    # Step 1: Validate the user and cause (cached, see backend/lookups.py)
+    user, error = lookups.check_writer(auth_id, cause_id)
+    if error:
+        return jsonify({"error": error[0]}), error[1]
+
+    try:
+        amount = parse_amount(amount)
+    except InputError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if ingest.enabled:
+        return queue_write("donation", user, cause_id, {"amount": amount}, "Donation successful")
+
+    # Step 2: Create Donation
     try:
         donation = Donation(user_id=user, cause_id=cause_id, amount=amount)
         db.session.add(donation)
+        mark_cause_detail_changed(cause_id)
         db.session.commit()
         return jsonify({"message": "Donation successful"})
     except Exception as e:
@@ -480,31 +967,24 @@ def donate(cause_id):
 # Volunteer
 # -------------------------
 @main.route("/api/cause/<int:cause_id>/volunteer", methods=["POST"])
+@idempotent
 def volunteer_cause(cause_id):
     data = request.get_json()
     auth_id = data.get("auth_id")
     hours = data.get("hours")
     date = data.get("date")  # optional
 
-    # Step 1: Validate auth_id exists
-    auth = AuthData.query.filter_by(id=auth_id).first()
-    if not auth or auth.role != "user":
-        return jsonify({"error": "Invalid user"}), 403
-    
-    # Step 2: Check verified
-    if not auth.verified:
-        return jsonify({"error": "You are not verified"}), 403
-    
-    user = auth.fk_id
-    if not user:
-        return jsonify({"error": "User record not found"}), 404
+    # Step 1: Validate the user and cause (cached, see backend/lookups.py)
+    user, error = lookups.check_writer(auth_id, cause_id)
+    if error:
+        return jsonify({"error": error[0]}), error[1]
 
-    cause = Cause.query.get(cause_id)
-    if not cause:
-        return jsonify({"error": "Cause not found"}), 404
+    if ingest.enabled:
+        return queue_write("volunteer", user, cause_id, {}, "Volunteer of submitted successfully.")
 
-    volunteer = Volunteer(user_id=user, cause_id=cause.cause_id)
+    volunteer = Volunteer(user_id=user, cause_id=cause_id)
     db.session.add(volunteer)
+    mark_cause_detail_changed(cause_id)
     db.session.commit()
 
     return jsonify({"message": f"Volunteer of submitted successfully."}), 200
@@ -513,34 +993,33 @@ def volunteer_cause(cause_id):
 # Feedback
 # -------------------------
 @main.route("/api/cause/<int:cause_id>/feedback", methods=["POST"])
+@idempotent
 def feedback_cause(cause_id):
     data = request.get_json()
     auth_id = data.get("auth_id")
     comment = data.get("comment")
     rating = data.get("rating")
-    # Step 1: Validate auth_id exists
-    auth = AuthData.query.filter_by(id=auth_id).first()
-    if not auth or auth.role != "user":
-        return jsonify({"error": "Invalid user"}), 403
-    
-    # Step 2: Check verified
-    if not auth.verified:
-        return jsonify({"error": "You are not verified"}), 403
-    
-    user = auth.fk_id
-    if not user:
-        return jsonify({"error": "User record not found"}), 404
 
-    cause = Cause.query.get(cause_id)
-    if not cause:
-        return jsonify({"error": "Cause not found"}), 404
+    # Step 1: Validate the user and cause (cached, see backend/lookups.py)
+    user, error = lookups.check_writer(auth_id, cause_id)
+    if error:
+        return jsonify({"error": error[0]}), error[1]
 
     if not auth_id or not comment or rating is None:
         return jsonify({"error": "auth_id, comment, and rating required"}), 400
 
+    try:
+        rating = parse_rating(rating)
+    except InputError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if ingest.enabled:
+        return queue_write("feedback", user, cause_id, {"comment": comment, "rating": rating},
+                           "Feedback submitted successfully.")
 
-    feedback = Feedback(user_id=user, cause_id=cause.cause_id, comment=comment, rating=rating)
+    feedback = Feedback(user_id=user, cause_id=cause_id, comment=comment, rating=rating)
     db.session.add(feedback)
+    mark_cause_detail_changed(cause_id)
     db.session.commit()
 
     return jsonify({"message": "Feedback submitted successfully."}), 200
@@ -0,0 +1,154 @@
+# backend/search.py
+#
+# Full-text search over Cause.name / Cause.description.
+#
+# SQLite:      an external-content FTS5 table (cause_fts) kept in sync with
+#              `cause` by triggers, ranked with bm25().
+# PostgreSQL:  a GIN expression index over a weighted tsvector, ranked with
+#              ts_rank(). The index is maintained by Postgres itself.
+# Other:       falls back to ILIKE so the endpoints keep working.
+#
+# Because syncing happens in the database, every write path (ORM, Core,
+# bulk statements, ON DELETE CASCADE) keeps the index current.
+import re
+
+from sqlalchemy import DDL, event, text
+
+from backend import db
+from backend.models import Cause
+
+FTS_TABLE = "cause_fts"
+
+# Name matches weigh more than description matches.
+NAME_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# ------------------------------------------------------------
+# DDL
+# ------------------------------------------------------------
+SQLITE_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        name, description,
+        content='cause', content_rowid='cause_id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON cause BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.cause_id, new.name, new.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON cause BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.cause_id, old.name, old.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF name, description ON cause BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.cause_id, old.name, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.cause_id, new.name, new.description);
+    END""",
+]
+SQLITE_DROP = [f"DROP TABLE IF EXISTS {FTS_TABLE}"]
+SQLITE_REBUILD = f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+
+PG_DOCUMENT = (
+    "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B')"
+)
+PG_DDL = [f"CREATE INDEX IF NOT EXISTS ix_cause_search ON cause USING GIN (({PG_DOCUMENT}))"]
+PG_DROP = ["DROP INDEX IF EXISTS ix_cause_search"]
+
+for _stmt in SQLITE_DDL:
+    event.listen(Cause.__table__, "after_create", DDL(_stmt).execute_if(dialect="sqlite"))
+for _stmt in SQLITE_DROP:
+    event.listen(Cause.__table__, "before_drop", DDL(_stmt).execute_if(dialect="sqlite"))
+for _stmt in PG_DDL:
+    event.listen(Cause.__table__, "after_create", DDL(_stmt).execute_if(dialect="postgresql"))
+for _stmt in PG_DROP:
+    event.listen(Cause.__table__, "before_drop", DDL(_stmt).execute_if(dialect="postgresql"))
+
+
+def rebuild_index():
+    """Re-index every cause (backfill after bulk loads or a migration)."""
+    if _dialect() == "sqlite":
+        db.session.execute(text(SQLITE_REBUILD))
+        db.session.commit()
+
+
+# ------------------------------------------------------------
+# QUERY BUILDING
+# ------------------------------------------------------------
+def _dialect():
+    return db.session.get_bind().dialect.name
+
+
+def _tokens(q):
+    return _TOKEN_RE.findall(q or "")[:16]
+
+
+def _fts5_query(tokens):
+    # Every token is quoted (no FTS syntax injection) and prefix-matched.
+    return " ".join('"{}"*'.format(t.replace('"', "")) for t in tokens)
+
+
+def _tsquery(tokens):
+    return " & ".join(f"{t}:*" for t in tokens)
+
+
+def match_clause(q, id_column=Cause.cause_id):
+    """A WHERE clause restricting rows keyed by id_column to matches of q."""
+    tokens = _tokens(q)
+    if not tokens:
+        return None
+
+    dialect = _dialect()
+    if dialect == "sqlite":
+        ids = text(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :fts_q")
+        return id_column.in_(ids.bindparams(fts_q=_fts5_query(tokens)))
+    if dialect == "postgresql":
+        ids = text(f"SELECT cause_id FROM cause WHERE ({PG_DOCUMENT}) @@ to_tsquery('simple', :ts_q)")
+        return id_column.in_(ids.bindparams(ts_q=_tsquery(tokens)))
+
+    matches = db.session.query(Cause.cause_id).filter(db.and_(*[
+        db.or_(Cause.name.ilike(f"%{t}%"), Cause.description.ilike(f"%{t}%"))
+        for t in tokens
+    ]))
+    return id_column.in_(matches)
+
+
+def search_cause_ids(q, limit, verified_only=True):
+    """Return up to `limit` cause ids matching q, best match first."""
+    tokens = _tokens(q)
+    if not tokens:
+        return []
+
+    dialect = _dialect()
+    verified = "AND c.verified = :verified" if verified_only else ""
+    if dialect == "sqlite":
+        sql = text(f"""
+            SELECT c.cause_id FROM {FTS_TABLE} f
+            JOIN cause c ON c.cause_id = f.rowid
+            WHERE {FTS_TABLE} MATCH :fts_q {verified}
+            ORDER BY bm25({FTS_TABLE}, {NAME_WEIGHT}, {DESCRIPTION_WEIGHT}), c.cause_id
+            LIMIT :limit
+        """)
+        params = {"fts_q": _fts5_query(tokens)}
+    elif dialect == "postgresql":
+        sql = text(f"""
+            SELECT c.cause_id FROM cause c
+            WHERE ({PG_DOCUMENT}) @@ to_tsquery('simple', :ts_q) {verified}
+            ORDER BY ts_rank(({PG_DOCUMENT}), to_tsquery('simple', :ts_q)) DESC, c.cause_id
+            LIMIT :limit
+        """)
+        params = {"ts_q": _tsquery(tokens)}
+    else:
+        query = db.session.query(Cause.cause_id).filter(match_clause(q, Cause.cause_id))
+        if verified_only:
+            query = query.filter(Cause.verified.is_(True))
+        return [cid for (cid,) in query.order_by(Cause.cause_id).limit(limit)]
+
+    params["limit"] = limit
+    if verified_only:
+        params["verified"] = True
+    return [cid for (cid,) in db.session.execute(sql, params)]
@@ -0,0 +1,58 @@
+# backend/streaming.py
+#
+# Streamed JSON bodies for the large list endpoints.
+#
+# jsonify() holds the complete list of dicts and then the complete encoded
+# body in memory. For the admin tables that list every user and cause,
+# that is several times the payload per request, and nothing is sent
+# until the last row has been read. These helpers instead pull rows from
+# a yield_per query and emit the JSON text ROWS_PER_CHUNK items at a
+# time. Memory per request stays flat, and the first bytes leave once the
+# first rows are fetched.
+#
+# Once streaming has started the status is already sent, so an error
+# half-way through can only cut the body short. Clients see invalid JSON
+# rather than a silently partial list.
+#
+# The query's cursor, and with it a read transaction, stays open until the
+# last chunk is sent. On SQLite that only works alongside writers because
+# backend/models.py puts file databases in WAL mode. With a rollback
+# journal the open reader would make every COMMIT fail with "database is
+# locked" for as long as the download lasts.
+from flask import current_app, stream_with_context
+
+ROWS_PER_CHUNK = 500
+YIELD_PER = 1000
+
+
+def json_array(items, head="[", tail=lambda: "]", rows_per_chunk=ROWS_PER_CHUNK):
+    """Yield head, the items as a comma-separated JSON array body, then tail().
+
+    tail is called after the last item, so it can report things only
+    known then (e.g. the next page cursor).
+    """
+    provider = current_app.json
+    # Same compact/indented choice as jsonify().
+    compact = getattr(provider, "compact", None)
+    compact = compact or (compact is None and not current_app.debug)
+    options = {"separators": (",", ":")} if compact else {}
+
+    def dumps(obj):
+        return provider.dumps(obj, **options)
+
+    yield head
+    separator = ""
+    chunk = []
+    for item in items:
+        chunk.append(dumps(item))
+        if len(chunk) >= rows_per_chunk:
+            yield separator + ",".join(chunk)
+            separator, chunk = ",", []
+    if chunk:
+        yield separator + ",".join(chunk)
+    yield tail()
+
+
+def response(chunks):
+    """A streamed application/json response; the app context stays up until it ends."""
+    return current_app.response_class(stream_with_context(chunks), mimetype="application/json")
@@ -0,0 +1,574 @@
+# backend/summary.py
+#
+# Maintains cause_summary, the one-row-per-cause read model the cause
+# cards are served from, and user_summary, the per-user running totals
+# shown in the admin views.
+#
+# A session after_flush hook looks at what the flush wrote and, in the
+# same transaction:
+#   - re-derives the card fields of causes whose Cause/NGO/Event/Location/
+#     CauseContact/CauseSocials rows changed (a handful of indexed lookups
+#     per affected cause, never a table scan),
+#   - applies +/- deltas to the donation, rating and volunteer aggregates
+#     of the cause and of the user for every inserted, updated or deleted
+#     Donation/Feedback/Volunteer row,
+#   - drops the rows of deleted causes.
+#
+# Writes that bypass the ORM (Core bulk inserts, set-based deletes) must
+# call refresh() / recompute_aggregates() / recompute_user_aggregates() /
+# remove_rows() themselves. rebuild() recomputes everything and backs the
+# `flask rebuild-cause-summary` command; reconcile() reports (and repairs)
+# drift and backs `flask reconcile-summaries`.
+import json
+from collections import defaultdict
+
+from sqlalchemy import bindparam, event, func, inspect, null, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from backend.models import (
+    Cause, NGO, Event, Location, CauseContact, CauseSocials,
+    Donation, Feedback, Volunteer, User, CauseSummary, UserSummary
+)
+
+summary = CauseSummary.__table__
+user_summary = UserSummary.__table__
+STRUCTURAL_MODELS = (NGO, Event, Location, CauseContact, CauseSocials)
+AGGREGATE_COLUMNS = ("donation_total", "donation_count", "rating_sum", "rating_count", "volunteer_count")
+UPSERT_CHUNK_SIZE = 500
+
+
+# ------------------------------------------------------------
+# DERIVING ROWS
+# ------------------------------------------------------------
+def _structural_rows(conn, cause_ids):
+    ids = list(cause_ids)
+    rows = {}
+    for c in conn.execute(
+        select(Cause.cause_id, Cause.name, Cause.description, Cause.logo, Cause.verified)
+        .where(Cause.cause_id.in_(ids))
+    ):
+        rows[c.cause_id] = {
+            "cause_id": c.cause_id, "name": c.name, "description": c.description,
+            "logo": c.logo, "verified": bool(c.verified), "type": "Unknown",
+            "year_est": None, "age": None, "date": None, "time": None, "capacity": None,
+            "latitude": None, "longitude": None, "contacts": [], "socials": [],
+        }
+    if not rows:
+        return rows
+    ids = list(rows)
+
+    for n in conn.execute(select(NGO.cause_id, NGO.year_est, NGO.age).where(NGO.cause_id.in_(ids))):
+        rows[n.cause_id].update({"type": "NGO", "year_est": n.year_est, "age": n.age})
+
+    for e in conn.execute(
+        select(Event.cause_id, Event.date, Event.time, Event.capacity)
+        .where(Event.cause_id.in_(ids)).order_by(Event.event_id.desc())
+    ):
+        row = rows[e.cause_id]
+        if row["type"] != "NGO":
+            row.update({"type": "Event", "date": e.date, "time": e.time, "capacity": e.capacity})
+
+    for loc in conn.execute(
+        select(Location.cause_id, Location.latitude, Location.longitude)
+        .where(Location.cause_id.in_(ids)).order_by(Location.loc_id.desc())
+    ):
+        # Descending order: the lowest loc_id (the first location) wins.
+        rows[loc.cause_id].update({"latitude": loc.latitude, "longitude": loc.longitude})
+
+    for model, field, key in ((CauseContact, CauseContact.contact, "contacts"),
+                              (CauseSocials, CauseSocials.social, "socials")):
+        pk = inspect(model).primary_key[0]
+        for cid, value in conn.execute(
+            select(model.cause_id, field).where(model.cause_id.in_(ids)).order_by(pk)
+        ):
+            rows[cid][key].append(value)
+
+    for row in rows.values():
+        row["contacts"] = json.dumps(row["contacts"])
+        row["socials"] = json.dumps(row["socials"])
+    return rows
+
+
+def _aggregate_rows(conn, ids, by="cause_id"):
+    """Aggregates per cause (or per user, by="user_id") from the source tables."""
+    ids = list(ids)
+    rows = {i: dict.fromkeys(AGGREGATE_COLUMNS, 0) for i in ids}
+    key = {model: getattr(model, by) for model in (Donation, Feedback, Volunteer)}
+    for i, total, count in conn.execute(
+        select(key[Donation], func.coalesce(func.sum(Donation.amount), 0), func.count())
+        .where(key[Donation].in_(ids)).group_by(key[Donation])
+    ):
+        rows[i].update({"donation_total": float(total), "donation_count": count})
+    for i, total, count in conn.execute(
+        select(key[Feedback], func.coalesce(func.sum(Feedback.rating), 0), func.count(Feedback.rating))
+        .where(key[Feedback].in_(ids)).group_by(key[Feedback])
+    ):
+        rows[i].update({"rating_sum": int(total), "rating_count": count})
+    for i, count in conn.execute(
+        select(key[Volunteer], func.count()).where(key[Volunteer].in_(ids)).group_by(key[Volunteer])
+    ):
+        rows[i]["volunteer_count"] = count
+    return rows
+
+
+# ------------------------------------------------------------
+# WRITING ROWS
+# ------------------------------------------------------------
+def refresh(conn, cause_ids):
+    """Re-derive card fields; creates missing rows. Returns created ids."""
+    structural = _structural_rows(conn, cause_ids)
+    if not structural:
+        return set()
+
+    existing = {cid for (cid,) in conn.execute(
+        select(summary.c.cause_id).where(summary.c.cause_id.in_(list(structural)))
+    )}
+    for cid in existing:
+        conn.execute(summary.update().where(summary.c.cause_id == cid).values(**structural[cid]))
+
+    created = set(structural) - existing
+    if created:
+        aggregates = _aggregate_rows(conn, created)
+        conn.execute(summary.insert(), [{**structural[cid], **_with_average(aggregates[cid])}
+                                        for cid in created])
+    return created
+
+
+def _with_average(values):
+    """Aggregate values plus the derived cause_summary.rating_avg."""
+    count = values["rating_count"]
+    return {**values, "rating_avg": values["rating_sum"] / count if count else None}
+
+
+def recompute_aggregates(conn, cause_ids):
+    """Recount donation/rating/volunteer aggregates from the source tables."""
+    for cid, values in _aggregate_rows(conn, cause_ids).items():
+        conn.execute(summary.update().where(summary.c.cause_id == cid).values(**_with_average(values)))
+
+
+def apply_deltas(conn, donation_deltas=None, rating_deltas=None, volunteer_deltas=None):
+    """Add {cause_id: (amount, count)} / {cause_id: (rating_sum, count)} / {cause_id: count}."""
+    if donation_deltas:
+        conn.execute(
+            summary.update()
+            .where(summary.c.cause_id == bindparam("cid"))
+            .values(donation_total=summary.c.donation_total + bindparam("amount"),
+                    donation_count=summary.c.donation_count + bindparam("n")),
+            [{"cid": cid, "amount": a, "n": n} for cid, (a, n) in donation_deltas.items()]
+        )
+    if rating_deltas:
+        conn.execute(
+            summary.update()
+            .where(summary.c.cause_id == bindparam("cid"))
+            .values(rating_sum=summary.c.rating_sum + bindparam("total"),
+                    rating_count=summary.c.rating_count + bindparam("n"),
+                    # SET expressions see the old values on both sides
+                    rating_avg=(summary.c.rating_sum + bindparam("total")) * 1.0
+                    / func.nullif(summary.c.rating_count + bindparam("n"), 0)),
+            [{"cid": cid, "total": t, "n": n} for cid, (t, n) in rating_deltas.items()]
+        )
+    if volunteer_deltas:
+        conn.execute(
+            summary.update()
+            .where(summary.c.cause_id == bindparam("cid"))
+            .values(volunteer_count=summary.c.volunteer_count + bindparam("n")),
+            [{"cid": cid, "n": n} for cid, n in volunteer_deltas.items()]
+        )
+
+
+def _upsert_users(conn, rows, increment):
+    """Insert user_summary rows, or add to (increment) / overwrite existing ones."""
+    dialect = conn.dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        for i in range(0, len(rows), UPSERT_CHUNK_SIZE):
+            stmt = insert(user_summary).values(rows[i:i + UPSERT_CHUNK_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[user_summary.c.user_id],
+                set_={c: (user_summary.c[c] + stmt.excluded[c]) if increment else stmt.excluded[c]
+                      for c in AGGREGATE_COLUMNS}
+            )
+            conn.execute(stmt)
+        return
+
+    for row in rows:
+        values = {c: (user_summary.c[c] + row[c]) if increment else row[c] for c in AGGREGATE_COLUMNS}
+        updated = conn.execute(
+            user_summary.update().where(user_summary.c.user_id == row["user_id"]).values(**values)
+        ).rowcount
+        if not updated:
+            conn.execute(user_summary.insert().values(**row))
+
+
+def apply_user_deltas(conn, donation_deltas=None, rating_deltas=None, volunteer_deltas=None):
+    """apply_deltas() for user_summary, keyed by user_id; creates missing rows."""
+    rows = defaultdict(lambda: dict.fromkeys(AGGREGATE_COLUMNS, 0))
+    for uid, (amount, n) in (donation_deltas or {}).items():
+        rows[uid].update(donation_total=amount, donation_count=n)
+    for uid, (total, n) in (rating_deltas or {}).items():
+        rows[uid].update(rating_sum=total, rating_count=n)
+    for uid, n in (volunteer_deltas or {}).items():
+        rows[uid]["volunteer_count"] = n
+    if rows:
+        _upsert_users(conn, [{"user_id": uid, **values} for uid, values in sorted(rows.items())], True)
+
+
+def recompute_user_aggregates(conn, user_ids):
+    """Recount user_summary rows from the source tables (missing users are skipped)."""
+    ids = [uid for (uid,) in conn.execute(select(User.user_id).where(User.user_id.in_(list(user_ids))))]
+    if ids:
+        _upsert_users(conn, [{"user_id": uid, **values}
+                             for uid, values in sorted(_aggregate_rows(conn, ids, by="user_id").items())], False)
+
+
+def delete(conn, cause_ids):
+    if cause_ids:
+        conn.execute(summary.delete().where(summary.c.cause_id.in_(list(cause_ids))))
+
+
+def rebuild(session, batch_size=1000):
+    """Recompute every row, committing per batch. Returns causes processed."""
+    conn = session.connection()
+    last_id, processed = 0, 0
+    while True:
+        ids = [cid for (cid,) in conn.execute(
+            select(Cause.cause_id).where(Cause.cause_id > last_id)
+            .order_by(Cause.cause_id).limit(batch_size)
+        )]
+        if not ids:
+            break
+        delete(conn, ids)
+        refresh(conn, ids)
+        session.commit()
+        conn = session.connection()
+        processed += len(ids)
+        last_id = ids[-1]
+
+    # Rows whose cause no longer exists
+    conn.execute(summary.delete().where(~summary.c.cause_id.in_(select(Cause.cause_id))))
+    session.commit()
+
+    last_id = 0
+    while True:
+        conn = session.connection()
+        ids = [uid for (uid,) in conn.execute(
+            select(User.user_id).where(User.user_id > last_id)
+            .order_by(User.user_id).limit(batch_size)
+        )]
+        if not ids:
+            break
+        recompute_user_aggregates(conn, ids)
+        session.commit()
+        last_id = ids[-1]
+    return processed
+
+
+# ------------------------------------------------------------
+# RECONCILIATION
+# ------------------------------------------------------------
+def _differs(stored, actual):
+    if actual is None:
+        return stored is not None
+    return abs((stored or 0) - actual) > 1e-6 * max(1.0, abs(actual))
+
+
+def reconcile(session, batch_size=1000, fix=True, max_samples=20):
+    """Compare the stored aggregates with the source tables.
+
+    Returns a drift report; with fix=True drifted or missing rows are
+    rewritten, committing per batch.
+    """
+    report = {
+        "causes": {"checked": 0, "drifted": 0, "missing": 0},
+        "users": {"checked": 0, "drifted": 0, "missing": 0},
+        "samples": [],
+    }
+    targets = (
+        ("causes", Cause.cause_id, summary, summary.c.cause_id, "cause_id",
+         AGGREGATE_COLUMNS + ("rating_avg",)),
+        ("users", User.user_id, user_summary, user_summary.c.user_id, "user_id", AGGREGATE_COLUMNS),
+    )
+    for name, source_pk, table, table_pk, by, checked in targets:
+        counts = report[name]
+        last_id = 0
+        while True:
+            conn = session.connection()
+            ids = [i for (i,) in conn.execute(
+                select(source_pk).where(source_pk > last_id).order_by(source_pk).limit(batch_size)
+            )]
+            if not ids:
+                break
+            last_id = ids[-1]
+            counts["checked"] += len(ids)
+
+            actual = _aggregate_rows(conn, ids, by=by)
+            if name == "causes":
+                actual = {i: _with_average(values) for i, values in actual.items()}
+            stored = {
+                row[0]: dict(zip(checked, row[1:]))
+                for row in conn.execute(
+                    select(table_pk, *[table.c[c] for c in checked]).where(table_pk.in_(ids))
+                )
+            }
+            missing, drifted = [], []
+            for i in ids:
+                if i not in stored:
+                    # A user without activity needs no row (stats() reads it as zeros).
+                    if name == "causes" or any(actual[i].values()):
+                        missing.append(i)
+                    continue
+                columns = [c for c in checked if _differs(stored[i][c], actual[i][c])]
+                if columns:
+                    drifted.append(i)
+                    for c in columns:
+                        if len(report["samples"]) < max_samples:
+                            report["samples"].append({by: i, "column": c, "stored": stored[i][c],
+                                                      "actual": actual[i][c]})
+            counts["missing"] += len(missing)
+            counts["drifted"] += len(drifted)
+
+            if fix and (missing or drifted):
+                if name == "causes":
+                    refresh(conn, missing)
+                    for i in drifted:
+                        conn.execute(table.update().where(table_pk == i).values(**actual[i]))
+                else:
+                    _upsert_users(conn, [{"user_id": i, **actual[i]} for i in missing + drifted], False)
+            session.commit()
+    return report
+
+
+# ------------------------------------------------------------
+# SESSION HOOKS
+# ------------------------------------------------------------
+class _Pending:
+    """Summary work gathered while a flush is prepared and executed."""
+
+    def __init__(self):
+        self.structural = set()
+        self.deleted = set()
+        self.recount = set()
+        self.deleted_users = set()
+        self.user_recount = set()
+        self.donations = defaultdict(lambda: [0.0, 0])
+        self.ratings = defaultdict(lambda: [0, 0])
+        self.volunteers = defaultdict(int)
+        self.user_donations = defaultdict(lambda: [0.0, 0])
+        self.user_ratings = defaultdict(lambda: [0, 0])
+        self.user_volunteers = defaultdict(int)
+
+    def donation(self, cause_id, user_id, amount, sign):
+        for totals, key in ((self.donations, cause_id), (self.user_donations, user_id)):
+            totals[key][0] += sign * float(amount or 0)
+            totals[key][1] += sign
+
+    def rating(self, cause_id, user_id, rating, sign):
+        if rating is not None:
+            for totals, key in ((self.ratings, cause_id), (self.user_ratings, user_id)):
+                totals[key][0] += sign * int(rating)
+                totals[key][1] += sign
+
+    def volunteer(self, cause_id, user_id, _value, sign):
+        self.volunteers[cause_id] += sign
+        self.user_volunteers[user_id] += sign
+
+    def is_empty(self):
+        return not (self.structural or self.deleted or self.recount or self.user_recount
+                    or self.donations or self.ratings or self.volunteers
+                    or self.user_donations or self.user_ratings or self.user_volunteers)
+
+
+# Source tables whose rows feed the aggregates, with the value column
+# summed for each (None: rows are only counted).
+TRACKED = ((Donation, Donation.amount, _Pending.donation),
+           (Feedback, Feedback.rating, _Pending.rating),
+           (Volunteer, None, _Pending.volunteer))
+
+
+def _pending(session):
+    return session.info.setdefault("cause_summary_pending", _Pending())
+
+
+def _write(conn, pending):
+    """Apply everything gathered in pending to both summary tables."""
+    delete(conn, pending.deleted)
+    created = refresh(conn, pending.structural - pending.deleted)
+
+    # Freshly created rows and recounted causes already include this flush.
+    skip = pending.deleted | created | pending.recount
+    recompute_aggregates(conn, pending.recount - pending.deleted)
+    apply_deltas(
+        conn,
+        {cid: d for cid, d in pending.donations.items() if cid not in skip and d != [0.0, 0]},
+        {cid: r for cid, r in pending.ratings.items() if cid not in skip and r != [0, 0]},
+        {cid: n for cid, n in pending.volunteers.items() if cid not in skip and n},
+    )
+
+    skip = pending.deleted_users | pending.user_recount
+    recompute_user_aggregates(conn, pending.user_recount - pending.deleted_users)
+    apply_user_deltas(
+        conn,
+        {uid: d for uid, d in pending.user_donations.items() if uid not in skip and d != [0.0, 0]},
+        {uid: r for uid, r in pending.user_ratings.items() if uid not in skip and r != [0, 0]},
+        {uid: n for uid, n in pending.user_volunteers.items() if uid not in skip and n},
+    )
+
+
+def remove_rows(conn, model, rows, deleted_causes=(), deleted_users=()):
+    """Subtract deleted Donation/Feedback/Volunteer rows from both summaries.
+
+    rows are (cause_id, user_id, value) as they were stored. Aggregates of
+    causes/users that are themselves being deleted are left alone.
+    Returns the cause ids whose aggregates changed.
+    """
+    pending = _Pending()
+    add = next(add for m, _, add in TRACKED if m is model)
+    for cause_id, user_id, value in rows:
+        add(pending, cause_id, user_id, value, -1)
+    pending.deleted_users.update(deleted_users)
+    for cid in set(deleted_causes):
+        for totals in (pending.donations, pending.ratings, pending.volunteers):
+            totals.pop(cid, None)
+    _write(conn, pending)
+    return {cid for totals in (pending.donations, pending.ratings, pending.volunteers)
+            for cid in totals}
+
+
+def _stored_values(conn, model, value_column, objects):
+    """{pk: (cause_id, user_id, value)} as currently stored, i.e. before this flush."""
+    pk = inspect(model).primary_key[0]
+    ids = [inspect(o).identity[0] for o in objects]
+    value_column = value_column if value_column is not None else null()
+    return {
+        row[0]: tuple(row[1:])
+        for row in conn.execute(select(pk, model.cause_id, model.user_id, value_column).where(pk.in_(ids)))
+    }
+
+
+def _activity(conn, column, ids, of):
+    """Distinct values of column ("cause_id"/"user_id") over rows whose `of` is in ids."""
+    found = set()
+    for model, _, _ in TRACKED:
+        found.update(v for (v,) in conn.execute(
+            select(getattr(model, column)).where(getattr(model, of).in_(list(ids))).distinct()
+        ))
+    return found
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_changes(session, flush_context, instances):
+    # Updated and deleted rows are handled here, while the database still
+    # holds their old values (an expired attribute that was overwritten
+    # carries no history to recover them from).
+    pending = _pending(session)
+    conn = None
+
+    changed = [o for o in session.dirty if session.is_modified(o, include_collections=False)]
+    removed = list(session.deleted)
+
+    for model, value_column, add in TRACKED:
+        updated = [o for o in changed if isinstance(o, model)]
+        gone = [o for o in removed if isinstance(o, model)]
+        if not (updated or gone):
+            continue
+        conn = conn or session.connection()
+        stored = _stored_values(conn, model, value_column, updated + gone)
+        for obj in updated + gone:
+            old = stored.get(inspect(obj).identity[0])
+            if old:
+                add(pending, old[0], old[1], old[2], -1)
+        for obj in updated:
+            value = getattr(obj, value_column.key) if value_column is not None else None
+            add(pending, obj.cause_id, obj.user_id, value, +1)
+
+    for obj in changed + removed:
+        if isinstance(obj, Cause) and obj in session.deleted:
+            pending.deleted.add(inspect(obj).identity[0])
+        elif isinstance(obj, (Cause,) + STRUCTURAL_MODELS):
+            history = inspect(obj).attrs.cause_id.history
+            pending.structural.update(history.deleted)
+            pending.structural.add(obj.cause_id)
+
+    # Deleting a user removes their causes, donations, feedback and
+    # signups via ON DELETE CASCADE, which the ORM never sees.
+    user_ids = [o.user_id for o in removed if isinstance(o, User)]
+    if user_ids:
+        conn = conn or session.connection()
+        owned = {cid for (cid,) in conn.execute(select(Cause.cause_id).where(Cause.user_id.in_(user_ids)))}
+        touched = _activity(conn, "cause_id", user_ids, of="user_id")
+        pending.deleted.update(owned)
+        pending.recount.update(touched - owned)
+        pending.deleted_users.update(user_ids)
+
+    # Likewise a deleted cause takes its activity out of its users' totals.
+    if pending.deleted:
+        conn = conn or session.connection()
+        pending.user_recount.update(_activity(conn, "user_id", pending.deleted, of="cause_id"))
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_summary(session, flush_context):
+    pending = session.info.pop("cause_summary_pending", None) or _Pending()
+
+    # New rows only have their keys (and relationship-set FKs) now.
+    for obj in session.new:
+        if isinstance(obj, (Cause,) + STRUCTURAL_MODELS):
+            pending.structural.add(obj.cause_id)
+        elif isinstance(obj, Donation):
+            pending.donation(obj.cause_id, obj.user_id, obj.amount, +1)
+        elif isinstance(obj, Feedback):
+            pending.rating(obj.cause_id, obj.user_id, obj.rating, +1)
+        elif isinstance(obj, Volunteer):
+            pending.volunteer(obj.cause_id, obj.user_id, None, +1)
+
+    pending.structural.discard(None)
+    if pending.is_empty():
+        return
+    _write(session.connection(), pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session):
+    session.info.pop("cause_summary_pending", None)
+
+
+# ------------------------------------------------------------
+# SERIALIZATION
+# ------------------------------------------------------------
+def card(row):
+    """The /api/causes card for a CauseSummary row."""
+    data = {
+        "cause_id": row.cause_id,
+        "name": row.name,
+        "description": row.description,
+        "logo": row.logo,
+        "type": row.type,
+        "contacts": json.loads(row.contacts),
+        "socials": json.loads(row.socials),
+        "latitude": row.latitude,
+        "longitude": row.longitude
+    }
+    if row.type == "NGO":
+        data.update({"year_est": row.year_est, "age": row.age})
+    elif row.type == "Event":
+        data.update({
+            "date": row.date,
+            "time": row.time.strftime("%H:%M") if row.time else None,
+            "capacity": row.capacity
+        })
+    return data
+
+
+def stats(row):
+    """Running aggregates of a CauseSummary/UserSummary row (None: all zero)."""
+    if row is None:
+        return {"donation_total": 0.0, "donation_count": 0, "rating_count": 0,
+                "rating_average": None, "volunteer_count": 0}
+    return {
+        "donation_total": row.donation_total,
+        "donation_count": row.donation_count,
+        "rating_count": row.rating_count,
+        "rating_average": round(row.rating_sum / row.rating_count, 2) if row.rating_count else None,
+        "volunteer_count": row.volunteer_count
+    }
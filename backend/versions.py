@@ -0,0 +1,131 @@
+# backend/versions.py
+#
+# Change-version counters behind the ETag / Last-Modified headers.
+#
+# Write routes call bump() before committing, so the new version becomes
+# visible in the same transaction as the data it describes. Read routes
+# wrapped in @conditional() load the versions (one primary-key lookup) and
+# answer 304 before the view runs, i.e. before any serialization or
+# relationship loading.
+#
+# Some bodies also carry numbers that change without a bump (the running
+# totals on cause cards). Those views pass ttl=: the validators then also
+# move on to a new window every ttl seconds, so clients revalidate into
+# fresh totals at the same pace as the response cache expires them.
+import hashlib
+import time
+from datetime import datetime
+from functools import wraps
+
+from flask import current_app, request
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from backend import db, cache
+from backend.models import ChangeVersion
+
+BUMP_CHUNK_SIZE = 500
+
+
+def bump(*scopes):
+    """Increment each scope's version inside the current transaction.
+
+    The response cache entries tagged with the same scopes are dropped
+    once the transaction commits.
+    """
+    scopes = sorted(set(scopes))
+    if not scopes:
+        return
+    db.session.info.setdefault("changed_scopes", set()).update(scopes)
+    now = datetime.utcnow()
+    rows = [{"scope": s, "version": 1, "updated_at": now} for s in scopes]
+    table = ChangeVersion.__table__
+
+    dialect = db.session.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        # Chunked: bulk admin actions can bump thousands of scopes.
+        for i in range(0, len(rows), BUMP_CHUNK_SIZE):
+            stmt = insert(table).values(rows[i:i + BUMP_CHUNK_SIZE])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.scope],
+                set_={"version": table.c.version + 1, "updated_at": stmt.excluded.updated_at}
+            )
+            db.session.execute(stmt)
+        return
+
+    for row in rows:
+        updated = db.session.execute(
+            table.update()
+            .where(table.c.scope == row["scope"])
+            .values(version=table.c.version + 1, updated_at=now)
+        ).rowcount
+        if not updated:
+            db.session.execute(table.insert().values(**row))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_cache_on_commit(session):
+    scopes = session.info.pop("changed_scopes", None)
+    if scopes:
+        cache.invalidate(*scopes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session):
+    session.info.pop("changed_scopes", None)
+
+
+def current(scopes):
+    """[(version, updated_at)] for each scope; (0, None) if never bumped."""
+    found = {
+        r.scope: (r.version, r.updated_at)
+        for r in db.session.query(ChangeVersion).filter(ChangeVersion.scope.in_(scopes))
+    }
+    return [found.get(s, (0, None)) for s in scopes]
+
+
+def conditional(*scope_templates, ttl=None):
+    """Add ETag/Last-Modified to a GET view and answer 304 when unchanged.
+
+    Scope templates are formatted with the view's URL arguments, e.g.
+    @conditional("cause:{cause_id}"). With ttl, a response is also
+    considered changed once its ttl-second window has passed.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            scopes = [t.format(**kwargs) for t in scope_templates]
+            versions = current(scopes)
+
+            stamp = ";".join(f"{s}={v}" for s, (v, _) in zip(scopes, versions))
+            modified = [ts for _, ts in versions if ts is not None]
+            if ttl:
+                window = int(time.time() // ttl)
+                stamp += f";window={window}"
+                modified.append(datetime.utcfromtimestamp(window * ttl))
+            etag = hashlib.sha1(stamp.encode()).hexdigest()[:20]
+            last_modified = max(modified).replace(microsecond=0) if modified else None
+
+            if request.if_none_match:
+                not_modified = request.if_none_match.contains(etag)
+            else:
+                since = request.if_modified_since
+                not_modified = bool(since and last_modified and
+                                    last_modified <= since.replace(tzinfo=None))
+            if not_modified:
+                response = current_app.response_class(status=304)
+            else:
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            if last_modified:
+                response.last_modified = last_modified
+            # Let browsers and the CDN keep the body but revalidate each time.
+            response.headers["Cache-Control"] = "no-cache"
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,355 @@
+# benchmarks/http_load.py
+#
+# Load test for the Flask API, run entirely in-process.
+#
+#   python benchmarks/http_load.py                                  # defaults below
+#   python benchmarks/http_load.py --concurrency 16 --duration 30 --save base.json
+#   python benchmarks/http_load.py --compare base.json              # after a change
+#   python benchmarks/http_load.py --mix list=50,detail=40,donate=10 --no-cache
+#
+# A dataset is generated once per (size, seed) with populate.py
+# and kept as a pristine SQLite file in the temp directory; every run works
+# on a fresh copy, so writes from one run never leak into the next. The app
+# comes from server.create_app() and every worker thread drives it through
+# its own test client. SQL statements are counted per request with an
+# engine listener.
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+DEFAULT_MIX = "list=35,detail=40,login=5,donate=10,feedback=5,volunteer=5"
+METRICS = ("p50_ms", "p95_ms", "p99_ms", "throughput_rps", "queries_per_request")
+LOWER_IS_BETTER = {"p50_ms", "p95_ms", "p99_ms", "queries_per_request"}
+
+
+# ------------------------------------------------------------
+# DATASET
+# ------------------------------------------------------------
+def prepare_database(args):
+    pristine = os.path.join(
+        tempfile.gettempdir(),
+        f"servia-load-{args.users}-{args.causes}-{args.donations}-{args.seed}.sqlite3"
+    )
+    if args.regenerate or not os.path.exists(pristine):
+        # A separate process: server.py binds DATABASE_URL at import time.
+        env = dict(os.environ, DATABASE_URL="sqlite:///" + pristine + ".tmp")
+        subprocess.check_call([
+            sys.executable, os.path.join(ROOT, "populate.py"),
+            "--users", str(args.users), "--causes", str(args.causes),
+            "--donations", str(args.donations), "--seed", str(args.seed),
+        ], env=env)
+        os.replace(pristine + ".tmp", pristine)
+
+    working = os.path.join(tempfile.mkdtemp(prefix="servia-load-"), "app.sqlite3")
+    shutil.copyfile(pristine, working)
+    return working
+
+
+# ------------------------------------------------------------
+# WORKLOAD
+# ------------------------------------------------------------
+def parse_mix(raw):
+    mix = {}
+    for part in raw.split(","):
+        name, _, weight = part.partition("=")
+        if name not in SCENARIOS:
+            raise SystemExit(f"unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+class Workload:
+    """Draws request parameters with the same skew as the generated data."""
+
+    def __init__(self, cause_ids, user_auth, seed):
+        self.cause_ids = cause_ids
+        self.user_auth = user_auth          # [(auth_id, name)] of verified users
+        self.rng = random.Random(seed)
+        # Zipf-like popularity over a shuffled ranking, s = 1.1
+        ranking = list(cause_ids)
+        self.rng.shuffle(ranking)
+        self.ranking = ranking
+        total, self.cum = 0.0, []
+        for rank in range(1, len(ranking) + 1):
+            total += 1.0 / rank ** 1.1
+            self.cum.append(total)
+
+    def cause(self):
+        return self.rng.choices(self.ranking, cum_weights=self.cum)[0]
+
+    def user(self):
+        return self.rng.choice(self.user_auth)
+
+
+def _list(client, w):
+    params = {}
+    if w.rng.random() < 0.3:
+        params["type"] = w.rng.choice(("ngo", "event"))
+    response = client.get("/api/causes", query_string=params)
+    # Half the visitors page further down the list.
+    if response.status_code == 200 and w.rng.random() < 0.5:
+        cursor = response.get_json().get("next_cursor")
+        if cursor:
+            params["cursor"] = cursor
+            return client.get("/api/causes", query_string=params), "list_next"
+    return response, "list"
+
+
+def _detail(client, w):
+    return client.get(f"/api/causes/{w.cause()}"), "detail"
+
+
+def _login(client, w):
+    _, name = w.user()
+    return client.post("/api/auth/login", json={"name": name, "password": "password"}), "login"
+
+
+def _donate(client, w):
+    auth_id, _ = w.user()
+    body = {"auth_id": auth_id, "amount": round(w.rng.lognormvariate(3.5, 1.0), 2)}
+    return client.post(f"/api/cause/{w.cause()}/donate", json=body), "donate"
+
+
+def _feedback(client, w):
+    auth_id, _ = w.user()
+    body = {"auth_id": auth_id, "rating": w.rng.randint(1, 5), "comment": "Load test feedback"}
+    return client.post(f"/api/cause/{w.cause()}/feedback", json=body), "feedback"
+
+
+def _volunteer(client, w):
+    auth_id, _ = w.user()
+    return client.post(f"/api/cause/{w.cause()}/volunteer", json={"auth_id": auth_id}), "volunteer"
+
+
+SCENARIOS = {
+    "list": _list, "detail": _detail, "login": _login,
+    "donate": _donate, "feedback": _feedback, "volunteer": _volunteer,
+}
+
+
+# ------------------------------------------------------------
+# RUNNER
+# ------------------------------------------------------------
+class QueryCounter:
+    """Counts statements executed by the current thread."""
+
+    def __init__(self, engine):
+        from sqlalchemy import event
+        self._local = threading.local()
+        event.listen(engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args):
+        self._local.count = getattr(self._local, "count", 0) + 1
+
+    def reset(self):
+        self._local.count = 0
+
+    def value(self):
+        return getattr(self._local, "count", 0)
+
+
+def run(app, counter, workload_args, mix, concurrency, duration, warmup):
+    names, weights = list(mix), list(mix.values())
+    samples = []                    # (endpoint, seconds, queries, ok)
+    samples_lock = threading.Lock()
+    start_barrier = threading.Barrier(concurrency + 1)
+    state = {"measuring": False, "stop": False}
+
+    def worker(index):
+        client = app.test_client()
+        cause_ids, user_auth, seed = workload_args
+        w = Workload(cause_ids, user_auth, seed * 1000 + index)
+        local = []
+        start_barrier.wait()
+        while not state["stop"]:
+            scenario = SCENARIOS[w.rng.choices(names, weights=weights)[0]]
+            counter.reset()
+            started = time.perf_counter()
+            response, endpoint = scenario(client, w)
+            # Read the whole body: streamed responses do their work while
+            # it is sent, and an unread stream would never be closed.
+            response.get_data()
+            response.close()
+            elapsed = time.perf_counter() - started
+            if state["measuring"]:
+                ok = 200 <= response.status_code < 300 or response.status_code == 304
+                local.append((endpoint, elapsed, counter.value(), ok))
+        with samples_lock:
+            samples.extend(local)
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    start_barrier.wait()
+    time.sleep(warmup)
+    state["measuring"] = True
+    measured_from = time.perf_counter()
+    time.sleep(duration)
+    state["measuring"] = False
+    elapsed = time.perf_counter() - measured_from
+    state["stop"] = True
+    for t in threads:
+        t.join()
+    return samples, elapsed
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def summarize(samples, elapsed):
+    def stats(rows):
+        latencies = sorted(r[1] * 1000 for r in rows)
+        return {
+            "requests": len(rows),
+            "errors": sum(1 for r in rows if not r[3]),
+            "p50_ms": round(_percentile(latencies, 50), 3),
+            "p95_ms": round(_percentile(latencies, 95), 3),
+            "p99_ms": round(_percentile(latencies, 99), 3),
+            "mean_ms": round(sum(latencies) / len(latencies), 3),
+            "throughput_rps": round(len(rows) / elapsed, 1),
+            "queries_per_request": round(sum(r[2] for r in rows) / len(rows), 2),
+        }
+
+    endpoints = {}
+    for row in samples:
+        endpoints.setdefault(row[0], []).append(row)
+    return {
+        "overall": stats(samples) if samples else {},
+        "endpoints": {name: stats(rows) for name, rows in sorted(endpoints.items())},
+    }
+
+
+# ------------------------------------------------------------
+# REPORTING
+# ------------------------------------------------------------
+def print_report(result):
+    header = f"{'endpoint':<12} {'reqs':>7} {'err':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} " \
+             f"{'req/s':>9} {'q/req':>7}"
+    print(header)
+    print("-" * len(header))
+    rows = list(result["endpoints"].items()) + [("overall", result["overall"])]
+    for name, s in rows:
+        print(f"{name:<12} {s['requests']:>7} {s['errors']:>5} {s['p50_ms']:>9.2f} {s['p95_ms']:>9.2f} "
+              f"{s['p99_ms']:>9.2f} {s['throughput_rps']:>9.1f} {s['queries_per_request']:>7.2f}")
+
+
+def compare(baseline, result, threshold):
+    """Print metric deltas against a saved run. Returns the regressions."""
+    regressions = []
+    print(f"\nCompared with {baseline['meta'].get('commit') or 'baseline'} "
+          f"(regression threshold {threshold:.0f}%):")
+    names = ["overall"] + sorted(result["endpoints"])
+    for name in names:
+        old = baseline["overall"] if name == "overall" else baseline["endpoints"].get(name)
+        new = result["overall"] if name == "overall" else result["endpoints"][name]
+        if not old:
+            continue
+        deltas = []
+        for metric in METRICS:
+            if not old.get(metric):
+                continue
+            change = (new[metric] - old[metric]) / old[metric] * 100
+            worse = change > threshold if metric in LOWER_IS_BETTER else change < -threshold
+            if worse:
+                regressions.append((name, metric, old[metric], new[metric]))
+            deltas.append(f"{metric}={change:+.0f}%{'!' if worse else ''}")
+        print(f"  {name:<12} " + "  ".join(deltas))
+    return regressions
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="In-process load test for the API.")
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--causes", type=int, default=2000)
+    parser.add_argument("--donations", type=int, default=200000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--regenerate", action="store_true", help="rebuild the cached dataset")
+    parser.add_argument("--concurrency", type=int, default=8, help="worker threads")
+    parser.add_argument("--duration", type=float, default=15, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=3, help="unmeasured seconds first")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"scenario weights (default {DEFAULT_MIX})")
+    parser.add_argument("--no-cache", action="store_true", help="run with CACHE_BACKEND=none")
+    parser.add_argument("--save", help="write the result as a JSON baseline")
+    parser.add_argument("--compare", help="compare with a saved JSON baseline")
+    parser.add_argument("--threshold", type=float, default=10, help="regression threshold in percent")
+    args = parser.parse_args()
+    mix = parse_mix(args.mix)
+
+    path = prepare_database(args)
+    os.environ["DATABASE_URL"] = "sqlite:///" + path
+    if args.no_cache:
+        os.environ["CACHE_BACKEND"] = "none"
+
+    # Imported late: server reads DATABASE_URL / CACHE_BACKEND at import time.
+    from server import create_app
+    from backend import db
+    from backend.models import AuthData, Cause
+
+    app = create_app()
+    with app.app_context():
+        counter = QueryCounter(db.engine)
+        cause_ids = [cid for (cid,) in db.session.query(Cause.cause_id).filter(Cause.verified.is_(True))]
+        user_auth = db.session.query(AuthData.id, AuthData.name).filter(
+            AuthData.role == "user", AuthData.verified.is_(True)
+        ).all()
+    user_auth = [tuple(row) for row in user_auth]
+
+    print(f"Running {args.concurrency} workers for {args.duration:g}s "
+          f"(+{args.warmup:g}s warm-up), mix {args.mix}")
+    samples, elapsed = run(app, counter, (cause_ids, user_auth, args.seed), mix,
+                           args.concurrency, args.duration, args.warmup)
+    if not samples:
+        raise SystemExit("no requests completed")
+
+    result = summarize(samples, elapsed)
+    result["meta"] = {
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "dataset": {"users": args.users, "causes": args.causes,
+                    "donations": args.donations, "seed": args.seed},
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "mix": mix,
+        "cache": not args.no_cache,
+    }
+    print_report(result)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"\nSaved baseline to {args.save}")
+
+    shutil.rmtree(os.path.dirname(path), ignore_errors=True)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(json.load(f), result, args.threshold)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
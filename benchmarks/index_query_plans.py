@@ -0,0 +1,193 @@
+# benchmarks/index_query_plans.py
+#
+# Query plans and timings for the hot lookup paths in backend/routes.py,
+# before and after the indexes added in migration 4f8d2b6a91c3.
+#
+#   python benchmarks/index_query_plans.py                 # 1M donations, SQLite file
+#   python benchmarks/index_query_plans.py --donations 200000 --json out.json
+#   python benchmarks/index_query_plans.py --database-url postgresql://...
+#
+# The schema comes from backend.models; the indexes are dropped, the data
+# loaded, each query explained and timed, then the indexes created and
+# everything measured again.
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from sqlalchemy import create_engine, text  # noqa: E402
+
+from backend import db  # noqa: E402
+import backend.models  # noqa: E402,F401
+
+# (label, route, sql) -- parameters are drawn per run by _params()
+QUERIES = [
+    ("listing page", "get_all_causes / admin",
+     "SELECT cause_id, name FROM cause WHERE verified = :true AND cause_id > :after "
+     "ORDER BY cause_id LIMIT 51"),
+    ("causes of a user", "admin_verify / admin_get_user_causes",
+     "SELECT cause_id FROM cause WHERE user_id = :user_id"),
+    ("auth row by fk_id", "admin_delete_cause",
+     "SELECT id FROM auth_data WHERE fk_id = :cause_id"),
+    ("feedback page", "get_cause",
+     "SELECT feedback_id, rating, comment FROM feedback WHERE cause_id = :cause_id "
+     "ORDER BY feedback_id DESC LIMIT 21"),
+    ("rating histogram", "get_cause",
+     "SELECT rating, count(*) FROM feedback WHERE cause_id = :cause_id GROUP BY rating"),
+    ("donation total of a cause", "summary / leaderboards",
+     "SELECT sum(amount), count(*) FROM donation WHERE cause_id = :cause_id"),
+    ("donations of a user", "admin / aggregates",
+     "SELECT sum(amount), count(*) FROM donation WHERE user_id = :user_id"),
+    ("volunteers of a cause", "aggregates",
+     "SELECT count(*) FROM volunteer WHERE cause_id = :cause_id"),
+    ("locations of a cause", "cause cards",
+     "SELECT latitude, longitude FROM location WHERE cause_id = :cause_id"),
+]
+
+INDEX_TABLES = ("auth_data", "cause", "location", "feedback", "donation", "volunteer")
+
+
+def _indexes():
+    for table in db.metadata.sorted_tables:
+        if table.name in INDEX_TABLES:
+            for index in table.indexes:
+                yield index
+
+
+def _batches(rows, size=50000):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def load(engine, users, causes, donations, feedback, volunteers, seed):
+    rng = random.Random(seed)
+    t = db.metadata.tables
+    # Popularity is skewed: low cause ids get most of the activity.
+    pick_cause = lambda: int(causes * rng.random() ** 2.5) + 1  # noqa: E731
+
+    with engine.begin() as conn:
+        for batch in _batches({"id": i, "name": f"u{i}", "role": "user", "password_hash": "x",
+                               "verified": True, "fk_id": i} for i in range(1, users + 1)):
+            conn.execute(t["auth_data"].insert(), batch)
+        for batch in _batches({"id": users + i, "name": f"c{i}", "role": "ngo", "password_hash": "x",
+                               "verified": True, "fk_id": i} for i in range(1, causes + 1)):
+            conn.execute(t["auth_data"].insert(), batch)
+        for batch in _batches({"user_id": i, "name": f"user {i}", "email": f"u{i}@example.org",
+                               "verified": True, "auth_id": i} for i in range(1, users + 1)):
+            conn.execute(t["app_user"].insert(), batch)
+        for batch in _batches({"cause_id": i, "name": f"cause {i}", "user_id": rng.randint(1, users),
+                               "verified": rng.random() < 0.9} for i in range(1, causes + 1)):
+            conn.execute(t["cause"].insert(), batch)
+        for batch in _batches({"cause_id": i, "latitude": rng.uniform(-60, 60),
+                               "longitude": rng.uniform(-180, 180)} for i in range(1, causes + 1)):
+            conn.execute(t["location"].insert(), batch)
+        for batch in _batches({"user_id": rng.randint(1, users), "cause_id": pick_cause(),
+                               "amount": round(rng.uniform(1, 500), 2)} for _ in range(donations)):
+            conn.execute(t["donation"].insert(), batch)
+        for batch in _batches({"user_id": rng.randint(1, users), "cause_id": pick_cause(),
+                               "rating": rng.randint(1, 5), "comment": "ok"} for _ in range(feedback)):
+            conn.execute(t["feedback"].insert(), batch)
+        for batch in _batches({"user_id": rng.randint(1, users), "cause_id": pick_cause()}
+                              for _ in range(volunteers)):
+            conn.execute(t["volunteer"].insert(), batch)
+
+
+def _params(rng, users, causes):
+    return {"true": True, "after": rng.randint(0, causes), "user_id": rng.randint(1, users),
+            "cause_id": rng.randint(1, causes)}
+
+
+def explain(conn, sql, params):
+    if conn.dialect.name == "sqlite":
+        rows = conn.execute(text("EXPLAIN QUERY PLAN " + sql), params)
+        return [r[-1] for r in rows]
+    return [r[0] for r in conn.execute(text("EXPLAIN " + sql), params)]
+
+
+def measure(engine, users, causes, runs, seed):
+    rng = random.Random(seed)
+    results = {}
+    with engine.connect() as conn:
+        for label, route, sql in QUERIES:
+            params = [_params(rng, users, causes) for _ in range(runs)]
+            plan = explain(conn, sql, params[0])
+            started = time.perf_counter()
+            for p in params:
+                conn.execute(text(sql), p).fetchall()
+            elapsed_ms = (time.perf_counter() - started) * 1000 / runs
+            results[label] = {"route": route, "plan": plan, "avg_ms": round(elapsed_ms, 3)}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query plans and timings before and after the foreign-key indexes.")
+    parser.add_argument("--database-url", help="default: a temporary SQLite file")
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--causes", type=int, default=20000)
+    parser.add_argument("--donations", type=int, default=1000000)
+    parser.add_argument("--feedback", type=int, default=300000)
+    parser.add_argument("--volunteers", type=int, default=200000)
+    parser.add_argument("--runs", type=int, default=50, help="executions per query")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    tmpdir = None
+    url = args.database_url
+    if not url:
+        tmpdir = tempfile.mkdtemp(prefix="servia-bench-")
+        url = "sqlite:///" + os.path.join(tmpdir, "bench.sqlite3")
+    engine = create_engine(url)
+
+    db.metadata.drop_all(engine)
+    db.metadata.create_all(engine)
+    indexes = list(_indexes())
+    for index in indexes:
+        index.drop(engine)
+
+    started = time.perf_counter()
+    load(engine, args.users, args.causes, args.donations, args.feedback, args.volunteers, args.seed)
+    print(f"Loaded dataset in {time.perf_counter() - started:.1f}s "
+          f"({args.donations} donations, {args.feedback} feedback, {args.volunteers} volunteers)")
+
+    before = measure(engine, args.users, args.causes, args.runs, args.seed)
+    started = time.perf_counter()
+    for index in indexes:
+        index.create(engine)
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+    print(f"Created {len(indexes)} indexes in {time.perf_counter() - started:.1f}s")
+    after = measure(engine, args.users, args.causes, args.runs, args.seed)
+
+    for label, _, _ in QUERIES:
+        b, a = before[label], after[label]
+        speedup = b["avg_ms"] / a["avg_ms"] if a["avg_ms"] else float("inf")
+        print(f"\n== {label}  [{b['route']}]")
+        print(f"   before: {b['avg_ms']:>9.3f} ms  | " + " / ".join(b["plan"]))
+        print(f"   after:  {a['avg_ms']:>9.3f} ms  | " + " / ".join(a["plan"]))
+        print(f"   speedup: {speedup:,.0f}x")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"dataset": vars(args), "before": before, "after": after}, f, indent=2)
+
+    engine.dispose()
+    if tmpdir:
+        for name in os.listdir(tmpdir):
+            os.remove(os.path.join(tmpdir, name))
+        os.rmdir(tmpdir)
+
+
+if __name__ == "__main__":
+    main()
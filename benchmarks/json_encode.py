@@ -0,0 +1,122 @@
+# benchmarks/json_encode.py
+#
+# Encode cost of /api/causes-shaped payloads under each JSON provider.
+#
+#   python benchmarks/json_encode.py                       # pages of 50 and 200, the full 20000
+#   python benchmarks/json_encode.py --sizes 50,1000 --repeat 50 --json out.json
+#
+# Cards are built with summary.card() from synthetic cause_summary rows
+# (half NGOs, half events with a date and time). Each payload goes through
+# provider.response(), i.e. what jsonify() does, and the median of
+# --repeat runs is reported. "flask" is Flask's DefaultJSONProvider on
+# cards whose dates were pre-formatted with strftime, as the routes did
+# before backend/json_provider.py; "stdlib" and "orjson" are
+# FastJSONProvider with and without orjson. Decoded outputs are compared
+# so a faster but different encoding does not go unnoticed.
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date, time as clock
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from flask import Flask  # noqa: E402
+from flask.json.provider import DefaultJSONProvider  # noqa: E402
+
+from backend import json_provider, summary  # noqa: E402
+
+
+def make_rows(n, seed):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(1, n + 1):
+        ngo = i % 2 == 1
+        rows.append(SimpleNamespace(
+            cause_id=i,
+            name=f"Cause {i}",
+            description="Community food bank and beach clean-up, every weekend. " * rng.randint(1, 4),
+            logo=f"/static/logos/{i}.png" if rng.random() < 0.7 else None,
+            type="NGO" if ngo else "Event",
+            contacts=json.dumps([f"+1-555-{rng.randint(1000, 9999)}" for _ in range(rng.randint(1, 3))]),
+            socials=json.dumps([f"@cause{i}"]),
+            latitude=rng.uniform(-60, 60),
+            longitude=rng.uniform(-180, 180),
+            year_est=rng.randint(1950, 2024) if ngo else None,
+            age=rng.randint(0, 70) if ngo else None,
+            date=None if ngo else date(2025, rng.randint(1, 12), rng.randint(1, 28)),
+            time=None if ngo else clock(rng.randint(0, 23), rng.choice((0, 15, 30, 45))),
+            capacity=None if ngo else rng.randint(10, 500),
+        ))
+    return rows
+
+
+def payload(rows, preformat_dates=False):
+    cards = [summary.card(r) for r in rows]
+    if preformat_dates:
+        for card in cards:
+            if card.get("date") is not None:
+                card["date"] = card["date"].strftime("%Y-%m-%d")
+    return {"causes": cards, "next_cursor": "MjAx"}
+
+
+def providers():
+    app = Flask(__name__)
+    found = {"flask": (DefaultJSONProvider(app), True),
+             "stdlib": (json_provider.FastJSONProvider(app, use_orjson=False), False)}
+    if json_provider.orjson is not None:
+        found["orjson"] = (json_provider.FastJSONProvider(app), False)
+    return app, found
+
+
+def measure(app, provider, obj, repeat):
+    times = []
+    with app.app_context():
+        body = provider.response(obj).get_data()
+        for _ in range(repeat):
+            started = time.perf_counter()
+            provider.response(obj)
+            times.append(time.perf_counter() - started)
+    return body, statistics.median(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Encode cost of /api/causes-shaped payloads per JSON provider.")
+    parser.add_argument("--sizes", default="50,200,20000", help="cards per payload, comma-separated")
+    parser.add_argument("--repeat", type=int, default=30, help="encodes per payload and provider")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    app, found = providers()
+    if "orjson" not in found:
+        print("orjson is not installed; comparing the stdlib paths only")
+
+    results = {}
+    for size in [int(s) for s in args.sizes.split(",")]:
+        rows = make_rows(size, args.seed)
+        reference = None
+        results[size] = {}
+        print(f"\n== {size} cards")
+        for name, (provider, preformat) in found.items():
+            body, ms = measure(app, provider, payload(rows, preformat), args.repeat)
+            decoded = json.loads(body)
+            if reference is None:
+                reference = decoded
+            elif decoded != reference:
+                raise SystemExit(f"{name} output differs from flask's for {size} cards")
+            baseline = results[size]["flask"]["median_ms"] if results[size] else ms
+            results[size][name] = {"median_ms": round(ms, 3), "bytes": len(body)}
+            print(f"   {name:<7} {ms:>9.3f} ms  {len(body):>10,} bytes  {baseline / ms:>5.1f}x")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"options": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
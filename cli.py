@@ -2,18 +2,19 @@
 import os
 from datetime import datetime
 from backend import db
+import backend.summary  # noqa: F401  (keeps cause_summary/user_summary in sync with writes below)
+import backend.rollups  # noqa: F401  (and donation_rollup)
 from backend.models import (
     AuthData, User, Cause, NGO, Event,
     AccountDetails, Donation, Feedback, Volunteer,
     UserContact, UserSocials, CauseContact, CauseSocials,
-    Location
+    Location, CauseSummary, UserSummary
 )
 from flask import Flask
 from flask_migrate import Migrate
 from flask_cors import CORS
 from flask_login import LoginManager
 from dotenv import load_dotenv
-from sqlalchemy import func
 
 load_dotenv()
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///app.db")
@@ -81,21 +82,21 @@ def advanced_queries():
     with app.app_context():
         print("\n=== Advanced SQLAlchemy Queries ===")
 
-        # Total donations per cause
+        # Total donations per cause (running totals, no GROUP BY scan)
         print("\n-- Total Donations per Cause --")
         totals = db.session.query(
-            Cause.name,
-            func.sum(Donation.amount).label("total_donated")
-        ).join(Donation, Donation.cause_id == Cause.cause_id).group_by(Cause.cause_id).all()
+            CauseSummary.name,
+            CauseSummary.donation_total
+        ).filter(CauseSummary.donation_count > 0).all()
         for name, total in totals:
             print(f"{name}: ${total}")
 
         # Average rating per cause
         print("\n-- Average Feedback Rating per Cause --")
         avg_ratings = db.session.query(
-            Cause.name,
-            func.avg(Feedback.rating).label("avg_rating")
-        ).join(Feedback, Feedback.cause_id == Cause.cause_id).group_by(Cause.cause_id).all()
+            CauseSummary.name,
+            (CauseSummary.rating_sum * 1.0 / CauseSummary.rating_count).label("avg_rating")
+        ).filter(CauseSummary.rating_count > 0).all()
         for name, avg in avg_ratings:
             print(f"{name}: {avg:.2f} stars")
 
@@ -103,8 +104,8 @@ def advanced_queries():
         print("\n-- Users and Number of Donations --")
         user_donations = db.session.query(
             User.name,
-            func.count(Donation.donation_id).label("donation_count")
-        ).join(Donation, Donation.user_id == User.user_id).group_by(User.user_id).all()
+            UserSummary.donation_count
+        ).join(UserSummary, UserSummary.user_id == User.user_id).filter(UserSummary.donation_count > 0).all()
         for name, count in user_donations:
             print(f"{name}: {count} donations")
 
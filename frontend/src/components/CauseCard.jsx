@@ -16,6 +16,13 @@ const CauseCard = ({ cause }) => {
       <h3>{cause.name}</h3>
       <p><strong>Type:</strong> {cause.type || "Unknown"}</p>
       <p><strong>Location:</strong> {cause.location || "Unknown"}</p>
+      {cause.stats && (
+        <p>
+          <strong>Raised:</strong> ${cause.stats.donation_total.toFixed(2)} ({cause.stats.donation_count})
+          {cause.stats.rating_average !== null && <> · <strong>Rating:</strong> {cause.stats.rating_average}</>}
+          {' · '}<strong>Volunteers:</strong> {cause.stats.volunteer_count}
+        </p>
+      )}
       <p>{cause.description}</p>
     </div>
   );
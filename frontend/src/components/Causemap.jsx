@@ -1,8 +1,9 @@
 // src/components/CauseMap.js
-import React from 'react';
-import { MapContainer, TileLayer, Marker, Popup } from 'react-leaflet';
+import React, { useEffect, useState } from 'react';
+import { MapContainer, TileLayer, Marker, Popup, useMapEvents } from 'react-leaflet';
 import 'leaflet/dist/leaflet.css';
 import L from 'leaflet';
+import { getCausesWithin, getNearestCauses } from '../services/causeService';
 
 // Fix for default marker icon in React Leaflet
 delete L.Icon.Default.prototype._getIconUrl;
@@ -12,26 +13,69 @@ L.Icon.Default.mergeOptions({
   shadowUrl: require('leaflet/dist/images/marker-shadow.png'),
 });
 
-const CauseMap = ({ causes }) => {
+const VIEWPORT_LIMIT = 500;
+
+// Causes are fetched for the visible viewport (/api/causes/within) and
+// refetched when the map moves, instead of loading every cause up front.
+// With `near` ({ lat, lng }) the map starts on the k nearest causes
+// (/api/causes/nearest) and shows their distance.
+const ViewportCauses = ({ near, k }) => {
+  const [causes, setCauses] = useState([]);
+
+  const map = useMapEvents({
+    moveend: () => loadViewport(),
+  });
+
+  async function loadViewport() {
+    try {
+      const data = await getCausesWithin(map.getBounds().toBBoxString(), VIEWPORT_LIMIT);
+      setCauses(data.causes);
+    } catch (err) {
+      console.error('Error fetching causes in viewport:', err);
+    }
+  }
+
+  async function loadNearest() {
+    try {
+      const data = await getNearestCauses(near.lat, near.lng, k);
+      setCauses(data.causes);
+      if (data.causes.length) {
+        const points = data.causes.map((c) => [c.latitude, c.longitude]);
+        map.fitBounds(L.latLngBounds([[near.lat, near.lng], ...points]), { padding: [20, 20] });
+      }
+    } catch (err) {
+      console.error('Error fetching nearest causes:', err);
+    }
+  }
+
+  useEffect(() => {
+    if (near) loadNearest();
+    else loadViewport();
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [near?.lat, near?.lng, k]);
+
+  return causes.map((cause) => (
+    <Marker key={cause.cause_id} position={[cause.latitude, cause.longitude]}>
+      <Popup>
+        <strong>{cause.name}</strong><br />
+        {cause.type.toUpperCase()}<br />
+        {cause.distance_km !== undefined && <>{cause.distance_km.toFixed(1)} km away<br /></>}
+        {cause.description}
+      </Popup>
+    </Marker>
+  ));
+};
+
+const CauseMap = ({ near = null, k = 10 }) => {
   return (
     <MapContainer center={[0, 0]} zoom={2} style={{ height: '600px', width: '100%' }}>
       <TileLayer
         url="https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png"
         attribution="&copy; OpenStreetMap contributors"
       />
-      {causes.map(cause =>
-        cause.locations?.map((loc, idx) => (
-          <Marker key={`${cause.cause_id}-${idx}`} position={[loc.latitude, loc.longitude]}>
-            <Popup>
-              <strong>{cause.name}</strong><br />
-              {cause.type.toUpperCase()}<br />
-              {cause.description}
-            </Popup>
-          </Marker>
-        ))
-      )}
+      <ViewportCauses near={near} k={k} />
     </MapContainer>
   );
 };
 
-export default CauseMap;
\ No newline at end of file
+export default CauseMap;
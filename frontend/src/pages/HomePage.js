@@ -1,44 +1,88 @@
 import React, { useEffect, useState } from "react";
-import { getAllCauses } from "../services/causeService";
+import { getAllCauses, getCauseClusters } from "../services/causeService";
 import { useNavigate } from "react-router-dom";
 import "./HomePage.css";
 import Header from "../components/Header";
 
 // import your map library (Leaflet)
-import { MapContainer, TileLayer, Marker, Popup } from "react-leaflet";
+import { MapContainer, TileLayer, Marker, Popup, useMapEvents } from "react-leaflet";
+import L from "leaflet";
 import "leaflet/dist/leaflet.css";
 
+// Markers come pre-clustered from the server for the visible viewport,
+// so the map only ever renders a bounded number of them.
+function ClusterLayer() {
+  const [clusters, setClusters] = useState([]);
+  const navigate = useNavigate();
+
+  const map = useMapEvents({
+    moveend: () => loadClusters(),
+  });
+
+  async function loadClusters() {
+    try {
+      const data = await getCauseClusters(map.getZoom(), map.getBounds().toBBoxString());
+      setClusters(data.clusters);
+    } catch (err) {
+      console.error("Error fetching clusters:", err);
+    }
+  }
+
+  useEffect(() => {
+    loadClusters();
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, []);
+
+  return clusters.map((cl) =>
+    cl.count === 1 ? (
+      <Marker
+        key={`c-${cl.cause_id}`}
+        position={[cl.latitude, cl.longitude]}
+        eventHandlers={{ click: () => navigate(`/cause/${cl.cause_id}`) }}
+      />
+    ) : (
+      <Marker
+        key={`g-${cl.latitude}-${cl.longitude}`}
+        position={[cl.latitude, cl.longitude]}
+        icon={L.divIcon({ className: "cluster-marker", html: `<span>${cl.count}</span>` })}
+        eventHandlers={{ click: () => map.setView([cl.latitude, cl.longitude], map.getZoom() + 2) }}
+      >
+        <Popup>{cl.count} causes</Popup>
+      </Marker>
+    )
+  );
+}
+
 export default function HomePage() {
   const [causes, setCauses] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [search, setSearch] = useState("");
   const [filter, setFilter] = useState("all");
   const navigate = useNavigate();
 
+  // Filtering and search happen on the server; refetch the first page
+  // whenever they change (search is debounced).
   useEffect(() => {
-    fetchCauses();
-  }, []);
+    const timer = setTimeout(() => fetchCauses(null), 250);
+    return () => clearTimeout(timer);
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [search, filter]);
 
-  async function fetchCauses() {
+  async function fetchCauses(cursor) {
     try {
-      const data = await getAllCauses();
-      setCauses(data.causes);
+      const params = {};
+      if (filter !== "all") params.type = filter;
+      if (search.trim()) params.q = search.trim();
+      if (cursor) params.cursor = cursor;
+
+      const data = await getAllCauses(params);
+      setCauses((prev) => (cursor ? [...prev, ...data.causes] : data.causes));
+      setNextCursor(data.next_cursor);
     } catch (err) {
       console.error("Error fetching causes:", err);
     }
   }
 
-  const filteredCauses = causes.filter((c) => {
-    const matchesFilter =
-      filter === "all" ||
-      (filter === "ngo" && c.type === "NGO") ||
-      (filter === "event" && c.type === "Event");
-
-    const searchText = (c.name + " " + c.description + " " + c.type).toLowerCase();
-    const matchesSearch = searchText.includes(search.toLowerCase());
-
-    return matchesFilter && matchesSearch;
-  });
-
   return (
     <div className="homepage-container">
       <Header />
@@ -80,26 +124,13 @@ export default function HomePage() {
         <div className="map-section">
           <MapContainer center={[20.5937, 78.9629]} zoom={4} scrollWheelZoom={true}>
             <TileLayer url="https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png" />
-
-            {filteredCauses.map((cause) => (
-              cause.latitude && cause.longitude ? (
-                <Marker
-                  key={cause.cause_id}
-                  position={[cause.latitude, cause.longitude]}
-                  eventHandlers={{
-                    click: () => navigate(`/cause/${cause.cause_id}`)
-                  }}
-                >
-                  <Popup>{cause.name}</Popup>
-                </Marker>
-              ) : null
-            ))}
+            <ClusterLayer />
           </MapContainer>
         </div>
 
         {/* Gallery Section */}
         <div className="cause-gallery">
-          {filteredCauses.map((cause) => (
+          {causes.map((cause) => (
             <div
               className="cause-card"
               key={cause.cause_id}
@@ -117,6 +148,12 @@ export default function HomePage() {
           ))}
         </div>
 
+        {nextCursor && (
+          <div className="filter-buttons">
+            <button onClick={() => fetchCauses(nextCursor)}>Load more</button>
+          </div>
+        )}
+
       </div>
     </div>
   );
@@ -1,11 +1,12 @@
 // src/services/causeService.js
 import api from "./api";
 
-// GET all verified causes (NGOs + Events)
-export const getAllCauses = async () => {
+// GET one page of verified causes (NGOs + Events)
+// params: { type: "ngo" | "event", q, limit, cursor }
+export const getAllCauses = async (params = {}) => {
   try {
-    const response = await api.get("/api/causes");
-    return response.data; // { causes: [...] }
+    const response = await api.get("/api/causes", { params });
+    return response.data; // { causes: [...], next_cursor }
   } catch (error) {
     console.error("Error fetching causes:", error);
     throw error.response?.data || { error: "Failed to fetch causes" };
@@ -21,4 +22,38 @@ export const getCauseById = async (cause_id) => {
     console.error(`Error fetching cause ${cause_id}:`, error);
     throw error.response?.data || { error: "Failed to fetch cause" };
   }
-};
\ No newline at end of file
+};
+
+// GET verified causes with a location inside the map viewport
+// bbox: Leaflet's map.getBounds().toBBoxString() ("west,south,east,north")
+export const getCausesWithin = async (bbox, limit) => {
+  try {
+    const response = await api.get("/api/causes/within", { params: { bbox, limit } });
+    return response.data; // { causes: [...] }
+  } catch (error) {
+    console.error("Error fetching causes in viewport:", error);
+    throw error.response?.data || { error: "Failed to fetch causes" };
+  }
+};
+
+// GET the k verified causes nearest to a point
+export const getNearestCauses = async (lat, lng, k = 10) => {
+  try {
+    const response = await api.get("/api/causes/nearest", { params: { lat, lng, k } });
+    return response.data; // { causes: [... with distance_km] }
+  } catch (error) {
+    console.error("Error fetching nearest causes:", error);
+    throw error.response?.data || { error: "Failed to fetch causes" };
+  }
+};
+
+// GET pre-aggregated map clusters for a zoom level and viewport
+export const getCauseClusters = async (zoom, bbox) => {
+  try {
+    const response = await api.get("/api/causes/clusters", { params: { zoom, bbox } });
+    return response.data; // { zoom, cell_size, clusters: [{ latitude, longitude, count, cause_id }] }
+  } catch (error) {
+    console.error("Error fetching map clusters:", error);
+    throw error.response?.data || { error: "Failed to fetch clusters" };
+  }
+};
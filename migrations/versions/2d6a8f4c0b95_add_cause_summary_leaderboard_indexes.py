@@ -0,0 +1,35 @@
+"""Add cause_summary.rating_avg and leaderboard indexes
+
+Revision ID: 2d6a8f4c0b95
+Revises: 7b2e9c5d1a84
+Create Date: 2026-10-18 20:04:38.117562
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2d6a8f4c0b95'
+down_revision = '7b2e9c5d1a84'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('cause_summary', sa.Column('rating_avg', sa.Float(), nullable=True))
+    op.execute('UPDATE cause_summary SET rating_avg = rating_sum * 1.0 / rating_count WHERE rating_count > 0')
+
+    op.create_index('ix_cause_summary_top_donations', 'cause_summary',
+                    ['verified', sa.text('donation_total DESC'), 'cause_id'], unique=False)
+    op.create_index('ix_cause_summary_top_rating', 'cause_summary',
+                    ['verified', sa.text('rating_avg DESC'), sa.text('rating_count DESC'), 'cause_id'], unique=False)
+    op.create_index('ix_cause_summary_top_volunteers', 'cause_summary',
+                    ['verified', sa.text('volunteer_count DESC'), 'cause_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_cause_summary_top_volunteers', table_name='cause_summary')
+    op.drop_index('ix_cause_summary_top_rating', table_name='cause_summary')
+    op.drop_index('ix_cause_summary_top_donations', table_name='cause_summary')
+    op.drop_column('cause_summary', 'rating_avg')
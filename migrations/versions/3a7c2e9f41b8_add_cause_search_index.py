@@ -0,0 +1,76 @@
+"""Add full-text search index over cause name and description
+
+Revision ID: 3a7c2e9f41b8
+Revises: fed30a1bc915
+Create Date: 2026-10-18 09:12:40.118203
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '3a7c2e9f41b8'
+down_revision = 'fed30a1bc915'
+branch_labels = None
+depends_on = None
+
+# Kept in step with backend/search.py; migrations must not import app code
+# whose definitions may change after this revision.
+SQLITE_UPGRADE = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS cause_fts USING fts5(
+        name, description,
+        content='cause', content_rowid='cause_id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS cause_fts_ai AFTER INSERT ON cause BEGIN
+        INSERT INTO cause_fts(rowid, name, description)
+        VALUES (new.cause_id, new.name, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS cause_fts_ad AFTER DELETE ON cause BEGIN
+        INSERT INTO cause_fts(cause_fts, rowid, name, description)
+        VALUES ('delete', old.cause_id, old.name, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS cause_fts_au AFTER UPDATE OF name, description ON cause BEGIN
+        INSERT INTO cause_fts(cause_fts, rowid, name, description)
+        VALUES ('delete', old.cause_id, old.name, old.description);
+        INSERT INTO cause_fts(rowid, name, description)
+        VALUES (new.cause_id, new.name, new.description);
+    END""",
+    # Backfill existing rows
+    "INSERT INTO cause_fts(cause_fts) VALUES ('rebuild')",
+]
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS cause_fts_au",
+    "DROP TRIGGER IF EXISTS cause_fts_ad",
+    "DROP TRIGGER IF EXISTS cause_fts_ai",
+    "DROP TABLE IF EXISTS cause_fts",
+]
+
+PG_UPGRADE = [
+    """CREATE INDEX IF NOT EXISTS ix_cause_search ON cause USING GIN ((
+        setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    ))""",
+]
+PG_DOWNGRADE = ["DROP INDEX IF EXISTS ix_cause_search"]
+
+
+def _run(statements):
+    for stmt in statements:
+        op.execute(stmt)
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        _run(SQLITE_UPGRADE)
+    elif dialect == 'postgresql':
+        _run(PG_UPGRADE)
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        _run(SQLITE_DOWNGRADE)
+    elif dialect == 'postgresql':
+        _run(PG_DOWNGRADE)
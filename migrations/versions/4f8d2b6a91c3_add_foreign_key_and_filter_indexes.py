@@ -0,0 +1,57 @@
+"""Add indexes for foreign keys and filter columns
+
+Revision ID: 4f8d2b6a91c3
+Revises: e27a9c4b8f16
+Create Date: 2026-10-18 13:55:41.682035
+
+Query plans before/after: benchmarks/index_query_plans.py
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '4f8d2b6a91c3'
+down_revision = 'e27a9c4b8f16'
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns)
+INDEXES = [
+    ('ix_auth_data_fk_id', 'auth_data', ['fk_id']),
+    ('ix_cause_user_id', 'cause', ['user_id']),
+    ('ix_cause_verified_cause_id', 'cause', ['verified', 'cause_id']),
+    ('ix_event_cause_id', 'event', ['cause_id']),
+    ('ix_event_ngo_id', 'event', ['ngo_id']),
+    ('ix_location_cause_id', 'location', ['cause_id']),
+    ('ix_account_details_user_id', 'account_details', ['user_id']),
+    ('ix_account_details_cause_id', 'account_details', ['cause_id']),
+    ('ix_feedback_cause_id_feedback_id', 'feedback', ['cause_id', 'feedback_id']),
+    ('ix_feedback_cause_id_rating', 'feedback', ['cause_id', 'rating']),
+    ('ix_feedback_user_id', 'feedback', ['user_id']),
+    ('ix_donation_cause_id_amount', 'donation', ['cause_id', 'amount']),
+    ('ix_donation_user_id_amount', 'donation', ['user_id', 'amount']),
+    ('ix_volunteer_cause_id', 'volunteer', ['cause_id']),
+    ('ix_volunteer_user_id', 'volunteer', ['user_id']),
+    ('ix_user_contact_user_id', 'user_contact', ['user_id']),
+    ('ix_user_socials_user_id', 'user_socials', ['user_id']),
+    ('ix_cause_contact_cause_id', 'cause_contact', ['cause_id']),
+    ('ix_cause_socials_cause_id', 'cause_socials', ['cause_id']),
+]
+
+
+def upgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        # Build without blocking writes on large, live tables.
+        with op.get_context().autocommit_block():
+            for name, table, columns in INDEXES:
+                op.create_index(name, table, columns, unique=False,
+                                postgresql_concurrently=True)
+        return
+
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,24 @@
+"""Add delete_job.heartbeat_at
+
+Revision ID: 5c8e1a7d3f62
+Revises: 2d6a8f4c0b95
+Create Date: 2026-10-19 09:12:44.402117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c8e1a7d3f62'
+down_revision = '2d6a8f4c0b95'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('delete_job', sa.Column('heartbeat_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('delete_job', 'heartbeat_at')
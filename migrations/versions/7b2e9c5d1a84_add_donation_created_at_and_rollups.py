@@ -0,0 +1,39 @@
+"""Add donation.created_at and donation_rollup
+
+Revision ID: 7b2e9c5d1a84
+Revises: f3b7d2a94e60
+Create Date: 2026-10-18 19:31:12.448301
+
+Existing donations keep created_at NULL and stay out of the rollups.
+Build the rollups after upgrading with:  flask backfill-donation-rollups
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7b2e9c5d1a84'
+down_revision = 'f3b7d2a94e60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('donation', sa.Column('created_at', sa.DateTime(), nullable=True))
+
+    op.create_table('donation_rollup',
+    sa.Column('cause_id', sa.Integer(), nullable=False),
+    sa.Column('granularity', sa.String(length=5), nullable=False),
+    sa.Column('bucket', sa.Date(), nullable=False),
+    sa.Column('amount_total', sa.Float(), nullable=False),
+    sa.Column('donation_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['cause_id'], ['cause.cause_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('cause_id', 'granularity', 'bucket')
+    )
+    op.create_index('ix_donation_rollup_granularity_bucket', 'donation_rollup', ['granularity', 'bucket'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_donation_rollup_granularity_bucket', table_name='donation_rollup')
+    op.drop_table('donation_rollup')
+    op.drop_column('donation', 'created_at')
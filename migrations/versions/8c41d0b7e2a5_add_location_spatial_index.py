@@ -0,0 +1,60 @@
+"""Add spatial index over location coordinates
+
+Revision ID: 8c41d0b7e2a5
+Revises: 3a7c2e9f41b8
+Create Date: 2026-10-18 10:03:17.502846
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8c41d0b7e2a5'
+down_revision = '3a7c2e9f41b8'
+branch_labels = None
+depends_on = None
+
+# Kept in step with backend/geo.py.
+SQLITE_UPGRADE = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS location_rtree USING rtree(
+        id, min_lat, max_lat, min_lng, max_lng
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS location_rtree_ai AFTER INSERT ON location
+    WHEN new.latitude IS NOT NULL AND new.longitude IS NOT NULL BEGIN
+        INSERT INTO location_rtree VALUES
+            (new.loc_id, new.latitude, new.latitude, new.longitude, new.longitude);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS location_rtree_ad AFTER DELETE ON location BEGIN
+        DELETE FROM location_rtree WHERE id = old.loc_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS location_rtree_au AFTER UPDATE OF latitude, longitude ON location BEGIN
+        DELETE FROM location_rtree WHERE id = old.loc_id;
+        INSERT INTO location_rtree
+            SELECT new.loc_id, new.latitude, new.latitude, new.longitude, new.longitude
+            WHERE new.latitude IS NOT NULL AND new.longitude IS NOT NULL;
+    END""",
+    # Backfill existing rows
+    """INSERT INTO location_rtree
+        SELECT loc_id, latitude, latitude, longitude, longitude FROM location
+        WHERE latitude IS NOT NULL AND longitude IS NOT NULL""",
+]
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS location_rtree_au",
+    "DROP TRIGGER IF EXISTS location_rtree_ad",
+    "DROP TRIGGER IF EXISTS location_rtree_ai",
+    "DROP TABLE IF EXISTS location_rtree",
+]
+
+
+def upgrade():
+    op.create_index('ix_location_lat_lng', 'location', ['latitude', 'longitude'], unique=False)
+    if op.get_bind().dialect.name == 'sqlite':
+        for stmt in SQLITE_UPGRADE:
+            op.execute(stmt)
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'sqlite':
+        for stmt in SQLITE_DOWNGRADE:
+            op.execute(stmt)
+    op.drop_index('ix_location_lat_lng', table_name='location')
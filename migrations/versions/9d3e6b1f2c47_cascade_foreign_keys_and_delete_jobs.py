@@ -0,0 +1,88 @@
+"""ON DELETE CASCADE foreign keys and delete_job table
+
+Revision ID: 9d3e6b1f2c47
+Revises: 4f8d2b6a91c3
+Create Date: 2026-10-18 16:40:12.503918
+
+Deletes are pushed down to the database, so every foreign key to a
+parent row must carry its ON DELETE action. PostgreSQL constraints are
+recreated in place. SQLite cannot alter constraints, and rebuilding the
+tables here would drop the search/R*Tree triggers (and, with foreign keys
+on, cascade through the copy). SQLite databases created from the models
+already have the actions.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d3e6b1f2c47'
+down_revision = '4f8d2b6a91c3'
+branch_labels = None
+depends_on = None
+
+# (table, column, referred table, referred column, ondelete)
+FOREIGN_KEYS = [
+    ('app_user', 'auth_id', 'auth_data', 'id', 'CASCADE'),
+    ('cause', 'user_id', 'app_user', 'user_id', 'CASCADE'),
+    ('cause', 'auth_id', 'auth_data', 'id', 'CASCADE'),
+    ('ngo', 'cause_id', 'cause', 'cause_id', 'CASCADE'),
+    ('event', 'cause_id', 'cause', 'cause_id', 'CASCADE'),
+    ('event', 'ngo_id', 'ngo', 'ngo_id', 'SET NULL'),
+    ('location', 'cause_id', 'cause', 'cause_id', 'CASCADE'),
+    ('account_details', 'user_id', 'app_user', 'user_id', 'CASCADE'),
+    ('account_details', 'cause_id', 'cause', 'cause_id', 'CASCADE'),
+    ('feedback', 'cause_id', 'cause', 'cause_id', 'CASCADE'),
+    ('feedback', 'user_id', 'app_user', 'user_id', 'CASCADE'),
+    ('donation', 'user_id', 'app_user', 'user_id', 'CASCADE'),
+    ('donation', 'cause_id', 'cause', 'cause_id', 'CASCADE'),
+    ('volunteer', 'user_id', 'app_user', 'user_id', 'CASCADE'),
+    ('volunteer', 'cause_id', 'cause', 'cause_id', 'CASCADE'),
+    ('user_contact', 'user_id', 'app_user', 'user_id', 'CASCADE'),
+    ('user_socials', 'user_id', 'app_user', 'user_id', 'CASCADE'),
+    ('cause_contact', 'cause_id', 'cause', 'cause_id', 'CASCADE'),
+    ('cause_socials', 'cause_id', 'cause', 'cause_id', 'CASCADE'),
+]
+
+
+def _set_ondelete(actions):
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+    for table, column, referred, referred_column, _ in FOREIGN_KEYS:
+        if table not in tables:
+            continue
+        ondelete = actions(table, column)
+        for fk in inspector.get_foreign_keys(table):
+            if fk['constrained_columns'] != [column] or fk['referred_table'] != referred:
+                continue
+            if (fk.get('options') or {}).get('ondelete') == ondelete:
+                continue
+            name = fk['name'] or f'{table}_{column}_fkey'
+            op.drop_constraint(name, table, type_='foreignkey')
+            op.create_foreign_key(name, table, referred, [column], [referred_column],
+                                  ondelete=ondelete)
+
+
+def upgrade():
+    op.create_table('delete_job',
+    sa.Column('job_id', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(length=10), nullable=False),
+    sa.Column('target_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=10), nullable=False),
+    sa.Column('rows_deleted', sa.Integer(), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('job_id')
+    )
+
+    if op.get_bind().dialect.name == 'postgresql':
+        actions = {(t, c): a for t, c, _, _, a in FOREIGN_KEYS}
+        _set_ondelete(lambda table, column: actions[(table, column)])
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        _set_ondelete(lambda table, column: None)
+
+    op.drop_table('delete_job')
@@ -0,0 +1,29 @@
+"""Add change_version table for ETags
+
+Revision ID: b5e19f3c7d20
+Revises: 8c41d0b7e2a5
+Create Date: 2026-10-18 11:26:52.734190
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b5e19f3c7d20'
+down_revision = '8c41d0b7e2a5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('change_version',
+    sa.Column('scope', sa.String(length=64), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('scope')
+    )
+
+
+def downgrade():
+    op.drop_table('change_version')
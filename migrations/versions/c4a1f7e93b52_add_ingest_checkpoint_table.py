@@ -0,0 +1,28 @@
+"""Add ingest_checkpoint table for the write-behind queue
+
+Revision ID: c4a1f7e93b52
+Revises: 9d3e6b1f2c47
+Create Date: 2026-10-18 17:58:03.219467
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4a1f7e93b52'
+down_revision = '9d3e6b1f2c47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('ingest_checkpoint',
+    sa.Column('queue_id', sa.String(length=36), nullable=False),
+    sa.Column('last_id', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('queue_id')
+    )
+
+
+def downgrade():
+    op.drop_table('ingest_checkpoint')
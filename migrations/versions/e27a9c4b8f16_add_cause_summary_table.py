@@ -0,0 +1,49 @@
+"""Add cause_summary read model
+
+Revision ID: e27a9c4b8f16
+Revises: b5e19f3c7d20
+Create Date: 2026-10-18 12:40:05.219874
+
+Backfill after upgrading with:  flask rebuild-cause-summary
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e27a9c4b8f16'
+down_revision = 'b5e19f3c7d20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('cause_summary',
+    sa.Column('cause_id', sa.Integer(), nullable=False),
+    sa.Column('verified', sa.Boolean(), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('logo', sa.String(length=255), nullable=True),
+    sa.Column('type', sa.String(length=10), nullable=False),
+    sa.Column('year_est', sa.Integer(), nullable=True),
+    sa.Column('age', sa.Integer(), nullable=True),
+    sa.Column('date', sa.Date(), nullable=True),
+    sa.Column('time', sa.Time(), nullable=True),
+    sa.Column('capacity', sa.Integer(), nullable=True),
+    sa.Column('latitude', sa.Float(), nullable=True),
+    sa.Column('longitude', sa.Float(), nullable=True),
+    sa.Column('contacts', sa.Text(), nullable=False),
+    sa.Column('socials', sa.Text(), nullable=False),
+    sa.Column('donation_total', sa.Float(), nullable=False),
+    sa.Column('donation_count', sa.Integer(), nullable=False),
+    sa.Column('rating_sum', sa.Integer(), nullable=False),
+    sa.Column('rating_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['cause_id'], ['cause.cause_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('cause_id')
+    )
+    op.create_index('ix_cause_summary_verified_type', 'cause_summary', ['verified', 'type', 'cause_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_cause_summary_verified_type', table_name='cause_summary')
+    op.drop_table('cause_summary')
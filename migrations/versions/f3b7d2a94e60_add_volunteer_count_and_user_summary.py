@@ -0,0 +1,38 @@
+"""Add cause_summary.volunteer_count and user_summary
+
+Revision ID: f3b7d2a94e60
+Revises: a82f5c3e6d19
+Create Date: 2026-10-18 18:52:31.604127
+
+Backfill after upgrading with:  flask reconcile-summaries
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b7d2a94e60'
+down_revision = 'a82f5c3e6d19'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('cause_summary', sa.Column('volunteer_count', sa.Integer(), nullable=False, server_default='0'))
+
+    op.create_table('user_summary',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('donation_total', sa.Float(), nullable=False),
+    sa.Column('donation_count', sa.Integer(), nullable=False),
+    sa.Column('rating_sum', sa.Integer(), nullable=False),
+    sa.Column('rating_count', sa.Integer(), nullable=False),
+    sa.Column('volunteer_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['app_user.user_id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade():
+    op.drop_table('user_summary')
+
+    op.drop_column('cause_summary', 'volunteer_count')
@@ -1,12 +1,25 @@
 # populate.py
+#
+#   python populate.py                      # small hand-written sample
+#   python populate.py --users 1e6 --causes 1e5 --donations 1e7 --seed 7
+#
+# The second form generates a synthetic dataset for capacity testing with
+# bulk Core inserts (see generate_dataset below).
+import argparse
+import itertools
+import random
+import time as timer
+from datetime import datetime, date, time, timedelta
+
+from sqlalchemy import text
+
 from server import create_app
-from backend import db
+from backend import db, rollups, summary
 from backend.models import (
     User, Cause, NGO, Event, Location, AccountDetails,
     Donation, Feedback, Volunteer, UserContact, UserSocials,
     CauseContact, CauseSocials, AuthData
 )
-from datetime import datetime
 
 def populate_database():
     app = create_app()
@@ -124,6 +137,250 @@ def populate_database():
         db.session.commit()
         print("All sample data populated successfully.")
 
+# ============================================================
+#              SYNTHETIC LARGE-DATASET GENERATOR
+# ============================================================
+# (name, country, latitude, longitude, relative size)
+CITIES = [
+    ("Mumbai", "India", 19.0760, 72.8777, 10), ("Delhi", "India", 28.7041, 77.1025, 10),
+    ("Karachi", "Pakistan", 24.8607, 67.0011, 8), ("Lahore", "Pakistan", 31.5204, 74.3587, 6),
+    ("Dhaka", "Bangladesh", 23.8103, 90.4125, 8), ("Nairobi", "Kenya", -1.2921, 36.8219, 4),
+    ("Lagos", "Nigeria", 6.5244, 3.3792, 7), ("Cairo", "Egypt", 30.0444, 31.2357, 6),
+    ("Istanbul", "Turkey", 41.0082, 28.9784, 6), ("London", "UK", 51.5074, -0.1278, 5),
+    ("New York", "USA", 40.7128, -74.0060, 6), ("Sao Paulo", "Brazil", -23.5505, -46.6333, 6),
+    ("Mexico City", "Mexico", 19.4326, -99.1332, 6), ("Jakarta", "Indonesia", -6.2088, 106.8456, 7),
+    ("Manila", "Philippines", 14.5995, 120.9842, 5), ("Tokyo", "Japan", 35.6762, 139.6503, 4),
+    ("Sydney", "Australia", -33.8688, 151.2093, 2), ("Johannesburg", "South Africa", -26.2041, 28.0473, 3),
+]
+CAUSE_WORDS = [
+    "Clean", "Water", "Food", "Shelter", "Education", "Health", "Animal", "Rescue",
+    "Ocean", "Forest", "Literacy", "Refugee", "Youth", "Elderly", "Climate", "Relief",
+    "Community", "Kitchen", "Clinic", "Library", "Beach", "River", "Orphan", "Women",
+]
+SHARED_PASSWORD = "password"
+
+
+def _count(value):
+    """Accept counts like 1e6 or 100000."""
+    return int(float(value))
+
+
+def _zipf_cum_weights(n, s=1.1):
+    total, cum = 0.0, []
+    for rank in range(1, n + 1):
+        total += 1.0 / rank ** s
+        cum.append(total)
+    return cum
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _bulk_insert(conn, table, rows, batch_size, label):
+    started, total = timer.perf_counter(), 0
+    for chunk in _chunks(rows, batch_size):
+        with conn.begin():
+            conn.execute(table.insert(), chunk)
+        total += len(chunk)
+    elapsed = timer.perf_counter() - started
+    print(f"  {label:<14} {total:>12,} rows  {elapsed:7.1f}s  ({total / max(elapsed, 1e-9):,.0f} rows/s)")
+
+
+def generate_dataset(users, causes, donations, feedback=None, volunteers=None,
+                     seed=None, batch_size=50000):
+    """Reset the database and fill it with a skewed, realistic dataset.
+
+    - popularity of causes (donations, feedback, volunteers) follows a Zipf
+      law over a shuffled ranking, activity per user is skewed as well,
+    - coordinates cluster around a weighted list of cities,
+    - ~60% of causes are NGOs, the rest Events (some run by an NGO),
+    - every generated user logs in with the password "password".
+    """
+    feedback = donations // 5 if feedback is None else feedback
+    volunteers = donations // 10 if volunteers is None else volunteers
+    rng = random.Random(seed)
+
+    app = create_app()
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        print(f"Database reset. Generating {users:,} users, {causes:,} causes, "
+              f"{donations:,} donations, {feedback:,} feedback, {volunteers:,} volunteers.")
+
+        # One hash for everyone: hashing millions of passwords would dominate the load.
+        template = AuthData(name="template", role="user")
+        template.set_password(SHARED_PASSWORD)
+        password_hash = template.password_hash
+        admin = AuthData(name="admin", role="admin", verified=True)
+        admin.set_password("admin123")
+
+        # Who is popular: cause/user ids shuffled, weights by Zipf rank.
+        cause_ranking = list(range(1, causes + 1))
+        rng.shuffle(cause_ranking)
+        cause_weights = _zipf_cum_weights(causes)
+        user_ranking = list(range(1, users + 1))
+        rng.shuffle(user_ranking)
+        user_weights = _zipf_cum_weights(users, s=0.8)
+
+        def pick_causes(k):
+            return rng.choices(cause_ranking, cum_weights=cause_weights, k=k)
+
+        def pick_users(k):
+            return rng.choices(user_ranking, cum_weights=user_weights, k=k)
+
+        verified_user = [False] + [rng.random() < 0.9 for _ in range(users)]
+        is_ngo = [False] + [rng.random() < 0.6 for _ in range(causes)]
+        ngo_ids = {}
+        city_weights = [c[4] for c in CITIES]
+        started = timer.perf_counter()
+
+        with db.engine.connect() as conn:
+            if conn.dialect.name == "sqlite":
+                # On the driver connection: SQLAlchemy would wrap these in
+                # BEGIN, and the safety level cannot change in a transaction.
+                raw = conn.connection.dbapi_connection
+                raw.execute("PRAGMA synchronous=OFF")
+                raw.execute("PRAGMA cache_size=-200000")
+
+            with conn.begin():
+                conn.execute(AuthData.__table__.insert(), [{
+                    "id": 0, "name": "admin", "role": "admin", "verified": True,
+                    "password_hash": admin.password_hash, "fk_id": None
+                }])
+
+            _bulk_insert(conn, AuthData.__table__, ({
+                "id": i, "name": f"user{i}", "role": "user", "verified": verified_user[i],
+                "password_hash": password_hash, "fk_id": i
+            } for i in range(1, users + 1)), batch_size, "auth_data")
+
+            _bulk_insert(conn, User.__table__, ({
+                "user_id": i, "name": f"User {i}", "email": f"user{i}@example.org",
+                "age": rng.randint(16, 80), "verified": verified_user[i], "auth_id": i
+            } for i in range(1, users + 1)), batch_size, "app_user")
+
+            def cause_rows():
+                for i in range(1, causes + 1):
+                    words = rng.sample(CAUSE_WORDS, 3)
+                    yield {
+                        "cause_id": i,
+                        "name": f"{words[0]} {words[1]} {'Foundation' if is_ngo[i] else 'Drive'} {i}",
+                        "description": f"{words[0]} and {words[2].lower()} work run by volunteers.",
+                        "email": f"cause{i}@example.org",
+                        "if_online": rng.random() < 0.2,
+                        "verified": rng.random() < 0.9,
+                        "user_id": rng.randint(1, users),
+                    }
+            _bulk_insert(conn, Cause.__table__, cause_rows(), batch_size, "cause")
+
+            def ngo_rows():
+                for i in range(1, causes + 1):
+                    if is_ngo[i]:
+                        ngo_ids[i] = len(ngo_ids) + 1
+                        year = rng.randint(1950, 2024)
+                        yield {"ngo_id": ngo_ids[i], "cause_id": i, "year_est": year, "age": 2025 - year}
+            _bulk_insert(conn, NGO.__table__, ngo_rows(), batch_size, "ngo")
+
+            ngo_list = list(ngo_ids.values())
+            _bulk_insert(conn, Event.__table__, ({
+                "cause_id": i,
+                "capacity": rng.choice((20, 50, 100, 250, 1000)),
+                "date": date(2025, 1, 1) + timedelta(days=rng.randint(0, 730)),
+                "time": time(rng.randint(7, 20), rng.choice((0, 30))),
+                "ngo_id": rng.choice(ngo_list) if ngo_list and rng.random() < 0.3 else None,
+            } for i in range(1, causes + 1) if not is_ngo[i]), batch_size, "event")
+
+            def location_rows():
+                for i in range(1, causes + 1):
+                    for _ in range(1 + (rng.random() < 0.2) + (rng.random() < 0.05)):
+                        city, country, lat, lng, _ = rng.choices(CITIES, weights=city_weights)[0]
+                        spread = 0.05 + 0.25 * rng.random()
+                        yield {
+                            "cause_id": i, "country": country, "city": city,
+                            "latitude": max(-90.0, min(90.0, rng.gauss(lat, spread))),
+                            "longitude": max(-180.0, min(180.0, rng.gauss(lng, spread))),
+                            "address": f"{rng.randint(1, 999)} Main Road",
+                            "contact_no": f"+{rng.randint(10**9, 10**10 - 1)}",
+                        }
+            _bulk_insert(conn, Location.__table__, location_rows(), batch_size, "location")
+
+            _bulk_insert(conn, CauseContact.__table__, (
+                {"cause_id": i, "contact": f"+{rng.randint(10**9, 10**10 - 1)}"}
+                for i in range(1, causes + 1)), batch_size, "cause_contact")
+            _bulk_insert(conn, CauseSocials.__table__, (
+                {"cause_id": i, "social": f"@cause{i}"}
+                for i in range(1, causes + 1) if rng.random() < 0.7), batch_size, "cause_socials")
+
+            def activity_rows(total, make):
+                for chunk_start in range(0, total, batch_size):
+                    k = min(batch_size, total - chunk_start)
+                    for user_id, cause_id in zip(pick_users(k), pick_causes(k)):
+                        yield make(user_id, cause_id)
+
+            now = datetime.utcnow()
+            _bulk_insert(conn, Donation.__table__, activity_rows(donations, lambda u, c: {
+                "user_id": u, "cause_id": c,
+                "amount": round(min(rng.lognormvariate(3.5, 1.0), 100000), 2),
+                # Spread over the last year, denser towards today.
+                "created_at": now - timedelta(seconds=365 * 86400 * rng.random() ** 1.5),
+            }), batch_size, "donation")
+            _bulk_insert(conn, Feedback.__table__, activity_rows(feedback, lambda u, c: {
+                "user_id": u, "cause_id": c,
+                "rating": rng.choices((1, 2, 3, 4, 5), weights=(4, 4, 10, 30, 52))[0],
+                "comment": rng.choice(("Great work!", "Well organised.", "Could communicate better.",
+                                       "Changed lives in our area.", "Keep it up!")),
+            }), batch_size, "feedback")
+            _bulk_insert(conn, Volunteer.__table__, activity_rows(
+                volunteers, lambda u, c: {"user_id": u, "cause_id": c}), batch_size, "volunteer")
+
+            if conn.dialect.name == "postgresql":
+                # Explicit ids were inserted; move the sequences past them.
+                with conn.begin():
+                    for table, pk in (("auth_data", "id"), ("app_user", "user_id"), ("cause", "cause_id"),
+                                      ("ngo", "ngo_id")):
+                        conn.execute(text(
+                            f"SELECT setval(pg_get_serial_sequence('{table}', '{pk}'), "
+                            f"(SELECT COALESCE(MAX({pk}), 1) FROM {table}))"
+                        ))
+
+        print("  rebuilding cause_summary ...")
+        summary.rebuild(db.session, batch_size=5000)
+        print("  building donation_rollup ...")
+        rollups.backfill(db.session, batch_size=batch_size)
+        print(f"Done in {timer.perf_counter() - started:.1f}s.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Populate the database.")
+    parser.add_argument("--users", type=_count, help="e.g. 1e6; omit all sizes for the small sample")
+    parser.add_argument("--causes", type=_count)
+    parser.add_argument("--donations", type=_count)
+    parser.add_argument("--feedback", type=_count, help="default: donations / 5")
+    parser.add_argument("--volunteers", type=_count, help="default: donations / 10")
+    parser.add_argument("--seed", type=int, help="make the dataset reproducible")
+    parser.add_argument("--batch-size", type=_count, default=50000, help="rows per transaction")
+    args = parser.parse_args()
+
+    if args.users is None and args.causes is None and args.donations is None:
+        populate_database()
+        return
+
+    generate_dataset(
+        users=args.users or 1000,
+        causes=args.causes or 100,
+        donations=args.donations or 0,
+        feedback=args.feedback,
+        volunteers=args.volunteers,
+        seed=args.seed,
+        batch_size=args.batch_size,
+    )
+
+
 if __name__ == "__main__":
-    populate_database()
+    main()
 
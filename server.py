@@ -6,8 +6,9 @@ from flask_migrate import Migrate
 from dotenv import load_dotenv
 from flask_login import LoginManager
 
-from backend import db 
+from backend import db, cache, metrics, hasher, ingest, json_provider
 from backend.routes import main
+from backend.commands import register_commands
 
 load_dotenv()
 
@@ -31,12 +32,56 @@ def create_app():
     app.config["SESSION_COOKIE_SECURE"] = False   # True only for HTTPS
     app.config["SESSION_COOKIE_HTTPONLY"] = True
 
+    # RESPONSE CACHE CONFIG (memory | redis | none)
+    app.config["CACHE_BACKEND"] = os.getenv("CACHE_BACKEND", "memory")
+    app.config["CACHE_DEFAULT_TTL"] = int(os.getenv("CACHE_DEFAULT_TTL", "60"))
+    app.config["CACHE_MAX_ENTRIES"] = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+    app.config["CACHE_REDIS_URL"] = os.getenv("CACHE_REDIS_URL")
+
+    # JSON ENCODER (auto | orjson | stdlib; auto uses orjson when installed)
+    app.config["JSON_PROVIDER"] = os.getenv("JSON_PROVIDER", "auto")
+
+    # REQUEST METRICS (query counts, DB/serialization time, Server-Timing)
+    app.config["METRICS_ENABLED"] = os.getenv("METRICS_ENABLED", "0") == "1"
+    app.config["METRICS_SLOW_QUERY_MS"] = float(os.getenv("METRICS_SLOW_QUERY_MS", "100"))
+    app.config["METRICS_LOG_REQUESTS"] = os.getenv("METRICS_LOG_REQUESTS", "1") == "1"
+
+    # PASSWORD HASHING (process pool; PASSWORD_HASH_WORKERS=0 hashes inline)
+    app.config["PASSWORD_HASH_METHOD"] = os.getenv("PASSWORD_HASH_METHOD", "pbkdf2:sha256")
+    app.config["PASSWORD_SALT_LENGTH"] = int(os.getenv("PASSWORD_SALT_LENGTH", "16"))
+    app.config["PASSWORD_HASH_WORKERS"] = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    app.config["PASSWORD_HASH_QUEUE_LIMIT"] = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", "8"))
+    app.config["PASSWORD_HASH_TIMEOUT"] = float(os.getenv("PASSWORD_HASH_TIMEOUT", "10"))
+
+    # DELETES: above this many dependent rows, run as a chunked background job
+    app.config["DELETE_JOB_THRESHOLD"] = int(os.getenv("DELETE_JOB_THRESHOLD", "10000"))
+    app.config["DELETE_JOB_CHUNK_SIZE"] = int(os.getenv("DELETE_JOB_CHUNK_SIZE", "2000"))
+    # ...and a job with no progress for this long is orphaned and may be taken over
+    app.config["DELETE_JOB_STALE_SECONDS"] = int(os.getenv("DELETE_JOB_STALE_SECONDS", "600"))
+
+    # WRITE-BEHIND INGESTION for donate/feedback/volunteer (off by default)
+    app.config["INGEST_ENABLED"] = os.getenv("INGEST_ENABLED", "0") == "1"
+    app.config["INGEST_QUEUE_PATH"] = os.getenv("INGEST_QUEUE_PATH")   # default: instance/ingest_queue.sqlite3
+    app.config["INGEST_FLUSH_INTERVAL"] = float(os.getenv("INGEST_FLUSH_INTERVAL", "1.0"))
+    app.config["INGEST_BATCH_SIZE"] = int(os.getenv("INGEST_BATCH_SIZE", "1000"))
+    app.config["INGEST_MAX_PENDING"] = int(os.getenv("INGEST_MAX_PENDING", "100000"))
+
+    # IDEMPOTENCY-KEY on donate/feedback/volunteer (seconds a key is remembered)
+    app.config["IDEMPOTENCY_TTL"] = int(os.getenv("IDEMPOTENCY_TTL", "86400"))
+    # seconds before a key left pending by a crashed request can be claimed again
+    app.config["IDEMPOTENCY_LEASE"] = int(os.getenv("IDEMPOTENCY_LEASE", "120"))
+
     # --------------------
     # INIT EXTENSIONS
     # --------------------
     db.init_app(app)
     migrate.init_app(app, db)
     login_manager.init_app(app)
+    cache.init_app(app)
+    json_provider.init_app(app)
+    metrics.init_app(app, db)
+    hasher.init_app(app)
+    ingest.init_app(app)
 
     # --------------------
     # CORS (FIXED)
@@ -52,6 +97,7 @@ def create_app():
     # BLUEPRINTS
     # --------------------
     app.register_blueprint(main)
+    register_commands(app)
 
     return app
 
@@ -0,0 +1,87 @@
+# tests/conftest.py
+import os
+import sys
+
+import pytest
+
+# server.py reads these at import time.
+os.environ.setdefault("PASSWORD_HASH_WORKERS", "0")
+os.environ.setdefault("CACHE_BACKEND", "none")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from datetime import date, time  # noqa: E402
+
+from sqlalchemy import event  # noqa: E402
+
+import server  # noqa: E402
+from server import create_app  # noqa: E402
+from backend import db, lookups  # noqa: E402
+from backend.models import (  # noqa: E402
+    AuthData, User, Cause, NGO, Event, Location, CauseContact, CauseSocials
+)
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    # A file rather than :memory:, so background threads get their own
+    # connection as they would in production.
+    monkeypatch.setattr(server, "DATABASE_URL", f"sqlite:///{tmp_path / 'test.db'}")
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+    lookups.clear()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def add_user(name="alice", password="pw", verified=True):
+    auth = AuthData(name=name, role="user", verified=verified)
+    auth.set_password(password)
+    db.session.add(auth)
+    db.session.flush()
+    user = User(name=name, email=f"{name}@example.org", verified=verified, auth_id=auth.id)
+    db.session.add(user)
+    db.session.flush()
+    auth.fk_id = user.user_id
+    db.session.commit()
+    return auth, user
+
+
+def add_causes(user, n, verified=True):
+    """n causes of user, alternating events and NGOs, each with a location."""
+    causes = []
+    for i in range(n):
+        cause = Cause(name=f"cause {i}", description="beach clean-up", user_id=user.user_id, verified=verified)
+        db.session.add(cause)
+        db.session.flush()
+        if i % 2:
+            db.session.add(NGO(cause_id=cause.cause_id, year_est=2000 + i))
+        else:
+            db.session.add(Event(cause_id=cause.cause_id, capacity=10, date=date(2025, 1, 1), time=time(10, 0)))
+        db.session.add(Location(cause_id=cause.cause_id, latitude=19 + i * 0.01, longitude=72 + i * 0.01))
+        db.session.add(CauseContact(cause_id=cause.cause_id, contact="123"))
+        db.session.add(CauseSocials(cause_id=cause.cause_id, social="@cause"))
+        causes.append(cause)
+    db.session.commit()
+    return causes
+
+
+class QueryCounter:
+    """Counts statements sent to the database inside the with block."""
+
+    def __enter__(self):
+        self.count = 0
+        event.listen(db.engine, "before_cursor_execute", self._count)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(db.engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args):
+        self.count += 1
@@ -0,0 +1,27 @@
+# tests/test_bulk.py
+from backend.models import AuthData
+
+from conftest import add_user
+
+
+def _admin(client):
+    with client.session_transaction() as s:
+        s["user"] = {"role": "admin"}
+
+
+def test_bulk_verify_rejects_empty_or_invalid_filters(app, client):
+    add_user("alice", verified=False)
+    _admin(client)
+    for account_filter in ({}, {"role": None}, {"role": "admin"}, {"verified": "no"}, {"verified": 0}):
+        response = client.post("/api/admin/bulk/verify", json={"filter": account_filter})
+        assert response.status_code == 400, account_filter
+    assert AuthData.query.filter_by(verified=True).count() == 0
+
+
+def test_bulk_verify_by_filter(app, client):
+    add_user("alice", verified=False)
+    add_user("bob", verified=True)
+    _admin(client)
+    response = client.post("/api/admin/bulk/verify", json={"filter": {"role": "user", "verified": False}})
+    assert response.status_code == 200
+    assert AuthData.query.filter_by(verified=False).count() == 0
@@ -0,0 +1,58 @@
+# tests/test_cache.py
+import pytest
+
+from backend import cache, db, versions
+
+from conftest import add_causes, add_user
+
+
+@pytest.fixture
+def cached_app(app):
+    app.config["CACHE_BACKEND"] = "memory"
+    cache.init_app(app)
+    yield app
+    cache.enabled = False
+
+
+def _get(client, url):
+    response = client.get(url)
+    assert response.status_code == 200
+    return response.headers["X-Cache"], response.get_json()
+
+
+def test_writes_invalidate_the_responses_tagged_with_their_scopes(cached_app, client):
+    auth, user = add_user()
+    cause_ids = [c.cause_id for c in add_causes(user, 2)]
+    detail = f"/api/causes/{cause_ids[0]}"
+
+    assert _get(client, "/api/causes")[0] == "MISS"
+    assert _get(client, "/api/causes")[0] == "HIT"
+    assert _get(client, detail)[0] == "MISS"
+    assert _get(client, detail)[0] == "HIT"
+
+    # A donation changes the detail page only.
+    client.post(f"/api/cause/{cause_ids[0]}/donate", json={"auth_id": auth.id, "amount": 3})
+    state, body = _get(client, detail)
+    assert state == "MISS"
+    assert body["stats"]["donation_count"] == 1
+    assert _get(client, "/api/causes")[0] == "HIT"
+
+    # Unverifying the owner takes both causes off the listing and the page.
+    client.patch(f"/api/admin/unverify/{auth.id}")
+    state, body = _get(client, "/api/causes")
+    assert (state, body["causes"]) == ("MISS", [])
+    assert client.get(detail).status_code == 404
+
+
+def test_rolled_back_changes_keep_the_cache(cached_app, client):
+    _, user = add_user()
+    add_causes(user, 1)
+    _get(client, "/api/causes")
+
+    versions.bump("causes")
+    db.session.rollback()
+    assert _get(client, "/api/causes")[0] == "HIT"
+
+    versions.bump("causes")
+    db.session.commit()
+    assert _get(client, "/api/causes")[0] == "MISS"
@@ -0,0 +1,43 @@
+# tests/test_causes.py
+from conftest import QueryCounter, add_causes, add_user
+
+
+def _listing_queries(client):
+    with QueryCounter() as queries:
+        response = client.get("/api/causes?limit=100")
+    assert response.status_code == 200
+    return queries.count, len(response.get_json()["causes"])
+
+
+def test_listing_query_count_does_not_grow_with_causes(app, client):
+    _, user = add_user()
+    add_causes(user, 5)
+    few, listed = _listing_queries(client)
+    assert listed == 5
+
+    add_causes(user, 45)
+    many, listed = _listing_queries(client)
+    assert listed == 50
+    assert many == few
+
+
+def test_cards_carry_running_totals_and_revalidate_on_ttl(app, client, monkeypatch):
+    from types import SimpleNamespace
+    from backend import routes, versions
+
+    now = [1_000_000.0]
+    monkeypatch.setattr(versions, "time", SimpleNamespace(time=lambda: now[0]))
+    auth, user = add_user()
+    cause_id = add_causes(user, 1)[0].cause_id
+
+    first = client.get("/api/causes")
+    assert first.get_json()["causes"][0]["stats"]["donation_count"] == 0
+
+    client.post(f"/api/cause/{cause_id}/donate", json={"auth_id": auth.id, "amount": 12.5})
+    assert client.get("/api/causes", headers={"If-None-Match": first.headers["ETag"]}).status_code == 304
+
+    now[0] += routes.CARD_STATS_TTL
+    fresh = client.get("/api/causes", headers={"If-None-Match": first.headers["ETag"]})
+    assert fresh.status_code == 200
+    stats = fresh.get_json()["causes"][0]["stats"]
+    assert (stats["donation_total"], stats["donation_count"]) == (12.5, 1)
@@ -0,0 +1,34 @@
+# tests/test_geo.py
+from conftest import add_causes, add_user
+
+
+def test_clusters_accept_a_wrapped_world_bbox(app, client):
+    # Leaflet's toBBoxString() at zoom 1 on a wrapped map.
+    _, user = add_user()
+    add_causes(user, 3)
+    response = client.get("/api/causes/clusters?zoom=1&bbox=-250.3,-85.1,300.1,95.2")
+    assert response.status_code == 200
+    assert sum(c["count"] for c in response.get_json()["clusters"]) == 3
+
+
+def test_within_wraps_longitudes_past_the_antimeridian(app, client):
+    _, user = add_user()
+    add_causes(user, 3)  # around (19, 72)
+    response = client.get("/api/causes/within?bbox=-300,0,-280,30")  # 60..80 east, shifted a turn west
+    assert response.status_code == 200
+    assert len(response.get_json()["causes"]) == 3
+
+
+def test_viewport_clusters_only_use_each_causes_first_location(app, client):
+    from backend import db
+    from backend.models import Location
+
+    _, user = add_user()
+    cause = add_causes(user, 1)[0]  # first location at (19, 72)
+    db.session.add(Location(cause_id=cause.cause_id, latitude=48.85, longitude=2.35))
+    db.session.commit()
+
+    paris = client.get("/api/causes/clusters?zoom=12&bbox=2.3,48.8,2.4,48.9").get_json()["clusters"]
+    assert paris == []
+    mumbai = client.get("/api/causes/clusters?zoom=12&bbox=71.9,18.9,72.1,19.1").get_json()["clusters"]
+    assert [(c["count"], c["cause_id"]) for c in mumbai] == [(1, cause.cause_id)]
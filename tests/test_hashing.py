@@ -0,0 +1,63 @@
+# tests/test_hashing.py
+import threading
+
+from werkzeug.security import generate_password_hash
+
+from backend import db, hasher, hashing
+from backend.models import AuthData
+
+from conftest import add_user
+
+
+def _login(client, name="alice", password="pw"):
+    return client.post("/api/auth/login", json={"name": name, "password": password})
+
+
+def _outdated(auth):
+    auth.password_hash = generate_password_hash("pw", method="pbkdf2:sha256:1000")
+    db.session.commit()
+    return auth.password_hash
+
+
+def test_login_upgrades_hashes_made_with_old_parameters(app, client):
+    auth, _ = add_user()
+    auth_id = auth.id
+    old = _outdated(auth)
+
+    assert _login(client).status_code == 200
+    new = db.session.get(AuthData, auth_id).password_hash
+    assert new != old
+    assert not hasher.needs_rehash(new)
+    assert _login(client).status_code == 200
+
+
+def test_saturated_pool_answers_503_without_queueing(app, client, monkeypatch):
+    add_user()
+    monkeypatch.setattr(hasher, "workers", 1)
+    monkeypatch.setattr(hasher, "_slots", threading.BoundedSemaphore(1))
+    hasher._slots.acquire()   # the only slot is taken
+
+    response = _login(client)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_stored_method_is_learned_in_the_pool(app, client, monkeypatch):
+    auth, _ = add_user()
+    auth_id = auth.id
+    old = _outdated(auth)
+    monkeypatch.setattr(hasher, "_stored_method", None)
+    run = hasher._run
+    calls = []
+
+    def busy_for_rehash(fn, *args):
+        calls.append(fn)
+        if fn is hashing._stored_method:
+            raise hashing.HashingBusy("pool is full")
+        return run(fn, *args)
+
+    monkeypatch.setattr(hasher, "_run", busy_for_rehash)
+    # The login still succeeds; only the upgrade is skipped.
+    assert _login(client).status_code == 200
+    assert hashing._stored_method in calls
+    assert db.session.get(AuthData, auth_id).password_hash == old
@@ -0,0 +1,42 @@
+# tests/test_http_load.py
+import os
+import sys
+
+from conftest import add_causes, add_user
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+import http_load  # noqa: E402
+
+
+def test_every_scenario_sends_requests_the_app_accepts(app):
+    auth, user = add_user(name="loaduser", password="password")
+    cause_ids = [c.cause_id for c in add_causes(user, 60)]
+    workload = http_load.Workload(cause_ids, [(auth.id, "loaduser")], seed=3)
+    client = app.test_client()
+
+    seen = set()
+    for name, scenario in http_load.SCENARIOS.items():
+        for _ in range(8 if name == "list" else 2):
+            response, endpoint = scenario(client, workload)
+            body = response.get_data(as_text=True)
+            response.close()
+            assert 200 <= response.status_code < 300, (endpoint, response.status_code, body)
+            seen.add(endpoint)
+    assert seen == set(http_load.SCENARIOS) | {"list_next"}
+
+
+def test_errors_percentiles_and_regressions_are_reported():
+    samples = [("detail", ms / 1000, 2, True) for ms in range(1, 101)] + [("donate", 0.05, 10, False)]
+    result = http_load.summarize(samples, elapsed=10.0)
+    detail = result["endpoints"]["detail"]
+    assert (detail["requests"], detail["errors"]) == (100, 0)
+    assert (detail["p50_ms"], detail["p95_ms"], detail["p99_ms"]) == (50, 95, 99)
+    assert result["endpoints"]["donate"]["errors"] == 1
+    assert result["overall"]["throughput_rps"] == 10.1
+
+    slower = http_load.summarize([(e, s * 2, q, ok) for e, s, q, ok in samples], elapsed=20.0)
+    baseline = {**result, "meta": {}}
+    regressions = {(name, metric) for name, metric, _, _ in http_load.compare(baseline, slower, 10)}
+    assert {("detail", "p95_ms"), ("overall", "throughput_rps")} <= regressions
+    assert not {r for r in regressions if r[1] == "queries_per_request"}
+    assert http_load.compare(baseline, result, 10) == []
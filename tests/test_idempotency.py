@@ -0,0 +1,40 @@
+# tests/test_idempotency.py
+from datetime import datetime, timedelta
+
+from backend import db
+from backend.models import Donation, IdempotencyKey
+
+from conftest import add_causes, add_user
+
+
+def _stale_pending(app, seconds):
+    row = IdempotencyKey.query.one()
+    row.status = "pending"
+    row.response_status = row.response_body = row.content_type = None
+    row.created_at = datetime.utcnow() - timedelta(seconds=seconds)
+    db.session.commit()
+
+
+def test_pending_key_is_taken_over_after_its_lease(app, client):
+    app.config["IDEMPOTENCY_LEASE"] = 60
+    auth, user = add_user()
+    cause_id = add_causes(user, 1)[0].cause_id
+    donate = lambda: client.post(f"/api/cause/{cause_id}/donate", json={"auth_id": auth.id, "amount": 5},
+                                 headers={"Idempotency-Key": "abc"})
+
+    assert donate().status_code == 200
+    Donation.query.delete()
+    # The request holding the key died before storing its response.
+    _stale_pending(app, 10)
+    response = donate()
+    assert response.status_code == 409
+    assert Donation.query.count() == 0
+
+    _stale_pending(app, 120)
+    response = donate()
+    assert response.status_code == 200
+    assert "Idempotent-Replayed" not in response.headers
+    assert Donation.query.count() == 1
+    assert IdempotencyKey.query.one().status == "done"
+    assert donate().headers["Idempotent-Replayed"] == "true"
+    assert Donation.query.count() == 1
@@ -0,0 +1,37 @@
+# tests/test_indexes.py
+import os
+import random
+import sys
+
+from flask_migrate import upgrade
+from sqlalchemy import inspect
+
+import server
+from backend import db
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+import index_query_plans  # noqa: E402
+
+MIGRATIONS = os.path.join(os.path.dirname(__file__), "..", "migrations")
+
+
+def test_hot_queries_are_served_by_indexes(app):
+    params = index_query_plans._params(random.Random(1), 10, 10)
+    with db.engine.connect() as conn:
+        for label, _, sql in index_query_plans.QUERIES:
+            plan = " / ".join(index_query_plans.explain(conn, sql, params))
+            assert "USING" in plan and "INDEX" in plan, (label, plan)
+            assert "SCAN" not in plan and "TEMP B-TREE" not in plan, (label, plan)
+
+
+def test_migrations_create_the_model_indexes(tmp_path, monkeypatch):
+    monkeypatch.setattr(server, "DATABASE_URL", f"sqlite:///{tmp_path / 'migrated.db'}")
+    app = server.create_app()
+    with app.app_context():
+        upgrade(directory=MIGRATIONS)
+        inspector = inspect(db.engine)
+        for table in index_query_plans.INDEX_TABLES:
+            migrated = {(i["name"], tuple(i["column_names"])) for i in inspector.get_indexes(table)}
+            declared = {(i.name, tuple(c.name for c in i.columns)) for i in db.metadata.tables[table].indexes}
+            assert declared <= migrated, table
+        db.session.remove()
@@ -0,0 +1,69 @@
+# tests/test_ingest.py
+import json
+import time
+
+import pytest
+
+from backend import db, ingest
+from backend.models import Donation, IngestCheckpoint
+
+from conftest import add_causes, add_user
+
+
+@pytest.fixture
+def queued_app(app, tmp_path):
+    app.config.update(INGEST_ENABLED=True, INGEST_QUEUE_PATH=str(tmp_path / "queue.sqlite3"),
+                      INGEST_FLUSH_INTERVAL=3600)
+    ingest.init_app(app)
+    yield app
+    ingest._stop.set()
+    ingest.enabled = False
+
+
+def _append(kind, row):
+    # Straight into the queue file, as a row written by an older version
+    # that enqueue() would now refuse.
+    ingest._conn.execute("INSERT INTO queue (kind, payload, enqueued_at) VALUES (?, ?, ?)",
+                         (kind, json.dumps(row), time.time()))
+
+
+def test_bad_values_are_refused_at_enqueue(queued_app, client):
+    auth, user = add_user()
+    cause = add_causes(user, 1)[0]
+    response = client.post(f"/api/cause/{cause.cause_id}/donate", json={"auth_id": auth.id, "amount": "25"})
+    assert response.status_code == 202
+    assert ingest.pending() == 1
+
+    with pytest.raises(ValueError):
+        ingest.enqueue("donation", {"user_id": user.user_id, "cause_id": cause.cause_id, "amount": "lots"})
+    with pytest.raises(ValueError):
+        ingest.enqueue("feedback", {"user_id": user.user_id, "cause_id": cause.cause_id, "rating": 9,
+                                    "comment": "ok"})
+    assert ingest.pending() == 1
+
+
+def test_crash_before_checkpoint_does_not_duplicate_rows(queued_app, monkeypatch):
+    _, user = add_user()
+    cause = add_causes(user, 1)[0]
+    good = {"user_id": user.user_id, "cause_id": cause.cause_id, "amount": 10.0}
+    _append("donation", good)
+    _append("donation", {**good, "bogus": 1})    # sends the batch down the one-by-one path
+    db.session.close()
+
+    # Crash at the commit that would store rows and checkpoint together.
+    session_class = type(db.session())
+
+    def crash(self):
+        raise RuntimeError("process killed")
+
+    with monkeypatch.context() as m:
+        m.setattr(session_class, "commit", crash)
+        with pytest.raises(RuntimeError):
+            ingest.flush_once()
+
+    assert Donation.query.count() == 0
+    db.session.close()
+    assert ingest.flush_once() == 2
+    assert ingest.flush_once() == 0
+    assert Donation.query.count() == 1
+    assert db.session.get(IngestCheckpoint, ingest.queue_id).last_id == 2
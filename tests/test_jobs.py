@@ -0,0 +1,76 @@
+# tests/test_jobs.py
+from datetime import datetime, timedelta
+
+from backend import db, jobs
+from backend.models import Cause, DeleteJob, Donation, Feedback, Volunteer
+
+from conftest import add_causes, add_user
+
+
+def _admin(client):
+    with client.session_transaction() as s:
+        s["user"] = {"role": "admin"}
+
+
+def _wait_for_jobs():
+    # End our read transaction as request teardown would, then wait: with
+    # one worker thread, anything submitted after the job runs after it.
+    db.session.close()
+    jobs._pool().submit(lambda: None).result(timeout=30)
+
+
+def test_estimate_rows_counts_owned_causes_and_own_activity(app):
+    _, owner = add_user("owner")
+    _, other = add_user("other")
+    mine = add_causes(owner, 3)
+    theirs = add_causes(other, 1)[0]
+    for cause in mine:
+        db.session.add(Donation(user_id=other.user_id, cause_id=cause.cause_id, amount=5))
+    db.session.add(Feedback(user_id=owner.user_id, cause_id=theirs.cause_id, rating=4, comment="ok"))
+    db.session.add(Volunteer(user_id=owner.user_id, cause_id=theirs.cause_id))
+    db.session.commit()
+
+    # Per cause: donation, location, contact, socials; plus the owner's
+    # feedback and volunteering elsewhere.
+    assert jobs.estimate_rows("cause", mine[0].cause_id) == 4
+    assert jobs.estimate_rows("user", owner.user_id) == 3 * 4 + 2
+
+
+def test_orphaned_job_is_taken_over(app, client):
+    app.config["DELETE_JOB_THRESHOLD"] = 0
+    _, user = add_user()
+    cause_id = add_causes(user, 1)[0].cause_id
+    long_ago = datetime.utcnow() - timedelta(hours=1)
+    orphan = DeleteJob(kind="cause", target_id=cause_id, status="running", rows_deleted=0,
+                       created_at=long_ago, heartbeat_at=long_ago)
+    db.session.add(orphan)
+    db.session.commit()
+    job_id = orphan.job_id
+
+    _admin(client)
+    response = client.delete(f"/api/admin/delete/cause/{cause_id}")
+    assert response.status_code == 202
+    assert response.get_json()["job_id"] == job_id
+    _wait_for_jobs()
+
+    assert db.session.get(DeleteJob, job_id).status == "done"
+    assert db.session.get(Cause, cause_id) is None
+
+
+def test_live_job_is_not_started_twice(app, client):
+    app.config["DELETE_JOB_THRESHOLD"] = 0
+    _, user = add_user()
+    cause_id = add_causes(user, 1)[0].cause_id
+    live = DeleteJob(kind="cause", target_id=cause_id, status="running", rows_deleted=0,
+                     heartbeat_at=datetime.utcnow())
+    db.session.add(live)
+    db.session.commit()
+    job_id = live.job_id
+
+    _admin(client)
+    response = client.delete(f"/api/admin/delete/cause/{cause_id}")
+    assert response.get_json()["job_id"] == job_id
+    _wait_for_jobs()
+
+    assert db.session.get(DeleteJob, job_id).status == "running"
+    assert db.session.get(Cause, cause_id) is not None
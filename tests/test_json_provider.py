@@ -0,0 +1,62 @@
+# tests/test_json_provider.py
+import dataclasses
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+
+import pytest
+from flask import Flask
+
+from backend import json_provider
+
+PROVIDERS = [False] + ([True] if json_provider.orjson is not None else [])
+
+
+@dataclasses.dataclass
+class Point:
+    lat: float
+    lng: float
+
+
+@pytest.fixture(params=PROVIDERS, ids=lambda orjson: "orjson" if orjson else "stdlib")
+def provider(request):
+    app = Flask(__name__)   # the provider only keeps a weak reference
+    yield json_provider.FastJSONProvider(app, use_orjson=request.param)
+
+
+def test_dates_decimals_and_dataclasses(provider):
+    payload = {
+        "date": date(2025, 3, 1),
+        "time": time(9, 30),
+        "at": datetime(2025, 3, 1, 9, 30, 15),
+        "amount": Decimal("12.50"),
+        "where": Point(19.07, 72.87),
+        "name": "Café",
+    }
+    assert json.loads(provider.dumps(payload)) == {
+        "date": "2025-03-01",
+        "time": "09:30:00",
+        "at": "2025-03-01T09:30:15",   # ISO 8601, not Flask's HTTP date
+        "amount": "12.50",
+        "where": {"lat": 19.07, "lng": 72.87},
+        "name": "Café",
+    }
+    with pytest.raises(TypeError):
+        provider.dumps({"x": object()})
+
+
+def test_responses_are_compact_with_sorted_keys(provider):
+    with provider._app.app_context():
+        body = provider.response({"b": 1, "a": [date(2025, 1, 2)], "c": None}).get_data(as_text=True)
+    assert body.rstrip("\n") == '{"a":["2025-01-02"],"b":1,"c":null}'
+    assert provider.loads(body) == {"a": ["2025-01-02"], "b": 1, "c": None}
+
+
+def test_both_providers_decode_to_the_same_document():
+    app = Flask(__name__)
+    payload = {"n": [1, 2.5, None, True], "d": date(2024, 2, 29), "amount": Decimal("0.1"), "s": "ü\n\""}
+    bodies = [json_provider.FastJSONProvider(app, use_orjson=o).dumps(payload) for o in PROVIDERS]
+    assert all(json.loads(b) == json.loads(bodies[0]) for b in bodies)
+    # Arguments orjson cannot honour go through the stdlib encoder.
+    indented = json_provider.FastJSONProvider(app).dumps(payload, indent=2)
+    assert "\n  " in indented and json.loads(indented) == json.loads(bodies[0])
@@ -0,0 +1,44 @@
+# tests/test_leaderboards.py
+from backend import db
+from backend.models import Donation, Feedback, Volunteer
+
+from conftest import add_causes, add_user
+
+
+def _top(client, **args):
+    response = client.get("/api/causes/top", query_string=args)
+    assert response.status_code == 200
+    causes = response.get_json()["causes"]
+    assert [c["rank"] for c in causes] == list(range(1, len(causes) + 1))
+    return [c["cause_id"] for c in causes]
+
+
+def test_leaderboards_break_ties_by_age_and_skip_unverified_or_idle_causes(app, client):
+    _, user = add_user()
+    c0, c1, c2, c3 = [c.cause_id for c in add_causes(user, 4)]
+    hidden = add_causes(user, 1, verified=False)[0].cause_id
+    uid = user.user_id
+
+    for cause_id, amount in ((c2, 10), (c0, 10), (c1, 30), (hidden, 100)):
+        db.session.add(Donation(user_id=uid, cause_id=cause_id, amount=amount))
+    ratings = {c0: [5, 4], c1: [5], c2: [4, 5], c3: [5, 4, 5, 4], hidden: [5, 5]}
+    for cause_id, values in ratings.items():
+        db.session.add_all(Feedback(user_id=uid, cause_id=cause_id, rating=r, comment="ok") for r in values)
+    for cause_id in (c3, c3, c1, c2, hidden, hidden, hidden):
+        db.session.add(Volunteer(user_id=uid, cause_id=cause_id))
+    db.session.commit()
+
+    assert _top(client) == [c1, c0, c2]                       # c3 has no donations
+    assert _top(client, by="rating") == [c1, c3, c0, c2]      # 4.5 ties: more ratings, then older
+    assert _top(client, by="rating", min_ratings=2) == [c3, c0, c2]
+    assert _top(client, by="volunteers") == [c3, c1, c2]
+    assert _top(client, by="donations", limit=2) == [c1, c0]
+
+    first = client.get("/api/causes/top").get_json()["causes"][0]
+    assert first["stats"]["donation_total"] == 30
+
+
+def test_leaderboard_arguments_are_checked(app, client):
+    assert client.get("/api/causes/top?by=age").status_code == 400
+    assert client.get("/api/causes/top?by=rating&min_ratings=many").status_code == 400
+    assert client.get("/api/causes/top?limit=0").status_code == 400
@@ -0,0 +1,65 @@
+# tests/test_lookups.py
+from sqlalchemy import event
+
+from backend import db
+
+from conftest import add_causes, add_user
+
+
+def _donate(client, auth_id, cause_id):
+    return client.post(f"/api/cause/{cause_id}/donate", json={"auth_id": auth_id, "amount": 1})
+
+
+def _as_admin(client):
+    with client.session_transaction() as s:
+        s["user"] = {"role": "admin"}
+
+
+def test_cached_checks_skip_the_lookup_queries(app, client):
+    auth, user = add_user()
+    auth_id, cause_id = auth.id, add_causes(user, 1)[0].cause_id
+    assert _donate(client, auth_id, cause_id).status_code == 200
+
+    statements = []
+    record = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        assert _donate(client, auth_id, cause_id).status_code == 200
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
+    assert not [s for s in statements if s.lstrip().startswith("SELECT") and "auth_data" in s]
+
+
+def test_verify_and_unverify_take_effect_at_once(app, client):
+    auth, user = add_user()
+    auth_id, cause_id = auth.id, add_causes(user, 1)[0].cause_id
+    assert _donate(client, auth_id, cause_id).status_code == 200
+
+    client.patch(f"/api/admin/unverify/{auth_id}")
+    response = _donate(client, auth_id, cause_id)
+    assert (response.status_code, response.get_json()["error"]) == (403, "You are not verified")
+
+    client.patch(f"/api/admin/verify/{auth_id}")
+    assert _donate(client, auth_id, cause_id).status_code == 200
+
+    _as_admin(client)
+    client.post("/api/admin/bulk/unverify", json={"auth_ids": [auth_id]})
+    assert _donate(client, auth_id, cause_id).status_code == 403
+
+
+def test_deleted_causes_and_users_are_refused_at_once(app, client):
+    auth, user = add_user()
+    other_auth, other = add_user(name="bob")
+    auth_id, other_auth_id, other_id = auth.id, other_auth.id, other.user_id
+    cause_id = add_causes(user, 1)[0].cause_id
+    assert _donate(client, auth_id, cause_id).status_code == 200
+    assert _donate(client, other_auth_id, cause_id).status_code == 200
+
+    _as_admin(client)
+    assert client.delete(f"/api/admin/delete/user/{other_id}").status_code == 200
+    response = _donate(client, other_auth_id, cause_id)   # the login went with the user
+    assert (response.status_code, response.get_json()["error"]) == (403, "Invalid user")
+
+    assert client.delete(f"/api/admin/delete/cause/{cause_id}").status_code == 200
+    response = _donate(client, auth_id, cause_id)
+    assert (response.status_code, response.get_json()["error"]) == (404, "Cause not found")
@@ -0,0 +1,85 @@
+# tests/test_metrics.py
+import json
+
+import pytest
+
+from backend import db, instrumentation, metrics
+
+from conftest import QueryCounter, add_causes, add_user
+
+
+@pytest.fixture
+def metrics_app(app):
+    app.config["METRICS_ENABLED"] = True
+    app.config["METRICS_LOG_REQUESTS"] = False
+    metrics.init_app(app, db)
+    metrics.reset()
+    yield app
+    metrics.enabled = False
+    metrics.reset()
+
+
+def _route(client, name):
+    with client.session_transaction() as s:
+        s["user"] = {"role": "admin"}
+    return client.get("/api/admin/metrics").get_json()["routes"][name]
+
+
+def test_streamed_responses_count_the_queries_run_while_streaming(metrics_app, client):
+    _, user = add_user()
+    add_causes(user, 30)
+    db.session.close()
+
+    with QueryCounter() as queries:
+        response = client.get("/api/causes?limit=10")
+        cards = response.get_json()["causes"]
+    assert len(cards) == 10
+    assert 'desc="until streaming"' in response.headers["Server-Timing"]
+
+    stats = _route(client, "GET /api/causes")
+    assert stats["count"] == 1
+    assert stats["queries_per_request"] == queries.count >= 1
+    assert stats["serialize_ms_per_request"] > 0
+
+    with QueryCounter() as queries:
+        users = client.get("/api/admin/users").get_json()
+    assert [u["name"] for u in users] == ["alice"]
+    assert _route(client, "GET /api/admin/users")["queries_per_request"] == queries.count
+
+
+def test_server_timing_and_route_stats_for_a_plain_response(metrics_app, client):
+    _, user = add_user()
+    cause_id = add_causes(user, 1)[0].cause_id
+
+    with QueryCounter() as queries:
+        response = client.get(f"/api/causes/{cause_id}")
+    timing = response.headers["Server-Timing"]
+    assert f'desc="{queries.count} queries"' in timing
+    assert "serialize;dur=" in timing and "app;dur=" in timing
+    client.get("/api/causes/999999")
+
+    stats = _route(client, "GET /api/causes/<int:cause_id>")
+    assert stats["count"] == 2
+    assert stats["errors"] == 0
+    assert sum(b["count"] for b in stats["histogram"]) == 2
+    assert stats["max_queries"] == queries.count
+
+    client.delete("/api/admin/metrics")
+    assert "GET /api/causes/<int:cause_id>" not in client.get("/api/admin/metrics").get_json()["routes"]
+
+
+def test_slow_queries_are_logged_without_parameter_values(metrics_app, client, caplog, monkeypatch):
+    # Alembic's fileConfig() disables existing loggers in earlier tests.
+    monkeypatch.setattr(instrumentation.logger, "disabled", False)
+    metrics_app.config["METRICS_LOG_REQUESTS"] = True
+    monkeypatch.setattr(metrics, "slow_query_ms", 0.0)
+    monkeypatch.setattr(metrics, "log_requests", True)
+    auth, user = add_user(name="secret-name")
+
+    with caplog.at_level("INFO", logger="backend.metrics"):
+        client.post("/api/auth/login", json={"name": "secret-name", "password": "pw"})
+    events = [json.loads(r.getMessage()) for r in caplog.records]
+    assert {"slow_query", "request"} <= {e["event"] for e in events}
+    assert all("secret-name" not in r.getMessage() for r in caplog.records)
+    request_line = next(e for e in events if e["event"] == "request")
+    assert request_line["route"] == "POST /api/auth/login" and request_line["queries"] >= 1
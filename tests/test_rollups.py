@@ -0,0 +1,94 @@
+# tests/test_rollups.py
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+from backend import db, rollups
+from backend.models import Donation, DonationRollup
+
+from conftest import add_causes, add_user
+
+START = date(2024, 12, 20)
+END = date(2025, 3, 10)
+
+
+def _raw_series(granularity, cause_id=None):
+    """The expected buckets, summed straight from the donation table."""
+    sums = defaultdict(lambda: [0.0, 0])
+    for d in Donation.query:
+        if d.created_at is None or (cause_id is not None and d.cause_id != cause_id):
+            continue
+        bucket = rollups.bucket_start(d.created_at.date(), granularity)
+        sums[bucket][0] += d.amount
+        sums[bucket][1] += 1
+    out, bucket = [], rollups.bucket_start(START, granularity)
+    while bucket <= END:
+        amount, count = sums.get(bucket, (0, 0))
+        out.append({"bucket": bucket.isoformat(), "amount": round(amount, 2), "count": count})
+        bucket = rollups.next_bucket(bucket, granularity)
+    return out
+
+
+def _rollup_rows():
+    return sorted((r.cause_id, r.granularity, r.bucket, round(r.amount_total, 6), r.donation_count)
+                  for r in DonationRollup.query if r.donation_count)
+
+
+def _check(cause_ids):
+    for granularity in rollups.GRANULARITIES:
+        for cause_id in (None, *cause_ids):
+            got = rollups.series(db.session, granularity, START, END, cause_id=cause_id)
+            assert got == _raw_series(granularity, cause_id), (granularity, cause_id)
+
+
+def test_rollups_match_raw_sums_through_inserts_updates_and_deletes(app):
+    _, owner = add_user()
+    _, donor = add_user(name="bob")
+    _, leaver = add_user(name="carol")
+    cause_ids = [c.cause_id for c in add_causes(owner, 2)]
+
+    donations = []
+    for i in range(60):
+        who = (donor, leaver)[i % 2]
+        when = datetime(2024, 12, 20, 12) + timedelta(days=i * 1.3)
+        donations.append(Donation(user_id=who.user_id, cause_id=cause_ids[i % 3 % 2],
+                                  amount=5 + i * 0.25, created_at=when))
+    db.session.add_all(donations)
+    db.session.commit()
+    # A row from before created_at existed: left out of the rollups.
+    db.session.execute(Donation.__table__.insert().values(user_id=donor.user_id, cause_id=cause_ids[0],
+                                                          amount=99, created_at=None))
+    db.session.commit()
+    _check(cause_ids)
+
+    # Move one donation to another cause, month and amount; delete another.
+    donations[3].cause_id = cause_ids[1]
+    donations[3].created_at = datetime(2025, 2, 27, 9)
+    donations[3].amount = 40
+    db.session.delete(donations[10])
+    db.session.commit()
+    _check(cause_ids)
+
+    # A user's donations cascade away with the user.
+    db.session.delete(leaver)
+    db.session.commit()
+    _check(cause_ids)
+
+    # The backfill rebuilds the same table (minus buckets emptied since).
+    before = _rollup_rows()
+    assert rollups.backfill(db.session) == (Donation.query.count(), 1)
+    assert _rollup_rows() == before
+
+
+def test_analytics_endpoint_totals(app, client):
+    auth, user = add_user()
+    cause_id = add_causes(user, 1)[0].cause_id
+    for amount in (10, 2.5):
+        client.post(f"/api/cause/{cause_id}/donate", json={"auth_id": auth.id, "amount": amount})
+    with client.session_transaction() as s:
+        s["user"] = {"role": "admin"}
+
+    today = datetime.utcnow().date()
+    body = client.get(f"/api/admin/analytics/donations?granularity=month&cause_id={cause_id}").get_json()
+    assert body["total"] == {"amount": 12.5, "count": 2}
+    assert body["buckets"][-1] == {"bucket": today.replace(day=1).isoformat(), "amount": 12.5, "count": 2}
+    assert client.get("/api/admin/analytics/donations?granularity=year").status_code == 400
@@ -0,0 +1,52 @@
+# tests/test_search.py
+from backend import db
+from backend.models import Cause
+
+from conftest import add_causes, add_user
+
+
+def _search(client, q):
+    response = client.get("/api/causes/search", query_string={"q": q})
+    assert response.status_code == 200
+    return [c["name"] for c in response.get_json()["causes"]]
+
+
+def _named(user, *names, description="beach clean-up"):
+    causes = add_causes(user, len(names))
+    for cause, name in zip(causes, names):
+        cause.name = name
+        cause.description = description
+    db.session.commit()
+    return causes
+
+
+def test_name_matches_rank_above_description_matches(app, client):
+    _, user = add_user()
+    _named(user, "Harbour cleanup", description="we plant mangroves")
+    _named(user, "Green shoots", description="mangrove planting on the harbour")
+    unverified = _named(user, "Mangrove watch")[0]
+    unverified.verified = False
+    db.session.commit()
+
+    assert _search(client, "harbour") == ["Harbour cleanup", "Green shoots"]
+    assert _search(client, "harb") == ["Harbour cleanup", "Green shoots"]  # prefix match, same ranking
+    assert sorted(_search(client, "mangrove")) == ["Green shoots", "Harbour cleanup"]  # not the unverified one
+    assert _search(client, "plant harb") == ["Harbour cleanup", "Green shoots"]
+    assert _search(client, "harbour kelp") == []
+
+def test_index_follows_renames_and_deletes(app, client):
+    _, user = add_user()
+    cause = _named(user, "Food bank")[0]
+    cause_id = cause.cause_id
+    assert _search(client, "food") == ["Food bank"]
+
+    cause.name = "Soup kitchen"
+    db.session.commit()
+    assert _search(client, "food") == []
+    assert _search(client, "soup") == ["Soup kitchen"]
+
+    with client.session_transaction() as s:
+        s["user"] = {"role": "admin"}
+    assert client.delete(f"/api/admin/delete/cause/{cause_id}").status_code == 200
+    assert db.session.get(Cause, cause_id) is None
+    assert _search(client, "soup") == []
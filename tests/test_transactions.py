@@ -0,0 +1,91 @@
+# tests/test_transactions.py
+import json
+
+from backend import db
+from backend.models import AuthData, User
+
+from conftest import add_causes, add_user
+
+
+def test_released_savepoint_is_undone_by_the_outer_rollback(app):
+    savepoint = db.session.begin_nested()
+    db.session.add(AuthData(name="nested", role="user", password_hash="x"))
+    savepoint.commit()
+    db.session.rollback()
+
+    assert AuthData.query.filter_by(name="nested").count() == 0
+
+
+def test_bulk_registration_is_one_transaction(app, client, monkeypatch):
+    import backend.routes
+
+    register_account = backend.routes.register_account
+
+    def fail_on_second(item):
+        if item["name"] == "second":
+            raise RuntimeError("crash half-way through the batch")
+        return register_account(item)
+
+    monkeypatch.setattr(backend.routes, "register_account", fail_on_second)
+    with client.session_transaction() as s:
+        s["user"] = {"role": "admin"}
+    items = [{"name": name, "email": f"{name}@example.org", "password": "pw", "role": "user"}
+             for name in ("first", "second")]
+    app.config["PROPAGATE_EXCEPTIONS"] = False
+    response = client.post("/api/admin/register/bulk", json={"items": items})
+    assert response.status_code == 500
+
+    db.session.rollback()
+    assert User.query.count() == 0
+    assert AuthData.query.count() == 0
+
+
+def test_writes_commit_while_an_admin_listing_streams(app, client):
+    from sqlalchemy import update
+
+    for name in ("ann", "bob"):
+        add_user(name)
+    db.session.commit()
+    db.session.close()
+    with client.session_transaction() as s:
+        s["user"] = {"role": "admin"}
+
+    response = client.get("/api/admin/users", buffered=False)
+    body = iter(response.response)
+    assert next(body) == b"["   # the cursor is open from here on
+    with db.engine.connect() as conn:
+        conn.execute(update(AuthData).where(AuthData.name == "ann").values(verified=False))
+        conn.commit()
+    rest = b"".join(body).decode()
+    response.close()
+    assert [u["name"] for u in json.loads("[" + rest)] == ["ann", "bob"]
+
+
+def test_concurrent_writers_wait_instead_of_failing(app):
+    import threading
+
+    from backend.models import Donation
+
+    auth, user = add_user()
+    cause_ids = [c.cause_id for c in add_causes(user, 4)]
+    auth_id = auth.id
+    db.session.commit()
+    db.session.close()
+    app.config["PROPAGATE_EXCEPTIONS"] = False
+    statuses = []
+
+    def donate(worker):
+        client = app.test_client()
+        for i in range(40):
+            cause_id = cause_ids[(worker + i) % len(cause_ids)]
+            response = client.post(f"/api/cause/{cause_id}/donate", json={"auth_id": auth_id, "amount": 1})
+            statuses.append(response.status_code)
+
+    threads = [threading.Thread(target=donate, args=(w,)) for w in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert statuses.count(200) == len(statuses) == 320
+    assert Donation.query.count() == 320
@@ -0,0 +1,52 @@
+# tests/test_versions.py
+from backend import db, versions
+
+from conftest import QueryCounter, add_causes, add_user
+
+
+def test_bumps_count_up_per_scope_and_only_on_commit(app):
+    assert versions.current(["causes", "cause:1"]) == [(0, None), (0, None)]
+
+    versions.bump("cause:1", "cause:1")
+    db.session.commit()
+    versions.bump("cause:1", "causes")
+    db.session.commit()
+    versions.bump("causes")
+    db.session.rollback()
+
+    (causes, _), (cause, updated_at) = versions.current(["causes", "cause:1"])
+    assert (causes, cause) == (1, 2)
+    assert updated_at is not None
+
+
+def test_unchanged_detail_is_answered_with_304_before_the_view_runs(app, client):
+    auth, user = add_user()
+    cause_id = add_causes(user, 1)[0].cause_id
+    url = f"/api/causes/{cause_id}"
+
+    first = client.get(url)
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "no-cache"
+
+    with QueryCounter() as queries:
+        response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert queries.count == 1   # the version lookup
+
+    client.post(f"/api/cause/{cause_id}/donate", json={"auth_id": auth.id, "amount": 3})
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+    since = response.headers["Last-Modified"]
+    assert client.get(url, headers={"If-Modified-Since": since}).status_code == 304
+
+
+def test_other_causes_keep_their_etag(app, client):
+    auth, user = add_user()
+    first, second = [c.cause_id for c in add_causes(user, 2)]
+    etag = client.get(f"/api/causes/{second}").headers["ETag"]
+
+    client.post(f"/api/cause/{first}/donate", json={"auth_id": auth.id, "amount": 3})
+    assert client.get(f"/api/causes/{second}", headers={"If-None-Match": etag}).status_code == 304
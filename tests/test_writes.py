@@ -0,0 +1,37 @@
+# tests/test_writes.py
+from backend import db
+from backend.models import CauseSummary, Donation, Feedback
+
+from conftest import add_causes, add_user
+
+
+def test_numeric_strings_are_accepted_and_counted(app, client):
+    auth, user = add_user()
+    cause = add_causes(user, 1)[0]
+
+    response = client.post(f"/api/cause/{cause.cause_id}/donate", json={"auth_id": auth.id, "amount": "25"})
+    assert response.status_code == 200
+    response = client.post(f"/api/cause/{cause.cause_id}/feedback",
+                           json={"auth_id": auth.id, "comment": "great", "rating": "4"})
+    assert response.status_code == 200
+
+    assert Donation.query.one().amount == 25.0
+    assert Feedback.query.one().rating == 4
+    row = db.session.get(CauseSummary, cause.cause_id)
+    assert (row.donation_total, row.donation_count) == (25.0, 1)
+    assert (row.rating_sum, row.rating_count) == (4, 1)
+
+
+def test_bad_amounts_and_ratings_are_rejected(app, client):
+    auth, user = add_user()
+    cause = add_causes(user, 1)[0]
+
+    for amount in ("lots", None, True, -5, [1]):
+        response = client.post(f"/api/cause/{cause.cause_id}/donate", json={"auth_id": auth.id, "amount": amount})
+        assert response.status_code == 400, amount
+    for rating in ("good", 0, 6, 4.5):
+        response = client.post(f"/api/cause/{cause.cause_id}/feedback",
+                               json={"auth_id": auth.id, "comment": "ok", "rating": rating})
+        assert response.status_code == 400, rating
+    assert Donation.query.count() == 0
+    assert Feedback.query.count() == 0